@@ -0,0 +1,94 @@
+"""
+검색 스니펫 근접 중복 묶기 벤치마크
+- 기존 방식(모든 그룹 대표와 SequenceMatcher 비교) vs MinHash/LSH (src/utils/near_dup.py)
+- 합성 검색 결과: 원문 스니펫 여러 개를 도메인별로 조금씩 바꿔 쓴 변형들 + 무관한 스니펫
+- 후보 수 50 / 200 / 1000에서 시간과 채택 그룹(≥2개, ≥2도메인) 일치 여부 출력
+- 실행: python -m benchmarks.bench_near_dup [후보 수 ...]
+"""
+import sys
+import time
+import random
+from difflib import SequenceMatcher
+
+from src.utils.near_dup import cluster_snippets, norm
+
+# 한글 음절 2~4개로 만든 단어 2000개 (실제 검색 스니펫 정도의 어휘 다양성)
+_rng = random.Random(1)
+WORDS = [
+    "".join(chr(0xAC00 + _rng.randrange(11172)) for _ in range(_rng.randint(2, 4)))
+    for _ in range(2000)
+]
+
+def make_results(n: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    results = []
+    n_topics = max(2, n // 5)
+    bases = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(30, 60))) for _ in range(n_topics)]
+    for i in range(n):
+        if rng.random() < 0.7:
+            # 같은 원문을 다른 사이트가 살짝 바꿔 쓴 스니펫
+            words = rng.choice(bases).split()
+            for _ in range(rng.randint(0, 3)):
+                words[rng.randrange(len(words))] = rng.choice(WORDS)
+            snippet = " ".join(words)
+        else:
+            snippet = " ".join(rng.choice(WORDS) for _ in range(rng.randint(30, 60)))
+        results.append({
+            "title": f"result {i}",
+            "url": f"https://site{i % 17}.example/{i}",
+            "snippet": snippet,
+            "domain": f"site{i % 17}.example",
+            "score": rng.random(),
+        })
+    return results
+
+def similar(a: str, b: str, thr: float = 0.82) -> bool:
+    """기존 node_tool_search의 스니펫 유사도 판정 (비교용)"""
+    return bool(a and b) and SequenceMatcher(None, norm(a), norm(b)).ratio() >= thr
+
+def cluster_pairwise(results: list[dict], thr: float = 0.82) -> list[dict]:
+    """기존 node_tool_search의 묶기 방식 (비교용)"""
+    groups = []
+    for r in results:
+        snip, dom = r.get("snippet", ""), r.get("domain", "")
+        if not snip:
+            continue
+        placed = False
+        for g in groups:
+            if similar(snip, g["rep"], thr):
+                g["items"].append(r)
+                if dom:
+                    g["domains"].add(dom)
+                placed = True
+                break
+        if not placed:
+            groups.append({"rep": snip, "items": [r], "domains": set([dom] if dom else [])})
+    return groups
+
+def picked(groups: list[dict]) -> set[tuple]:
+    return {
+        tuple(sorted(it["url"] for it in g["items"]))
+        for g in groups if len(g["items"]) >= 2 and len(g["domains"]) >= 2
+    }
+
+def run(sizes: list[int]) -> None:
+    print(f"{'후보 수':>6} {'pairwise(s)':>12} {'minhash(s)':>11} {'배속':>7} {'채택 그룹':>10} {'일치':>5}")
+    for n in sizes:
+        results = make_results(n)
+
+        t0 = time.perf_counter()
+        old = cluster_pairwise(results)
+        t_old = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        new = cluster_snippets(results)
+        t_new = time.perf_counter() - t0
+
+        same = picked(old) == picked(new)
+        print(
+            f"{n:>6} {t_old:>12.3f} {t_new:>11.3f} {t_old / max(t_new, 1e-9):>6.1f}x "
+            f"{len(picked(new)):>10} {'O' if same else 'X':>5}"
+        )
+
+if __name__ == "__main__":
+    run([int(x) for x in sys.argv[1:]] or [50, 200, 1000])
@@ -0,0 +1,48 @@
+"""
+렌더 프로필(draft / final) 인코딩 벤치마크
+- 합성 슬라이드 이미지 + 무음 오디오로 슬라이드 클립을 만들어 프로필별 인코딩 시간과 파일 크기 비교
+- 결과는 슬라이드 1초당 인코딩 시간(ms)과 용량(KB)으로 출력
+- 실행: python -m benchmarks.bench_render_profiles [클립 길이(초)] (ffmpeg 필요)
+"""
+import os
+import sys
+import time
+import subprocess
+import tempfile
+
+from src.nodes.make_video import build_slide_cmd
+from src.utils.render_profiles import RENDER_PROFILES
+
+def make_inputs(work_dir: str, seconds: float) -> tuple[str, str]:
+    image = os.path.join(work_dir, "slide.png")
+    audio = os.path.join(work_dir, "audio.mp3")
+    # 글자가 있는 슬라이드와 비슷하게 testsrc2 한 프레임을 PNG로 저장
+    subprocess.run([
+        "ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "testsrc2=size=1920x1080",
+        "-frames:v", "1", image,
+    ], check=True)
+    subprocess.run([
+        "ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "sine=frequency=220:sample_rate=24000",
+        "-t", str(seconds), "-c:a", "libmp3lame", audio,
+    ], check=True)
+    return image, audio
+
+def run(seconds: float) -> None:
+    with tempfile.TemporaryDirectory() as work_dir:
+        image, audio = make_inputs(work_dir, seconds)
+        print(f"클립 길이 {seconds:.0f}초")
+        print(f"{'profile':<8} {'encode(s)':>10} {'ms/slide-sec':>13} {'size(KB)':>10} {'KB/slide-sec':>13}")
+        for name, profile in RENDER_PROFILES.items():
+            out = os.path.join(work_dir, f"{name}.mp4")
+            cmd = build_slide_cmd(image, audio, out, seconds, profile)
+            t0 = time.perf_counter()
+            subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+            elapsed = time.perf_counter() - t0
+            size_kb = os.path.getsize(out) / 1024
+            print(
+                f"{name:<8} {elapsed:>10.2f} {elapsed / seconds * 1000:>13.1f} "
+                f"{size_kb:>10.1f} {size_kb / seconds:>13.1f}"
+            )
+
+if __name__ == "__main__":
+    run(float(sys.argv[1]) if len(sys.argv) > 1 else 60.0)
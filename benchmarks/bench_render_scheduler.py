@@ -0,0 +1,45 @@
+"""
+렌더 스케줄러 처리량 벤치마크
+- 같은 슬라이드 클립 N개를 (1) 스레드 제한 없이 동시에 N개, (2) 코어 수 기반 스케줄러로 인코딩
+- 결과는 처리량(슬라이드초/초)으로 출력 → 렌더 서버 크기 산정용
+- 실행: python -m benchmarks.bench_render_scheduler [클립 수] [클립 길이(초)] (ffmpeg 필요)
+"""
+import os
+import sys
+import time
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from src.nodes.make_video import build_slide_cmd
+from src.utils.render_profiles import get_render_profile
+from src.utils.render_scheduler import available_cores, run_render_jobs, format_render_stats
+from benchmarks.bench_render_profiles import make_inputs
+
+def run(n_clips: int, seconds: float) -> None:
+    profile = get_render_profile("final")
+    with tempfile.TemporaryDirectory() as work_dir:
+        image, audio = make_inputs(work_dir, seconds)
+        print(f"코어 {available_cores()}개, 클립 {n_clips}개 × {seconds:.0f}초")
+
+        def encode(idx: int, threads: int) -> tuple[str, float]:
+            out = os.path.join(work_dir, f"clip{idx}_{threads}.mp4")
+            cmd = build_slide_cmd(image, audio, out, seconds, profile, threads=threads)
+            subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+            return out, seconds
+
+        # (1) 스레드 제한 없이 전부 동시에
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=n_clips) as ex:
+            list(ex.map(lambda i: encode(i, 0), range(n_clips)))
+        wall = time.perf_counter() - t0
+        print(f"제한 없음   : 실제 {wall:.1f}초 → 처리량 {n_clips * seconds / wall:.2f} 슬라이드초/초")
+
+        # (2) 코어 수 기반 스케줄러
+        _, stats = run_render_jobs(range(n_clips), encode)
+        print(f"스케줄러    : {format_render_stats(stats)}")
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    sec = float(sys.argv[2]) if len(sys.argv) > 2 else 30.0
+    run(n, sec)
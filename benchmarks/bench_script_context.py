@@ -0,0 +1,83 @@
+"""
+스크립트 프롬프트 문맥 크기 비교 (외부 API 없이 프롬프트만 만들어 토큰 추정)
+- full   : 전체 제목 목록 + 이전 스크립트 전체 (기존 방식)
+- window : 주변 목차 + 섹션 제목 + 최근 요약 + 이전 흐름 끝부분, 호출당 토큰 예산 (src/utils/script_context.py)
+- 덱 전체 누적 입력 토큰 / 호출당 최대 토큰을 슬라이드 수별로 출력
+- 실행: python -m benchmarks.bench_script_context [슬라이드 수 ...]
+"""
+import os
+import sys
+import tempfile
+
+# 노드 모듈이 import 시점에 클라이언트를 만들기 때문에 더미 키 지정, 캐시/토큰 예산은 끔
+os.environ.setdefault("OPENAI_API_KEY", "sk-dummy")
+os.environ.setdefault("LLM_MODEL", "gpt-4o-mini")
+os.environ["LLM_CACHE"] = "bypass"
+os.environ["LLM_TPM"] = "0"
+
+from langchain_core.messages import AIMessage
+
+import src.nodes.gen_script as gen_script
+from src.utils.llm_cache import estimate_input_tokens
+
+SCRIPT_SENTENCE = "이 개념은 앞에서 본 원리를 실제 문제에 적용하는 방법을 보여 줍니다. "
+
+class PromptMeter:
+    """LLM 대신 입력 토큰만 재고 고정 길이(약 60초 분량) 스크립트를 반환"""
+    def __init__(self):
+        self.calls = 0
+        self.total = 0
+        self.peak = 0
+
+    def invoke(self, messages):
+        tokens = estimate_input_tokens(messages)
+        self.calls += 1
+        self.total += tokens
+        self.peak = max(self.peak, tokens)
+        return AIMessage(content=f"[스크립트 시작]\n{SCRIPT_SENTENCE * 12}\n[스크립트 종료]")
+
+def make_state(total: int, work_dir: str, mode: str) -> dict:
+    # 10장마다 섹션 구분 슬라이드 ("Part N", 본문 없음)
+    titles = [
+        f"Part {i // 10 + 1}" if i % 10 == 0 else f"세부 주제 {i // 10 + 1}-{i % 10}: 개념과 예시"
+        for i in range(total)
+    ]
+    texts = ["" if i % 10 == 0 else "본문 내용 " * 10 for i in range(total)]
+    return {
+        "work_dir": work_dir,
+        "total_slides": total,
+        "titles": titles,
+        "texts": texts,
+        "planned_page_content": {
+            i: f"{titles[i]}의 핵심을 설명합니다. 정의와 예시, 비교 포인트를 정리합니다." for i in range(total)
+        },
+        "prompt": {"outline_context": mode, "target_duration_sec": 60},
+    }
+
+def measure(total: int, mode: str) -> PromptMeter:
+    meter = PromptMeter()
+    gen_script.llm_script = meter
+    with tempfile.TemporaryDirectory() as work_dir:
+        state = make_state(total, work_dir, mode)
+        for idx in range(total):
+            state["slide_index"] = idx
+            state["page_content"] = state["planned_page_content"][idx]
+            state = gen_script.node_generate_script(state)
+    return meter
+
+def run(sizes: list[int]) -> None:
+    rows = []
+    for n in sizes:
+        full = measure(n, "full")
+        window = measure(n, "window")
+        rows.append((n, full, window))
+
+    print(f"\n{'슬라이드':>8} {'full 누적':>12} {'window 누적':>12} {'절감':>6} {'full 최대/호출':>14} {'window 최대/호출':>16}")
+    for n, full, window in rows:
+        print(
+            f"{n:>8} {full.total:>12,} {window.total:>12,} {full.total / max(window.total, 1):>5.1f}x "
+            f"{full.peak:>14,} {window.peak:>16,}"
+        )
+
+if __name__ == "__main__":
+    run([int(x) for x in sys.argv[1:]] or [20, 100, 300])
@@ -0,0 +1,89 @@
+"""
+스크립트 생성 흐름(continuity) 모드별 소요 시간 비교 (외부 API 없이 지연만 흉내 낸 가짜 LLM)
+- script  : 이전 슬라이드 최종 스크립트를 참고 → 슬라이드 순서대로 1장씩 생성
+- outline : 이전 슬라이드 제목 + page_content를 참고 → script_all에서 동시 생성 (+ 경계 다듬기 선택)
+- 실행: python -m benchmarks.bench_script_continuity [슬라이드 수] [LLM 지연(초)]
+"""
+import os
+import sys
+import time
+import tempfile
+
+# 노드 모듈이 import 시점에 클라이언트를 만들기 때문에 더미 키 지정, 캐시/토큰 예산은 끔
+os.environ.setdefault("OPENAI_API_KEY", "sk-dummy")
+os.environ.setdefault("LLM_MODEL", "gpt-4o-mini")
+os.environ["LLM_CACHE"] = "bypass"
+os.environ["LLM_TPM"] = "0"
+
+from langchain_core.messages import AIMessage
+
+import src.nodes.gen_script as gen_script
+import src.nodes.script_all as script_all
+
+class FakeLLM:
+    """invoke마다 latency초 대기 후 고정 형식의 스크립트 반환"""
+    def __init__(self, latency: float, max_tokens: int | None = None):
+        self.latency = latency
+        self.max_tokens = max_tokens
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        time.sleep(self.latency)
+        return AIMessage(content=f"[스크립트 시작]\n이어서 핵심 개념을 설명합니다. 예시를 들어 보겠습니다. ({self.calls})\n[스크립트 종료]")
+
+def make_state(total: int, work_dir: str, continuity: str, smooth: bool = False) -> dict:
+    titles = [f"슬라이드 {i+1} 주제" for i in range(total)]
+    return {
+        "work_dir": work_dir,
+        "total_slides": total,
+        "titles": titles,
+        "planned_page_content": {i: f"{titles[i]}에 대한 요약 문장입니다. " * 4 for i in range(total)},
+        "prompt": {
+            "continuity": continuity,
+            "smooth_boundaries": smooth,
+            "script_workers": 8,
+            "target_duration_sec": 60,
+        },
+    }
+
+def run_serial(total: int, latency: float) -> tuple[float, int]:
+    llm = FakeLLM(latency)
+    gen_script.llm_script = llm
+    with tempfile.TemporaryDirectory() as work_dir:
+        state = make_state(total, work_dir, "script")
+        t0 = time.perf_counter()
+        for idx in range(total):
+            state["slide_index"] = idx
+            state["page_content"] = state["planned_page_content"][idx]
+            state = gen_script.node_generate_script(state)
+        return time.perf_counter() - t0, llm.calls
+
+def run_outline(total: int, latency: float, smooth: bool) -> tuple[float, int]:
+    llm = FakeLLM(latency)
+    smooth_llm = FakeLLM(latency / 4, max_tokens=256)   # 첫 문장만 다시 쓰는 짧은 호출
+    gen_script.llm_script = llm
+    script_all.llm_smooth = smooth_llm
+    with tempfile.TemporaryDirectory() as work_dir:
+        state = make_state(total, work_dir, "outline", smooth)
+        t0 = time.perf_counter()
+        state = script_all.node_script_all(state)
+        assert len(state["planned_scripts"]) == total
+        return time.perf_counter() - t0, llm.calls + smooth_llm.calls
+
+def run(total: int, latency: float) -> None:
+    rows = [
+        ("script (순차)", *run_serial(total, latency)),
+        ("outline (동시)", *run_outline(total, latency, smooth=False)),
+        ("outline + 경계 다듬기", *run_outline(total, latency, smooth=True)),
+    ]
+    base = rows[0][1]
+    print(f"\n슬라이드 {total}장, LLM 지연 {latency:.2f}초")
+    print(f"{'모드':<22} {'시간(s)':>8} {'호출 수':>7} {'배속':>7}")
+    for name, elapsed, calls in rows:
+        print(f"{name:<22} {elapsed:>8.2f} {calls:>7} {base / max(elapsed, 1e-9):>6.1f}x")
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    run(n, latency)
@@ -1,20 +1,12 @@
 
 import os
+import sys
+import argparse
 
-from langgraph.graph import StateGraph, END
-from src.utils.state import State
 import gradio as gr
 
-from src.nodes.parse_slides import node_parse_all
-from src.nodes.rag_search import node_tool_search
-from src.nodes.gen_page_content import node_generate_page_content
-from src.nodes.gen_script import node_generate_script
-from src.nodes.tts import node_tts
-from src.nodes.make_video import node_make_video
-from src.nodes.accumulate_step import node_accumulate_and_step
-from src.nodes.concat_video import node_concat
-from src.nodes.make_quiz import node_generate_quiz
-from src.nodes.router  import router_continue_or_done
+from src.graph import build_serial_graph, build_parallel_graph, count_slides, recursion_limit_for
+from src.utils.manifest import MANIFEST_NAME, load_manifest, write_manifest
 
 # 출력 dir 만들기
 WORK_DIR = "./gradio_output/"
@@ -25,48 +17,20 @@ os.makedirs(WORK_DIR, exist_ok=True)
 os.makedirs(MEDIA_DIR, exist_ok=True)
 os.makedirs(SLIDES_DIR, exist_ok=True)
 
-builder = StateGraph(State)
-
-# ---- 노드 등록 ----
-builder.add_node("parse_ppt", node_parse_all)
-builder.add_node("tool_search", node_tool_search)
-builder.add_node("gen_page_content", node_generate_page_content)
-builder.add_node("gen_script", node_generate_script)
-builder.add_node("tts", node_tts)
-builder.add_node("make_video", node_make_video)
-builder.add_node("accumulate", node_accumulate_and_step)
-builder.add_node("concat", node_concat)
-builder.add_node("make_quiz", node_generate_quiz)
-
-# ---- 기본 흐름 연결 ----
-builder.set_entry_point("parse_ppt")
-
-builder.add_edge("parse_ppt", "tool_search")
-builder.add_edge("tool_search", "gen_page_content")
-builder.add_edge("gen_page_content", "gen_script")
-builder.add_edge("gen_script", "tts")
-builder.add_edge("tts", "make_video")
-builder.add_edge("make_video", "accumulate")
-
-# 조건 분기 라우터 등록
-builder.add_conditional_edges(
-    "accumulate",                    # 분기 기준 노드
-    router_continue_or_done,         # 실행될 조건 함수
-    {                                # 반환값에 따라 이동할 노드 지정
-        "continue": "tool_search",   # 남은 슬라이드가 있을 때
-        "done": "concat"             # 모든 슬라이드 완료 시
-    }
-)
-
-builder.add_edge("concat", "make_quiz")
-builder.add_edge("make_quiz", END)
-# builder.add_edge("concat", "make_quiz")
-# builder.add_edge("make_quiz", END)
-
 # ---- 그래프 컴파일 ----
-app = builder.compile()
-
-def generate_state_and_run(pptx_file, tone, voice, style, target_duration_sec, speed):
+app = build_serial_graph()           # 슬라이드 순차 처리
+app_parallel = build_parallel_graph()  # 슬라이드 병렬(fan-out) 처리
+
+def generate_state_and_run(pptx_file, tone, voice, style, target_duration_sec, speed,
+                           parallel=False, max_workers=4, incremental=False, prev_manifest=None,
+                           render_profile="final", render_mode="clips", rag="auto",
+                           search_backend="tavily", rag_docs_dir=None, llm_cache="use",
+                           page_workers=8, llm_tpm=None, continuity="script", smooth_boundaries=False,
+                           outline_context="full", context_tokens=600):
+    """
+    - incremental=True 이면 이전 실행 manifest(prev_manifest, 없으면 WORK_DIR/manifest.json)와
+      비교해 바뀐 슬라이드와 그 다음 슬라이드만 다시 생성
+    """
 
     pptx_path = pptx_file
     USER_PROMPT = {
@@ -74,7 +38,20 @@ def generate_state_and_run(pptx_file, tone, voice, style, target_duration_sec, s
         "voice": voice,
         "style": style,
         "target_duration_sec": int(target_duration_sec),
-        "speed": float(speed)
+        "speed": float(speed),
+        "max_workers": int(max_workers),
+        "render_profile": render_profile,
+        "render_mode": render_mode,
+        "rag": rag,
+        "search_backend": search_backend,
+        "rag_docs_dir": rag_docs_dir,
+        "llm_cache": llm_cache,
+        "page_workers": int(page_workers),
+        "llm_tpm": llm_tpm,
+        "continuity": continuity,
+        "smooth_boundaries": bool(smooth_boundaries),
+        "outline_context": outline_context,
+        "context_tokens": int(context_tokens),
     }
 
     state = {
@@ -84,8 +61,18 @@ def generate_state_and_run(pptx_file, tone, voice, style, target_duration_sec, s
         "prompt": USER_PROMPT
     }
 
+    if incremental or prev_manifest:
+        manifest_path = prev_manifest or os.path.join(WORK_DIR, MANIFEST_NAME)
+        state["prev_manifest"] = load_manifest(manifest_path)
+
     # 실제 Agent 그래프(app) 실행
-    state = app.invoke(state, config={"recursion_limit": 200})
+    # 순차 그래프는 슬라이드 수에 맞춰 recursion_limit을 계산 (고정 200이면 30장 남짓에서 중단됨)
+    graph = app_parallel if parallel else app
+    limit = recursion_limit_for(count_slides(pptx_path), parallel=parallel)
+    state = graph.invoke(state, config={"recursion_limit": limit})
+
+    # 다음 실행의 증분 재생성을 위해 manifest 저장
+    write_manifest(state)
 
     final_video = state.get("final_video", "")
     quiz_set = state.get("quiz_set", {})
@@ -269,6 +256,29 @@ with gr.Blocks(theme="soft", title="🎬 AI 슬라이드 강의 생성기") as d
             info="음성 재생 속도를 조절하세요 (0.8x~2.0x)"
         )
 
+    with gr.Row():
+        inp_parallel = gr.Checkbox(label="⚡ 슬라이드 병렬 처리", value=False)
+        inp_workers = gr.Slider(
+            label="🧵 동시 처리 슬라이드 수",
+            minimum=1,
+            maximum=16,
+            step=1,
+            value=4,
+        )
+        inp_incremental = gr.Checkbox(label="♻️ 이전 결과 재사용 (바뀐 슬라이드만 재생성)", value=False)
+        inp_profile = gr.Radio(
+            label="🎞️ 렌더 프로필",
+            choices=["final", "draft"],
+            value="final",
+            info="draft: 720p·저 fps 빠른 미리보기 / final: 최종 품질",
+        )
+        inp_render_mode = gr.Radio(
+            label="🎬 렌더링 방식",
+            choices=["clips", "single_pass"],
+            value="clips",
+            info="clips: 슬라이드별 클립 후 병합 / single_pass: 강의 전체를 한 번에 렌더링",
+        )
+
     run_btn = gr.Button("🚀 실행", variant="primary")
 
     # 출력 구역
@@ -308,7 +318,8 @@ with gr.Blocks(theme="soft", title="🎬 AI 슬라이드 강의 생성기") as d
     # 버튼 연결
     run_btn.click(
         fn=generate_state_and_run,
-        inputs=[inp_ppt, inp_tone, inp_voice, inp_style, inp_duration, inp_speed],
+        inputs=[inp_ppt, inp_tone, inp_voice, inp_style, inp_duration, inp_speed,
+                inp_parallel, inp_workers, inp_incremental, inp_profile, inp_render_mode],
         outputs=[out_video, out_download, quiz_state]
     )
 
@@ -327,4 +338,73 @@ with gr.Blocks(theme="soft", title="🎬 AI 슬라이드 강의 생성기") as d
     )
 
 
-demo.launch(share=True)
+# ===============================
+# 🔹 CLI 실행 (인자가 있으면 UI 없이 실행)
+# ===============================
+def run_cli(argv=None):
+    parser = argparse.ArgumentParser(description="AI 슬라이드 강의 생성기 (CLI)")
+    parser.add_argument("pptx", help="입력 PPTX 경로")
+    parser.add_argument("--tone", default=tone_choices[0])
+    parser.add_argument("--voice", default=voice_choices[0])
+    parser.add_argument("--style", default=style_choices[0])
+    parser.add_argument("--duration", type=int, default=60, help="페이지 당 목표 초")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--parallel", action="store_true", help="슬라이드 병렬 처리")
+    parser.add_argument("--workers", type=int, default=4, help="동시 처리 슬라이드 수")
+    parser.add_argument("--profile", default="final", choices=["final", "draft"],
+                        help="렌더 프로필 (draft: 빠른 미리보기)")
+    parser.add_argument("--rag", default="auto", choices=["auto", "always", "never"],
+                        help="외부 검색: auto(표지/목차/Q&A 등 생략) / always / never")
+    parser.add_argument("--search-backend", default=os.getenv("SEARCH_BACKEND", "tavily"),
+                        choices=["tavily", "local"], help="외부 검색 backend (local: 로컬 문서 BM25)")
+    parser.add_argument("--docs-dir", default=None,
+                        help="local backend 참고 문서 폴더 (기본 RAG_DOCS_DIR)")
+    parser.add_argument("--llm-cache", default=os.getenv("LLM_CACHE", "use"),
+                        choices=["use", "refresh", "bypass"],
+                        help="LLM 응답 캐시: use(재사용) / refresh(새로 생성해 덮어씀) / bypass(사용 안 함)")
+    parser.add_argument("--page-workers", type=int, default=8,
+                        help="슬라이드 요약(page_content) 동시 생성 수")
+    parser.add_argument("--llm-tpm", type=float, default=None,
+                        help="LLM 분당 토큰 예산 (기본 LLM_TPM)")
+    parser.add_argument("--continuity", default="script", choices=["script", "outline"],
+                        help="슬라이드 흐름 참고: script(이전 스크립트, 순차) / outline(이전 제목·요약, 스크립트 동시 생성)")
+    parser.add_argument("--smooth", action="store_true",
+                        help="outline 흐름에서 슬라이드 경계 첫 문장 다듬기")
+    parser.add_argument("--outline-context", default="full", choices=["full", "window"],
+                        help="스크립트 프롬프트 문맥: full(전체 목차+이전 스크립트) / window(주변 목차+섹션+최근 요약, 토큰 예산, 증분 재사용 안 함)")
+    parser.add_argument("--context-tokens", type=int, default=600,
+                        help="window 문맥의 호출당 최대 토큰")
+    parser.add_argument("--single-pass", action="store_true",
+                        help="슬라이드별 클립 없이 강의 전체를 ffmpeg 1회로 렌더링")
+    parser.add_argument("--manifest", default=None,
+                        help="이전 실행 manifest.json 경로 (바뀐 슬라이드만 재생성)")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"{WORK_DIR}{MANIFEST_NAME} 기준으로 증분 재생성")
+    args = parser.parse_args(argv)
+
+    final_video, _, quiz_set = generate_state_and_run(
+        args.pptx, args.tone, args.voice, args.style, args.duration, args.speed,
+        parallel=args.parallel, max_workers=args.workers,
+        incremental=args.incremental, prev_manifest=args.manifest,
+        render_profile=args.profile,
+        render_mode="single_pass" if args.single_pass else "clips",
+        rag=args.rag,
+        search_backend=args.search_backend,
+        rag_docs_dir=args.docs_dir,
+        llm_cache=args.llm_cache,
+        page_workers=args.page_workers,
+        llm_tpm=args.llm_tpm,
+        continuity=args.continuity,
+        smooth_boundaries=args.smooth,
+        outline_context=args.outline_context,
+        context_tokens=args.context_tokens,
+    )
+    print(f"최종 영상: {final_video}")
+    print(f"퀴즈 문항 수: {len(get_quiz_list(quiz_set))}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_cli()
+    else:
+        demo.launch(share=True)
@@ -0,0 +1,137 @@
+from langgraph.graph import StateGraph, END
+from pptx import Presentation
+
+from .utils.state import State
+from .nodes.parse_slides import node_parse_all
+from .nodes.rag_search import node_tool_search
+from .nodes.plan_search import node_plan_search
+from .nodes.gen_page_content import node_generate_page_content
+from .nodes.page_content_all import node_page_content_all
+from .nodes.script_all import node_script_all
+from .nodes.gen_script import node_generate_script
+from .nodes.tts import node_tts, node_tts_all
+from .nodes.make_video import node_make_video
+from .nodes.accumulate_step import node_accumulate_and_step
+from .nodes.process_slides import node_process_slides
+from .nodes.render_slides import node_render_slides
+from .nodes.concat_video import node_concat
+from .nodes.make_quiz import node_generate_quiz
+from .nodes.router import router_continue_or_done
+from .nodes.reuse_slide import node_reuse_slide
+
+# 순차 그래프에서 슬라이드 1장당 실행되는 노드 수
+# (tool_search, gen_page_content, gen_script, tts, make_video, accumulate)
+SERIAL_STEPS_PER_SLIDE = 6
+# 슬라이드 수와 무관한 노드(parse_ppt, plan_search, page_content_all, script_all, concat, make_quiz) + 여유분
+BASE_STEPS = 10
+
+def count_slides(pptx_path: str) -> int:
+    return len(Presentation(pptx_path).slides)
+
+def recursion_limit_for(total_slides: int, parallel: bool = False) -> int:
+    """
+    그래프 실행에 필요한 recursion_limit 계산
+    - 순차 그래프는 슬라이드마다 노드 6개를 거치므로 슬라이드 수에 비례
+    - 병렬 그래프는 슬라이드 수와 무관하게 고정 단계 수
+    """
+    if parallel:
+        return BASE_STEPS
+    return BASE_STEPS + SERIAL_STEPS_PER_SLIDE * max(int(total_slides), 1)
+
+def build_serial_graph():
+    """
+    기본(순차) 그래프
+    - plan_search에서 덱 전체 검색을 한 번에 하고 page_content_all에서 모든 슬라이드 요약을 동시에 만든 뒤
+      (continuity='outline'이면 script_all에서 스크립트도 동시에 생성)
+      슬라이드 1장씩 tool_search → ... → accumulate 를 돌고 router로 반복
+    """
+    builder = StateGraph(State)
+
+    # ---- 노드 등록 ----
+    builder.add_node("parse_ppt", node_parse_all)
+    builder.add_node("plan_search", node_plan_search)
+    builder.add_node("page_content_all", node_page_content_all)
+    builder.add_node("script_all", node_script_all)
+    builder.add_node("tool_search", node_tool_search)
+    builder.add_node("gen_page_content", node_generate_page_content)
+    builder.add_node("gen_script", node_generate_script)
+    builder.add_node("tts", node_tts)
+    builder.add_node("make_video", node_make_video)
+    builder.add_node("accumulate", node_accumulate_and_step)
+    builder.add_node("reuse_slide", node_reuse_slide)
+    builder.add_node("concat", node_concat)
+    builder.add_node("make_quiz", node_generate_quiz)
+
+    # ---- 기본 흐름 연결 ----
+    builder.set_entry_point("parse_ppt")
+
+    builder.add_edge("parse_ppt", "plan_search")
+    builder.add_edge("plan_search", "page_content_all")
+    builder.add_edge("page_content_all", "script_all")
+
+    # 첫 슬라이드도 재사용 대상일 수 있으므로 덱 단위 단계 직후부터 router로 분기
+    builder.add_conditional_edges(
+        "script_all",
+        router_continue_or_done,
+        {
+            "continue": "tool_search",
+            "reuse": "reuse_slide",
+            "done": "concat"
+        }
+    )
+    builder.add_edge("tool_search", "gen_page_content")
+    builder.add_edge("gen_page_content", "gen_script")
+    builder.add_edge("gen_script", "tts")
+    builder.add_edge("tts", "make_video")
+    builder.add_edge("make_video", "accumulate")
+    builder.add_edge("reuse_slide", "accumulate")
+
+    # 조건 분기 라우터 등록
+    builder.add_conditional_edges(
+        "accumulate",                    # 분기 기준 노드
+        router_continue_or_done,         # 실행될 조건 함수
+        {                                # 반환값에 따라 이동할 노드 지정
+            "continue": "tool_search",   # 남은 슬라이드가 있을 때
+            "reuse": "reuse_slide",      # 변경 없는 슬라이드 (증분 재생성)
+            "done": "concat"             # 모든 슬라이드 완료 시
+        }
+    )
+
+    builder.add_edge("concat", "make_quiz")
+    builder.add_edge("make_quiz", END)
+
+    return builder.compile()
+
+def build_parallel_graph():
+    """
+    병렬(fan-out) 그래프
+    - parse_ppt → plan_search(덱 전체 검색) → page_content_all(덱 전체 요약 동시 생성)
+      → script_all(outline 흐름이면 스크립트 동시 생성) 후 process_slides 노드가 슬라이드들을 워커 풀로 나눠 검색/요약/스크립트를 만들고
+      tts_all(덱 전체 동시 TTS) → render_slides(슬라이드 영상 병렬 렌더링) → concat 순서로 진행
+    - 그래프 단계 수가 슬라이드 수와 무관 (슬라이드 반복은 노드 내부에서 처리)
+    """
+    builder = StateGraph(State)
+
+    builder.add_node("parse_ppt", node_parse_all)
+    builder.add_node("plan_search", node_plan_search)
+    builder.add_node("page_content_all", node_page_content_all)
+    builder.add_node("script_all", node_script_all)
+    builder.add_node("process_slides", node_process_slides)
+    builder.add_node("tts_all", node_tts_all)
+    builder.add_node("render_slides", node_render_slides)
+    builder.add_node("concat", node_concat)
+    builder.add_node("make_quiz", node_generate_quiz)
+
+    builder.set_entry_point("parse_ppt")
+
+    builder.add_edge("parse_ppt", "plan_search")
+    builder.add_edge("plan_search", "page_content_all")
+    builder.add_edge("page_content_all", "script_all")
+    builder.add_edge("script_all", "process_slides")
+    builder.add_edge("process_slides", "tts_all")
+    builder.add_edge("tts_all", "render_slides")
+    builder.add_edge("render_slides", "concat")
+    builder.add_edge("concat", "make_quiz")
+    builder.add_edge("make_quiz", END)
+
+    return builder.compile()
@@ -1,5 +1,7 @@
 import os
 from ..utils.state import State
+from ..utils.manifest import record_slide
+from .render_lecture import is_single_pass
 
 def node_accumulate_and_step(state: State) -> State:
     """
@@ -23,19 +25,26 @@ def node_accumulate_and_step(state: State) -> State:
             state["video_paths"].append(current_video)
         print(f"슬라이드 {current_idx+1} 완료 → {current_video}")
 
+    elif is_single_pass(state) and state.get("audio") and os.path.exists(state["audio"]):
+        # 단일 패스 모드는 클립 없이 음성만 있으면 완료 (영상은 concat 단계에서 한 번에 렌더링)
+        print(f"슬라이드 {current_idx+1} 완료 → {state['audio']}")
+
     else:
         print(f"슬라이드 {current_idx+1} 영상 생성 실패")
         state.setdefault("failed_slides", []).append(current_idx)
 
+    # manifest용 슬라이드 산출물 기록
+    record_slide(state, current_idx, state)
+
     # 2) 다음 슬라이드로 이동
     state["slide_index"] = current_idx + 1
 
     # 진행률 계산
     progress = (state["slide_index"] / total) * 100
-    success = len(state["video_paths"])
     failed = len(state.get("failed_slides", []))
+    success = state["slide_index"] - failed
 
     print(f" 진행률: {state['slide_index']}/{total} ({progress:.1f}%)")
     print(f"   성공: {success} | 실패: {failed}")
 
-    return state
\ No newline at end of file
+    return state
@@ -1,31 +1,73 @@
 import os
 import re
+import json
 import subprocess
 
-from ..utils.utils import ffprobe_duration
+from ..utils.media_info import media_duration
 from ..utils.state import State
+from ..utils.artifact_cache import get_artifact_cache
+from ..utils.llm_cache import llm_cache_stats
+from .render_lecture import is_single_pass, node_render_lecture
+
+# 스트림 복사(concat demuxer)를 하려면 모든 클립에서 같아야 하는 코덱 파라미터
+# - 프레임레이트나 채널 구성(mono/stereo)이 다르면 -c copy 결과에서 A/V 싱크가 어긋나거나 재생이 깨짐
+STREAM_KEYS = (
+    "codec_type", "codec_name", "profile", "width", "height", "pix_fmt",
+    "r_frame_rate", "avg_frame_rate",
+    "sample_rate", "channels", "channel_layout", "time_base",
+)
+
+def _stream_params(path: str) -> tuple | None:
+    """ffprobe로 클립의 스트림 코덱 파라미터를 읽는다 (실패 시 None)"""
+    try:
+        out = subprocess.check_output([
+            "ffprobe", "-v", "error", "-show_streams", "-of", "json", path
+        ]).decode()
+        streams = json.loads(out).get("streams", [])
+    except Exception:
+        return None
+    return tuple(
+        tuple(str(s.get(k, "")) for k in STREAM_KEYS)
+        for s in streams
+    )
 
-def node_concat(state: State) -> State:
-    """
-    Node 9. concat (안정적인 filter_complex 방식)
-    - 모든 슬라이드 영상을 하나의 최종 강의 영상으로 합친다.
-    """
-
-    video_paths = state.get("video_paths", [])
-    work_dir = state.get("work_dir", "./")
-
-    if not video_paths:
-        print("합칠 영상이 없습니다.")
-        return state
-
-    print(f"총 {len(video_paths)}개의 슬라이드 영상 병합 시작")
+def can_stream_copy(video_paths: list[str]) -> bool:
+    """모든 클립의 코덱 파라미터가 같으면 True"""
+    first = None
+    for path in video_paths:
+        params = _stream_params(path)
+        if not params:
+            return False
+        if first is None:
+            first = params
+        elif params != first:
+            print(f"[concat] 코덱 파라미터 불일치 → {os.path.basename(path)}")
+            return False
+    return first is not None
+
+def _concat_copy(video_paths: list[str], final_video: str, work_dir: str) -> subprocess.CompletedProcess:
+    """concat demuxer + -c copy (재인코딩 없이 이어붙이기)"""
+    list_path = os.path.join(work_dir, "concat_list.txt")
+    with open(list_path, "w", encoding="utf-8") as f:
+        for path in video_paths:
+            safe = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{safe}'\n")
 
-    # 무조건 정렬 (slide 번호 기준)
-    video_paths = sorted(video_paths, key=lambda x: int(re.findall(r"slide(\d+)", x)[0]))
+    cmd = [
+        "ffmpeg", "-y",
+        "-f", "concat",
+        "-safe", "0",
+        "-i", list_path,
+        "-c", "copy",
+        "-movflags", "+faststart", # 웹 재생 최적화
+        final_video
+    ]
 
-    # 최종 파일 경로
-    final_video = os.path.join(work_dir, "final_lecture.mp4")
+    print("FFmpeg 병합 중 (concat demuxer, 스트림 복사)...")
+    return subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
 
+def _concat_reencode(video_paths: list[str], final_video: str) -> subprocess.CompletedProcess:
+    """filter_complex concat (모든 클립을 디코딩 후 재인코딩)"""
     # filter_complex input list 구성
     input_cmd = []
     filter_inputs = ""
@@ -49,10 +91,48 @@ def node_concat(state: State) -> State:
     ]
 
     print("FFmpeg 병합 중 (filter_complex concat 사용)...")
+    return subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
 
-    result = subprocess.run(
-        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-    )
+def node_concat(state: State) -> State:
+    """
+    Node 9. concat
+    - 모든 슬라이드 영상을 하나의 최종 강의 영상으로 합친다.
+    - 클립들의 코덱 파라미터가 모두 같으면 concat demuxer + 스트림 복사 (재인코딩 없음)
+    - 불일치하거나 복사 병합이 실패하면 기존 filter_complex 재인코딩으로 대체
+    - prompt['concat_mode'] = "reencode" 이면 항상 재인코딩
+    - prompt['render_mode'] = "single_pass" 이면 클립 병합 대신 이미지 + 음성으로 한 번에 렌더링
+    """
+
+    if is_single_pass(state):
+        return node_render_lecture(state)
+
+    video_paths = state.get("video_paths", [])
+    work_dir = state.get("work_dir", "./")
+    prompt = state.get("prompt", {}) or {}
+    concat_mode = prompt.get("concat_mode", "auto")
+
+    if not video_paths:
+        print("합칠 영상이 없습니다.")
+        return state
+
+    print(f"총 {len(video_paths)}개의 슬라이드 영상 병합 시작")
+
+    # 무조건 정렬 (slide 번호 기준)
+    video_paths = sorted(video_paths, key=lambda x: int(re.findall(r"slide(\d+)", x)[0]))
+
+    # 최종 파일 경로
+    final_video = os.path.join(work_dir, "final_lecture.mp4")
+
+    result = None
+    if concat_mode != "reencode" and can_stream_copy(video_paths):
+        result = _concat_copy(video_paths, final_video, work_dir)
+        if result.returncode != 0:
+            print("[경고] 스트림 복사 병합 실패 → 재인코딩으로 다시 시도")
+            print(result.stderr.decode())
+            result = None
+
+    if result is None:
+        result = _concat_reencode(video_paths, final_video)
 
     if result.returncode != 0:
         print("[오류] 영상 병합 실패")
@@ -60,7 +140,7 @@ def node_concat(state: State) -> State:
         return state
 
     # 병합 완료 정보 출력
-    duration = ffprobe_duration(final_video)
+    duration = media_duration(final_video)
     size_mb = os.path.getsize(final_video) / (1024 * 1024)
 
     print(" 최종 강의 영상 생성 완료!")
@@ -68,5 +148,15 @@ def node_concat(state: State) -> State:
     print(f" 총 재생 시간: {duration:.1f}초")
     print(f" 파일 크기: {size_mb:.2f} MB")
 
+    cache = get_artifact_cache(state)
+    if cache:
+        for stage, st in cache.stats().items():
+            print(f" [캐시] {stage}: hit {st['hits']} / miss {st['misses']}")
+    for stage, st in llm_cache_stats().items():
+        print(
+            f" [LLM 캐시] {stage}: hit {st['hits']} / miss {st['misses']} / bypass {st['bypass']}"
+            f" | 토큰 입력 {st['tokens_in']:,} / 출력 {st['tokens_out']:,}"
+        )
+
     state["final_video"] = final_video
-    return state
\ No newline at end of file
+    return state
@@ -6,13 +6,16 @@ from dotenv import load_dotenv
 from ..utils.state import State
 from ..utils.utils import clean_text, split_sents, img_to_data_url
 from ..utils.split_chunk import build_external_block_for_prompt
+from ..utils.llm_cache import cached_invoke
 
 load_dotenv()
 
 LLM_MODEL = os.getenv("LLM_MODEL")
+PAGE_TEMPERATURE = 0.3  # 요약/설명이라 약간 낮게, 필요하면 조정
+PAGE_SYSTEM_PROMPT = "당신은 슬라이드의 텍스트와 이미지, 표, 그래프 등을 바탕으로 강의 내용을 생성하고 신뢰할 수 있는 외부 자료로 보완하는 전문 강사입니다."
 llm_page = ChatOpenAI(
     model=LLM_MODEL,
-    temperature=0.3,  # 요약/설명이라 약간 낮게, 필요하면 조정
+    temperature=PAGE_TEMPERATURE,
     api_key=os.getenv("OPENAI_API_KEY")
 )
 
@@ -21,9 +24,17 @@ def node_generate_page_content(state: State) -> State:
     슬라이드 인덱스 기준으로 해당 슬라이드 내용만 사용.
     - 텍스트는 항상 문자열로 처리.
     - 외부 보완 자료(external_content) 통합 후 요약 생성.
+    - page_content_all 단계에서 미리 생성했으면 그 결과를 그대로 사용.
     """
     # (1) 인덱스 및 데이터 선택
     idx = int(state.get("slide_index", 0))
+
+    planned = state.get("planned_page_content") or {}
+    if idx in planned:
+        print(f"[page_content] 슬라이드 {idx+1} 미리 생성한 결과 사용")
+        state["page_content"] = planned[idx]
+        return state
+
     titles = state.get("titles", [])
     texts_all = state.get("texts", [])
     tables_all = state.get("tables", [])
@@ -35,6 +46,7 @@ def node_generate_page_content(state: State) -> State:
     tables = tables_all[idx] if idx < len(tables_all) else []
     images = images_all[idx] if idx < len(images_all) else []
     shape_texts = shape_texts_all[idx] if idx < len(shape_texts_all) else []
+    prompt_data = state.get("prompt") or {}
     prompt = clean_text(str(state.get("prompt", "")))
 
     # (2) 표 전처리: 첫 표 최대 6행만 문자열로
@@ -126,6 +138,7 @@ def node_generate_page_content(state: State) -> State:
     )
 
     # (7) LangChain LLM 호출 (멀티모달: 텍스트 + 이미지)
+    # - LLM 응답 캐시: 모델 + temperature + 메시지 + 이미지 해시가 같으면 이전 응답 재사용
     human_content = [{"type": "text", "text": content_input}]
     for img_url in image_data_urls:
         human_content.append({
@@ -133,13 +146,15 @@ def node_generate_page_content(state: State) -> State:
             "image_url": {"url": img_url},
         })
 
-    response_msg = llm_page.invoke(
+    response_msg = cached_invoke(
+        llm_page,
         [
-            SystemMessage(
-                content="당신은 슬라이드의 텍스트와 이미지, 표, 그래프 등을 바탕으로 강의 내용을 생성하고 신뢰할 수 있는 외부 자료로 보완하는 전문 강사입니다."
-            ),
+            SystemMessage(content=PAGE_SYSTEM_PROMPT),
             HumanMessage(content=human_content),
-        ]
+        ],
+        stage="page_content",
+        mode=prompt_data.get("llm_cache"),
+        tpm=prompt_data.get("llm_tpm"),
     )
 
     # (8) 결과 저장
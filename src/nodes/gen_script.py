@@ -6,23 +6,97 @@ from dotenv import load_dotenv
 
 from ..utils.state import State
 from ..utils.utils import clean_text
+from ..utils.llm_cache import cached_invoke
+from ..utils.script_context import context_mode, build_script_context
 
 load_dotenv()
 
 LLM_MODEL = os.getenv("LLM_MODEL")
+SCRIPT_TEMPERATURE = 0.7
 llm_script = ChatOpenAI(
     model=LLM_MODEL,
-    temperature=0.7,
+    temperature=SCRIPT_TEMPERATURE,
     api_key=os.getenv("OPENAI_API_KEY")
 )
 
-def node_generate_script(state: State) -> State:
+# 슬라이드 간 흐름(continuity)을 이어 주는 방식 (prompt['continuity'])
+# - script  : 이전 슬라이드의 최종 스크립트를 참고 (기본, 슬라이드 순서대로만 생성 가능)
+# - outline : 이전 슬라이드의 제목 + page_content를 참고 → 모든 슬라이드 스크립트를 동시에 생성 가능
+CONTINUITY_MODES = ("script", "outline")
+
+def continuity_mode(prompt: dict | None) -> str:
+    mode = str((prompt or {}).get("continuity", "script")).lower()
+    return mode if mode in CONTINUITY_MODES else "script"
+
+def previous_outline(state: State, idx: int) -> str | None:
+    """이전 슬라이드의 제목 + 요약 (outline 모드의 흐름 참고용)"""
+    if idx <= 0:
+        return None
+    titles = state.get("titles", [])
+    title = titles[idx - 1] if idx - 1 < len(titles) else f"슬라이드 {idx}"
+    page_content = (state.get("planned_page_content") or {}).get(idx - 1)
+    if page_content is None:
+        # 재사용 슬라이드는 이전 실행 기록의 요약 사용
+        page_content = ((state.get("reuse_slides") or {}).get(idx - 1) or {}).get("page_content", "")
+    return f"- 제목: {title}\n    - 요약: {clean_text(page_content or '(요약 없음)')}"
+
+def clean_script(raw_script: str) -> str:
     """
-    page_content를 실제 사람이 ‘강의하듯 말하는 스타일’로 변환하는 단계.
-    이전 스크립트 흐름 유지, 톤앤매너, 길이 조절, 금지 표현 제거 등을 모두 포함.
+    LLM 응답에서 [스크립트 시작]~[스크립트 종료] 사이만 꺼내고 금지 표현을 제거한다.
     """
+    start_tag = "[스크립트 시작]"
+    end_tag = "[스크립트 종료]"
 
-    print("\n--- Node 4: 강의 스크립트 생성(gen_script) 실행 ---")
+    if start_tag in raw_script and end_tag in raw_script:
+        script = raw_script.split(start_tag, 1)[1].split(end_tag, 1)[0].strip()
+    else:
+        # 태그가 없으면 전체를 스크립트로 간주
+        script = raw_script.strip()
+
+    banned_line_phrases = [
+        "이번 슬라이드에서는",
+        "지금 보시는 슬라이드는",
+        "다음 슬라이드에서는",
+        "다음으로 넘어가",
+        "이번 강의에서는",
+        "이번 강의에선",
+        "이번 강의에서",
+    ]
+
+    lines = script.splitlines()
+    cleaned_lines = []
+    for line in lines:
+        if any(phrase in line for phrase in banned_line_phrases):
+            # 해당 줄 전체를 버림
+            continue
+        cleaned_lines.append(line)
+    script = "\n".join(cleaned_lines)
+
+    # 5-2) 그래도 남아 있을 수 있는 경우, 단어 단위로 한 번 더 제거
+    banned_patterns = [
+        r"이번\s*슬라이드\s*에서는",
+        r"지금\s*보시는\s*슬라이드는",
+        r"다음\s*슬라이드\s*에서는",
+        r"다음으로\s*넘어가[^\n\.]*",
+        r"이번\s*강의\s*에서는",
+        r"이번\s*강의\s*에선",
+        r"이번\s*강의\s*에서",
+    ]
+
+    for pattern in banned_patterns:
+        script = re.sub(pattern, "", script)
+
+    # 중복 공백/줄 정리
+    script = re.sub(r"[ \t]{2,}", " ", script)
+    script = re.sub(r"\n{3,}", "\n\n", script).strip()
+
+    return script
+
+def generate_script(state: State, idx: int, page_content: str) -> str:
+    """
+    슬라이드 idx의 page_content를 강의 스크립트로 변환 (LLM 호출 + 금지 표현 필터링)
+    - 이전 흐름: continuity가 script면 all_scripts[-1], outline이면 이전 슬라이드 제목/요약
+    """
 
     # ============================
     # 1. State에서 입력 정보 추출
@@ -31,17 +105,38 @@ def node_generate_script(state: State) -> State:
     all_titles = state.get("titles", [])
     total_slides = len(all_titles)
 
-    idx = state.get("slide_index", 0)
     current_title = all_titles[idx] if idx < len(all_titles) else f"슬라이드 {idx+1}"
 
-    page_content = clean_text(state.get("page_content", ""))
-
-    # 이전 스크립트
-    prev_scripts = state.get("all_scripts", [])
-    previous_script = prev_scripts[-1] if prev_scripts else None
+    page_content = clean_text(page_content)
 
     # 사용자 프롬프트 스타일 옵션
     prompt_data = state.get("prompt", {})
+
+    # 이전 흐름: 이전 스크립트 또는 이전 슬라이드 제목/요약
+    if continuity_mode(prompt_data) == "outline":
+        previous_header = "이전 슬라이드 (제목/요약)"
+        previous_script = previous_outline(state, idx)
+    else:
+        previous_header = "이전 스크립트 흐름"
+        prev_scripts = state.get("all_scripts", [])
+        previous_script = prev_scripts[-1] if prev_scripts else None
+
+    # 강의 문맥: window(선택)면 주변 목차 + 섹션 + 최근 요약 + 이전 흐름 끝부분을 토큰 예산 안에서 구성
+    if context_mode(prompt_data) == "window":
+        ctx = build_script_context(state, idx, previous_script)
+        previous_script = ctx["previous"]
+        outline_block = (
+            f"# 강의 목차 (현재 위치 주변, 전체 {total_slides}장)\n    "
+            + "\n    ".join(ctx["outline"])
+            + "\n\n    # 앞선 섹션 / 다음 섹션\n    "
+            + ("\n    ".join(ctx["sections"]) or "(없음)")
+            + "\n\n    # 지금까지 다룬 내용 (최근 슬라이드 요약)\n    "
+            + ("\n    ".join(ctx["summary"]) or "(없음)")
+        )
+        print(f"   → 문맥 약 {ctx['tokens']}토큰 (예산 {ctx['budget']})")
+    else:
+        outline_block = f"# 전체 강의 목차\n    {all_titles}"
+
     tone = prompt_data.get("tone", "친절하고 명료한 톤")
     style = prompt_data.get("style", "자연스럽고 설명적인 말투")
     target_sec = prompt_data.get("target_duration_sec", 70)  # 기본값 70초 (60~90 사이)
@@ -52,8 +147,6 @@ def node_generate_script(state: State) -> State:
     sent_min = max(4, int(target_sec / 15))  # 15초에 1문장 정도
     sent_max = max(sent_min + 2, int(target_sec / 10))
 
-    work_dir = state.get("work_dir", "./")
-
     # 예외 처리: page_content가 없으면 title 기반 생성
     if not page_content.strip():
         page_content = (
@@ -117,14 +210,13 @@ def node_generate_script(state: State) -> State:
     )
 
     user_prompt = f"""
-    # 전체 강의 목차
-    {all_titles}
+    {outline_block}
 
     # 현재 슬라이드
     - index: {idx}
     - title: {current_title}
 
-    # 이전 스크립트 흐름
+    # {previous_header}
     {previous_script if previous_script else "(첫 슬라이드이므로 없음)"}
 
     # 현재 슬라이드 요약(page_content)
@@ -152,67 +244,41 @@ def node_generate_script(state: State) -> State:
     """
 
     # ============================
-    # 4. LangChain LLM 호출
+    # 4. LangChain LLM 호출 (LLM 응답 캐시 우선)
     # ============================
 
-    response_msg = llm_script.invoke(
+    response_msg = cached_invoke(
+        llm_script,
         [
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_prompt),
-        ]
+        ],
+        stage="script",
+        mode=prompt_data.get("llm_cache"),
+        tpm=prompt_data.get("llm_tpm"),
     )
 
-    raw_script = response_msg.content or ""
-
-    # ============================
     # 5. 태그 파싱 + 금지 표현 필터링
-    # ============================
-
-    start_tag = "[스크립트 시작]"
-    end_tag = "[스크립트 종료]"
-
-    if start_tag in raw_script and end_tag in raw_script:
-        script = raw_script.split(start_tag, 1)[1].split(end_tag, 1)[0].strip()
-    else:
-        # 태그가 없으면 전체를 스크립트로 간주
-        script = raw_script.strip()
+    return clean_script(response_msg.content or "")
 
-    banned_line_phrases = [
-        "이번 슬라이드에서는",
-        "지금 보시는 슬라이드는",
-        "다음 슬라이드에서는",
-        "다음으로 넘어가",
-        "이번 강의에서는",
-        "이번 강의에선",
-        "이번 강의에서",
-    ]
-
-    lines = script.splitlines()
-    cleaned_lines = []
-    for line in lines:
-        if any(phrase in line for phrase in banned_line_phrases):
-            # 해당 줄 전체를 버림
-            continue
-        cleaned_lines.append(line)
-    script = "\n".join(cleaned_lines)
+def node_generate_script(state: State) -> State:
+    """
+    page_content를 실제 사람이 ‘강의하듯 말하는 스타일’로 변환하는 단계.
+    이전 스크립트 흐름 유지, 톤앤매너, 길이 조절, 금지 표현 제거 등을 모두 포함.
+    - script_all 단계에서 미리 생성했으면(outline 모드) 그 결과를 그대로 사용.
+    """
 
-    # 5-2) 그래도 남아 있을 수 있는 경우, 단어 단위로 한 번 더 제거
-    banned_patterns = [
-        r"이번\s*슬라이드\s*에서는",
-        r"지금\s*보시는\s*슬라이드는",
-        r"다음\s*슬라이드\s*에서는",
-        r"다음으로\s*넘어가[^\n\.]*",
-        r"이번\s*강의\s*에서는",
-        r"이번\s*강의\s*에선",
-        r"이번\s*강의\s*에서",
-    ]
+    print("\n--- Node 4: 강의 스크립트 생성(gen_script) 실행 ---")
 
-    for pattern in banned_patterns:
-        script = re.sub(pattern, "", script)
+    idx = state.get("slide_index", 0)
+    work_dir = state.get("work_dir", "./")
 
-    # 중복 공백/줄 정리
-    script = re.sub(r"[ \t]{2,}", " ", script)
-    script = re.sub(r"\n{3,}", "\n\n", script).strip()
+    planned = state.get("planned_scripts") or {}
+    if idx in planned:
+        print(f"[스크립트] 슬라이드 {idx+1} 미리 생성한 결과 사용")
+        script = planned[idx]
+    else:
+        script = generate_script(state, idx, state.get("page_content", ""))
 
     # ============================
     # 6. State 저장
@@ -6,6 +6,7 @@ from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 
 from ..utils.state import State
+from ..utils.llm_cache import cached_invoke
 import re
 
 LLM_MODEL = os.getenv("LLM_MODEL")
@@ -82,12 +83,15 @@ def node_generate_quiz(state: State) -> State:
       """)
     
     
-    response = llm_quiz.invoke(
+    response = cached_invoke(
+        llm_quiz,
         [
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_prompt),
-        ]
-   
+        ],
+        stage="quiz",
+        mode=(state.get("prompt") or {}).get("llm_cache"),
+        tpm=(state.get("prompt") or {}).get("llm_tpm"),
     )
 
 
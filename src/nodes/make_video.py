@@ -1,8 +1,33 @@
 import os
 import subprocess
 
-from ..utils.utils import ffprobe_duration
+from ..utils.media_info import media_duration
 from ..utils.state import State
+from ..utils.artifact_cache import get_artifact_cache, hash_file, make_key
+from ..utils.render_profiles import get_render_profile, input_args, encode_args
+from .render_lecture import wants_clips
+
+def build_slide_cmd(image_path: str, audio_path: str, out_mp4: str, total_duration: float, profile: dict,
+                    threads: int = 0) -> list[str]:
+    """
+    정지 이미지 + 음성 → mp4 FFmpeg 명령
+    - 이미지는 loop(정지 이미지), 해상도/fps/x264 옵션은 렌더 프로필을 따름
+    - 모든 플레이어 호환: libx264 + yuv420p
+    - threads > 0 이면 인코더 스레드 수 제한 (동시 렌더링 시 스케줄러가 지정)
+    """
+    thread_args = ["-threads", str(threads)] if threads > 0 else []
+    return [
+        "ffmpeg",
+        "-y",                # 기존 파일 덮어쓰기
+        "-loop", "1",        # 이미지 loop
+        *input_args(profile),
+        "-i", image_path,    # 이미지 입력
+        "-i", audio_path,    # 오디오 입력
+        "-t", str(total_duration), # 영상 길이 = 오디오 길이
+        *encode_args(profile),
+        *thread_args,
+        out_mp4
+    ]
 
 def node_make_video(state: State) -> State:
     """
@@ -15,6 +40,12 @@ def node_make_video(state: State) -> State:
 
     print("\n--- Node 6: 슬라이드 영상 생성(make_video) 실행 ---")
 
+    # 단일 패스 모드: 슬라이드별 클립 없이 concat 단계에서 강의 전체를 한 번에 렌더링
+    if not wants_clips(state):
+        print("[건너뜀] 단일 패스 모드 → 슬라이드 클립 생성 생략")
+        state.pop("video_path", None)
+        return state
+
     slide_imgs = state.get("slide_image", [])
     audio_path = state.get("audio", "")
     work_dir = state.get("work_dir", "./")
@@ -49,9 +80,9 @@ def node_make_video(state: State) -> State:
     # 3) 음성 길이(duration) 구하기
     # -------------------------------
     try:
-        duration = ffprobe_duration(audio_path)
+        duration = media_duration(audio_path)
     except:
-        print("[경고] ffprobe 실패 → 기본 5초로 설정")
+        print("[경고] 오디오 길이 측정 실패 → 기본 5초로 설정")
         duration = 5
 
     prompt = state.get("prompt", {}) or {}
@@ -64,28 +95,28 @@ def node_make_video(state: State) -> State:
     # -------------------------------
     # 교육용 영상 규칙:
     # - 이미지는 loop(정지 이미지)
-    # - 전체 해상도 1920×1080 (padding 포함)
+    # - 해상도는 렌더 프로필 기준 (final 1920×1080, draft 1280×720, padding 포함)
     # - 음성 길이에 맞춰 영상 길이 정확히 맞춤
-    # - 모든 플레이어 호환: libx264 + yuv420p
+    # - prompt['render_profile'] = "final"(기본) / "draft"
 
-    ffmpeg_cmd = [
-        "ffmpeg",
-        "-y",                # 기존 파일 덮어쓰기
-        "-loop", "1",        # 이미지 loop
-        "-i", image_path,    # 이미지 입력
-        "-i", audio_path,    # 오디오 입력
-        "-t", str(total_duration), # 영상 길이 = 오디오 길이
-        "-vf",
-        (
-            "scale=1920:1080:force_original_aspect_ratio=decrease,"
-            "pad=1920:1080:(ow-iw)/2:(oh-ih)/2:color=black"
-        ),
-        "-c:v", "libx264",
-        "-c:a", "aac",
-        "-b:a", "192k",
-        "-pix_fmt", "yuv420p",
-        out_mp4
-    ]
+    # - state['ffmpeg_threads']: 렌더 스케줄러가 정한 인코더 스레드 수 (0이면 ffmpeg 기본값)
+
+    profile = get_render_profile(prompt.get("render_profile"))
+    threads = int(state.get("ffmpeg_threads") or 0)
+    ffmpeg_cmd = build_slide_cmd(image_path, audio_path, out_mp4, total_duration, profile, threads=threads)
+
+    # 캐시 확인 (이미지/오디오 내용 + 렌더링 옵션, 입출력 경로와 스레드 수는 제외)
+    cache = get_artifact_cache(state)
+    key_cmd = build_slide_cmd(image_path, audio_path, out_mp4, total_duration, profile)
+    cache_key = make_key(
+        hash_file(image_path), hash_file(audio_path),
+        [a for a in key_cmd if a not in (image_path, audio_path, out_mp4)],
+    )
+    if cache and cache.get_file("video", cache_key, out_mp4) is not None:
+        print(f"[캐시] 슬라이드 {slide_index+1} 영상 재사용 → {out_mp4}")
+        state["video_path"] = out_mp4
+        state.pop("video_duration", None)
+        return state
 
     print(f"[FFmpeg] 슬라이드 {slide_index+1} 렌더링 중...")
 
@@ -121,7 +152,11 @@ def node_make_video(state: State) -> State:
     # if out_mp4 not in state["video_path"]:
     #     state["video_path"].append(out_mp4)
     state["video_path"] = out_mp4
+    state["video_duration"] = total_duration # 실제 인코딩한 길이 (렌더 처리량 계산용)
+
+    if cache:
+        cache.put_file("video", cache_key, out_mp4)
 
     print(f"[완료] 영상 생성 → {out_mp4}")
 
-    return state
\ No newline at end of file
+    return state
@@ -0,0 +1,49 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ..utils.state import State
+from .rag_search import node_tool_search
+from .gen_page_content import node_generate_page_content
+
+DEFAULT_PAGE_WORKERS = 8
+
+def node_page_content_all(state: State) -> State:
+    """
+    덱 전체 page_content 동시 생성 (plan_search 직후)
+    - page_content는 자기 슬라이드의 파싱 결과 + 검색 결과에만 의존 → 슬라이드끼리 순서 제약 없음
+    - 슬라이드별 tool_search(검색 계획 결과 사용) → gen_page_content 를 워커 풀에서 동시에 실행
+      (prompt['page_workers'], 기본 DEFAULT_PAGE_WORKERS)
+    - LLM 호출은 분당 토큰 예산(prompt['llm_tpm'] / LLM_TPM)을 공유 limiter로 지킴 (llm_cache)
+    - 결과를 state['planned_page_content'][idx]에 저장 → 슬라이드별 gen_page_content 노드는 이 결과를 사용
+    - 재사용 슬라이드는 건너뜀, 실패한 슬라이드는 저장하지 않아 슬라이드 단계에서 다시 생성
+    """
+    total = int(state.get("total_slides", 0))
+    prompt = state.get("prompt", {}) or {}
+    reuse = state.get("reuse_slides") or {}
+    max_workers = max(1, int(prompt.get("page_workers", DEFAULT_PAGE_WORKERS)))
+
+    targets = [idx for idx in range(total) if idx not in reuse]
+    planned: dict[int, str] = {}
+
+    print(f"\n--- page_content 동시 생성: {len(targets)}장, 워커 {max_workers}개 ---")
+
+    def run_slide(idx: int) -> None:
+        sub = dict(state)
+        sub["slide_index"] = idx
+        sub.pop("planned_page_content", None)
+        try:
+            sub = node_tool_search(sub)
+            sub = node_generate_page_content(sub)
+            planned[idx] = sub.get("page_content", "")
+        except Exception as e:
+            print(f"[오류] 슬라이드 {idx+1} page_content 생성 실패: {e}")
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        for f in [ex.submit(run_slide, idx) for idx in targets]:
+            f.result()
+
+    print(f"[완료] page_content {len(planned)}/{len(targets)}장 ({time.perf_counter() - t0:.1f}초)")
+
+    state["planned_page_content"] = planned
+    return state
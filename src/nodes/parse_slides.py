@@ -5,7 +5,31 @@ from pptx import Presentation
 from pptx.enum.shapes import PP_PLACEHOLDER, MSO_SHAPE_TYPE
 
 from ..utils.state import State
-from ..utils.slides_as_png import export_slide_as_png
+from ..utils.slides_as_png import export_deck_as_png
+from ..utils.artifact_cache import get_artifact_cache, hash_bytes, make_key
+from ..utils.manifest import plan_reuse
+
+SLIDE_DPI = 220
+
+def slide_content_hash(slide) -> str:
+    """
+    슬라이드 내용 해시
+    - 슬라이드 XML + 연결된 파트(이미지, 차트, 레이아웃) + 마스터 XML
+    - 발표자 노트는 화면/내용에 영향이 없으므로 제외
+    """
+    blobs = [slide.part.blob]
+    for rel in slide.part.rels.values():
+        if rel.is_external or rel.reltype.endswith("/notesSlide"):
+            continue
+        try:
+            blobs.append(rel.target_part.blob)
+        except Exception:
+            pass
+    try:
+        blobs.append(slide.slide_layout.slide_master.part.blob)
+    except Exception:
+        pass
+    return hash_bytes(b"\0".join(blobs))
 
 def node_parse_all(state: State) -> State:
 
@@ -28,6 +52,31 @@ def node_parse_all(state: State) -> State:
 
     print(f"총 {slide_count}장의 슬라이드를 처리합니다.")
 
+    # === 1) 슬라이드 PNG (캐시 우선, 없는 슬라이드만 덱 변환) ===
+    slide_hashes = [slide_content_hash(slide) for slide in prs.slides]
+    cache = get_artifact_cache(state)
+
+    deck_pngs = [""] * slide_count
+    to_render = []
+    for i, h in enumerate(slide_hashes):
+        dst = slides_dir / f"slide_{i+1}.png"
+        if cache and cache.get_file("slide_image", make_key(h, SLIDE_DPI), str(dst)) is not None:
+            deck_pngs[i] = str(dst)
+        else:
+            to_render.append(i + 1)
+
+    if to_render:
+        rendered = export_deck_as_png(
+            pptx_path, str(slides_dir), dpi=SLIDE_DPI, page_count=slide_count, pages=to_render
+        )
+        for page_no in to_render:
+            png = rendered[page_no - 1] if page_no - 1 < len(rendered) else ""
+            deck_pngs[page_no - 1] = png
+            if cache and png:
+                cache.put_file("slide_image", make_key(slide_hashes[page_no - 1], SLIDE_DPI), png)
+
+    print(f"슬라이드 PNG: 캐시 {slide_count - len(to_render)}장, 새로 변환 {len(to_render)}장")
+
     # ========= 평탄화 리스트 =========
     titles_list = []
     texts_list = []
@@ -45,22 +94,9 @@ def node_parse_all(state: State) -> State:
     for slide_idx, slide in enumerate(prs.slides):
         print(f"\n=== {slide_idx+1}번째 슬라이드 처리 중 ===")
 
-        # 1) PNG 생성
-        slide_state = {
-            "pptx_path": pptx_path,
-            "work_dir": str(slides_dir),
-            "slide_index": slide_idx,
-        }
-        slide_state = export_slide_as_png(slide_state)
-
-        src_png = slide_state["slide_image"]
-        dst_png = slides_dir / f"slide_{slide_idx+1}.png"
-
-        if os.path.exists(src_png):
-            os.replace(src_png, dst_png)
-            snapshot_path = str(dst_png)
-        else:
-            snapshot_path = ""
+        # 1) PNG 경로 (덱 변환 결과에서 선택)
+        src_png = deck_pngs[slide_idx] if slide_idx < len(deck_pngs) else ""
+        snapshot_path = src_png if src_png and os.path.exists(src_png) else ""
 
         # ============================
         # 요소 수집
@@ -173,6 +209,13 @@ def node_parse_all(state: State) -> State:
     # 4) state 저장
     # ---------------------------------------------
     state["total_slides"] = slide_count
+    state["slide_hashes"] = slide_hashes
+    state["slide_index"] = 0
+
+    # 이전 실행 manifest가 있으면 변경 없는 슬라이드를 재사용 대상으로 표시
+    state["reuse_slides"] = plan_reuse(
+        state.get("prev_manifest"), slide_hashes, state.get("prompt", {}), str(base_dir)
+    )
 
     state["titles"] = titles_list
     state["texts"] = texts_list
@@ -182,4 +225,4 @@ def node_parse_all(state: State) -> State:
     state["shape_texts"] = shape_texts_list
     state["links"] = links_list
 
-    return state
\ No newline at end of file
+    return state
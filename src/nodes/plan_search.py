@@ -0,0 +1,86 @@
+from ..utils.state import State
+from ..utils.tavily_search import normalize_query, search_cache_stats
+from ..utils.artifact_cache import get_artifact_cache
+from ..utils.rag_policy import rag_decision, new_search_stats, count_decision, format_search_stats
+from .rag_search import (
+    SEARCH_TIMEOUT_SEC, SEARCH_WORKERS,
+    build_queries, search_texts, select_external_content, external_cache_key,
+    search_backend_name, get_search_backend, run_docs_signature,
+)
+
+def node_plan_search(state: State) -> State:
+    """
+    덱 전체 검색 계획 (parse_ppt 직후)
+    - 모든 슬라이드의 검색 질의를 미리 모아 정규화 기준으로 중복 제거
+      (같은 제목의 "실습" / 이어지는 슬라이드 등은 한 번만 검색)
+    - 고유 질의만 한 번씩 동시에 검색 (prompt['search_workers'], 기본 SEARCH_WORKERS)
+    - 결과를 슬라이드별 external_content로 나눠 state['planned_external'][idx]에 저장
+      → tool_search 노드는 검색 없이 이 결과를 사용
+    - 재사용 슬라이드와 캐시에 결과가 있는 슬라이드는 검색하지 않음
+    - 표지/목차/Q&A/이미지만 있는 슬라이드 등은 검색 생략 (rag_policy, prompt['rag']로 덱 단위 지정)
+    """
+    total = int(state.get("total_slides", 0))
+    prompt = state.get("prompt", {}) or {}
+    reuse = state.get("reuse_slides") or {}
+    cache = get_artifact_cache(state)
+
+    planned: dict[int, dict] = {}
+    pending: dict[int, tuple[list[dict], str]] = {}
+    unique: dict[str, str] = {}   # 정규화 질의 → 실제 검색할 질의
+    n_queries = 0
+    stats = new_search_stats()
+    backend = search_backend_name(prompt)
+    docs_sig = run_docs_signature(state)   # local backend 문서 폴더는 실행당 한 번만 훑음
+
+    for idx in range(total):
+        if idx in reuse:
+            continue
+        queries = build_queries(state, idx)
+        search, reason = rag_decision(state, idx)
+        count_decision(stats, search, reason, len(queries))
+        if not search:
+            planned[idx] = {"queries": [], "summaries": [], "references": [], "skipped": reason}
+            continue
+        cache_key, max_age = external_cache_key(queries, prompt, docs_sig)
+        if cache:
+            cached = cache.get_json("external_content", cache_key, max_age_sec=max_age)
+            if cached is not None:
+                planned[idx] = cached
+                continue
+        pending[idx] = (queries, cache_key)
+        for q in queries:
+            n_queries += 1
+            unique.setdefault(normalize_query(q["text"]), q["text"])
+
+    print(f"\n--- 검색 계획({backend}): 슬라이드 {len(pending)}장, 질의 {n_queries}개 → 고유 질의 {len(unique)}개 ---")
+    print(f"[검색 생략] {format_search_stats(stats)}")
+
+    found, failed = search_texts(
+        list(unique.values()),
+        num=4,
+        timeout=float(prompt.get("search_timeout_sec", SEARCH_TIMEOUT_SEC)),
+        max_workers=int(prompt.get("search_workers", SEARCH_WORKERS)),
+        search_fn=get_search_backend(prompt, state.get("work_dir"), docs_sig),
+    )
+
+    # ---------- 슬라이드별로 결과 나누기 ----------
+    failed_set = set(failed)
+    for idx, (queries, cache_key) in pending.items():
+        all_results: list[dict] = []
+        complete = True
+        for q in queries:
+            text = unique[normalize_query(q["text"])]
+            complete = complete and text not in failed_set
+            all_results.extend(found.get(text, []))
+        planned[idx] = select_external_content(queries, all_results)
+        # 질의 중 하나라도 시간 초과/실패면 불완전한 결과 → 캐시하지 않음 (다음 실행에서 다시 검색)
+        if cache and complete:
+            cache.put_json("external_content", cache_key, planned[idx])
+
+    st = search_cache_stats()
+    if st:
+        print(f"[검색 캐시] hit {st['hits']} / miss {st['misses']} (저장 {st['entries']}개)")
+
+    state["planned_external"] = planned
+    state["search_stats"] = stats
+    return state
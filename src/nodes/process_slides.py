@@ -0,0 +1,100 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ..utils.state import State
+from .rag_search import node_tool_search
+from .gen_page_content import node_generate_page_content
+from .gen_script import node_generate_script, continuity_mode
+from ..utils.manifest import apply_reuse, record_slide
+
+DEFAULT_MAX_WORKERS = 4
+
+def _slide_state(state: State, idx: int) -> dict:
+    """
+    슬라이드 1장 처리용 state 사본
+    - 덱 전체 공용 데이터(titles, texts, prompt 등)는 공유
+    - 슬라이드별 산출물 키는 새로 만들어 워커끼리 섞이지 않도록 함
+    """
+    sub = dict(state)
+    sub["slide_index"] = idx
+    sub["all_scripts"] = []
+    sub["audio_paths"] = []
+    sub["audio_meta"] = {}
+    for key in ("external_content", "page_content", "script", "audio", "video_path"):
+        sub.pop(key, None)
+    return sub
+
+def node_process_slides(state: State) -> State:
+    """
+    슬라이드 fan-out 실행 노드 (병렬 모드)
+    - 슬라이드마다 tool_search → gen_page_content → gen_script 를
+      제한된 크기의 워커 풀에서 동시에 실행
+    - gen_script는 이전 슬라이드 스크립트를 참고하므로 스크립트 단계만 슬라이드 순서대로 진행
+      (검색/요약은 다른 슬라이드와 겹쳐서 실행됨)
+    - continuity='outline'이면 스크립트도 이전 슬라이드를 기다리지 않음 (script_all에서 미리 생성)
+    - 결과를 슬라이드 순서대로 모아(fan-in) tts_all → render_slides 단계로 넘김
+    """
+    total = int(state.get("total_slides", 0))
+    prompt = state.get("prompt", {}) or {}
+    max_workers = max(1, int(prompt.get("max_workers", DEFAULT_MAX_WORKERS)))
+    wait_prev_script = continuity_mode(prompt) == "script"
+
+    print(f"\n--- 슬라이드 병렬 처리 시작: {total}장, 워커 {max_workers}개 ---")
+
+    scripts: list[str] = [""] * total
+    results: list[dict] = [{} for _ in range(total)]
+    script_done = [threading.Event() for _ in range(total)]
+
+    reuse = state.get("reuse_slides") or {}
+
+    def run_slide(idx: int) -> None:
+        sub = _slide_state(state, idx)
+        try:
+            # 증분 재생성: 변경 없는 슬라이드는 이전 산출물 사용
+            if idx in reuse:
+                sub = apply_reuse(sub, reuse[idx])
+                scripts[idx] = sub.get("script", "")
+                return
+
+            sub = node_tool_search(sub)
+            sub = node_generate_page_content(sub)
+
+            # 이전 슬라이드 스크립트가 나올 때까지 대기 (흐름 유지)
+            if idx > 0 and wait_prev_script:
+                script_done[idx - 1].wait()
+                if scripts[idx - 1]:
+                    sub["all_scripts"] = [scripts[idx - 1]]
+            try:
+                sub = node_generate_script(sub)
+                scripts[idx] = sub.get("script", "")
+            finally:
+                script_done[idx].set()
+        except Exception as e:
+            print(f"[오류] 슬라이드 {idx+1} 처리 실패: {e}")
+        finally:
+            script_done[idx].set()
+            results[idx] = sub
+
+    # 작업은 슬라이드 순서대로 제출 → 앞 슬라이드가 항상 먼저 실행되므로 대기 중 교착 없음
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futures = [ex.submit(run_slide, i) for i in range(total)]
+        for f in futures:
+            f.result()
+
+    # ---------- fan-in ----------
+    audio_paths: list[str] = []
+    audio_meta: dict = {}
+
+    for idx, sub in enumerate(results):
+        # 재사용 슬라이드는 이미 음성/영상까지 있음
+        audio_paths.extend(sub.get("audio_paths", []))
+        audio_meta.update(sub.get("audio_meta", {}))
+        record_slide(state, idx, sub)
+
+    state["all_scripts"] = scripts
+    state["audio_paths"] = audio_paths
+    state["audio_meta"] = audio_meta
+
+    print(f"\n[완료] 슬라이드 {total}장 스크립트 생성 (재사용 {len(reuse)}장)\n")
+
+    return state
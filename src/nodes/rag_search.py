@@ -1,25 +1,157 @@
-import re
-import time
+import os
 import os.path as p
-from difflib import SequenceMatcher
+import time
+from functools import partial
+from typing import Callable
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
-from ..utils.tavily_search import tavily_search
+from ..utils.tavily_search import tavily_search, search_cache_stats, search_cache_ttl_sec
+from ..utils.local_search import local_search, docs_signature
 from ..utils.state import State
+from ..utils.artifact_cache import get_artifact_cache, make_key
+from ..utils.near_dup import cluster_snippets
+from ..utils.rag_policy import rag_decision, new_search_stats, count_decision
 
-# 검색 진행하고 점수 계산하여 유사도 높은 순으로 처리
-def node_tool_search(state: State) -> State:
+# 질의 1개를 검색할 때 기다리는 최대 시간(초, 실제 요청 시작부터)
+SEARCH_TIMEOUT_SEC = 15.0
+# 시간 초과 확인 간격(초)
+SEARCH_POLL_SEC = 0.5
+# 덱 전체 검색 계획에서 동시에 실행할 질의 수
+SEARCH_WORKERS = 8
+
+# 검색 backend
+# - tavily: 웹 검색 (기본)
+# - local: 로컬 참고 문서 BM25 검색 (외부망 없는 환경, 문서 폴더 = prompt['rag_docs_dir'] 또는 RAG_DOCS_DIR)
+# - 선택: prompt['search_backend'] 또는 환경변수 SEARCH_BACKEND
+SEARCH_BACKENDS = ("tavily", "local")
+
+def search_backend_name(prompt: dict | None) -> str:
+    name = ((prompt or {}).get("search_backend") or os.getenv("SEARCH_BACKEND") or "tavily").lower()
+    if name not in SEARCH_BACKENDS:
+        print(f"[경고] 알 수 없는 검색 backend '{name}' → tavily 사용")
+        name = "tavily"
+    return name
+
+def run_docs_signature(state: State) -> str | None:
     """
-    외부 검색 노드
-    - slide_index 기반으로 title/text/table/image를 읽음
-    - 질의 생성 후 tavily_search_test 호출
-    - 결과를 state['external_content']에 저장
+    local backend 문서 폴더 상태 키 (폴더 경로 + 문서별 수정 시각/크기)
+    - 실행당 한 번만 폴더를 훑어 state['docs_signature']에 보관 → 슬라이드/질의마다 다시 계산하지 않음
+    - tavily backend면 None
     """
-    state["external_content"] = {"queries": [], "summaries": [], "references": []}  # 초기화
+    prompt = state.get("prompt", {}) or {}
+    if search_backend_name(prompt) != "local":
+        return None
+    if state.get("docs_signature") is None:
+        state["docs_signature"] = docs_signature(prompt.get("rag_docs_dir"))
+    return state["docs_signature"]
 
-    print("---페이지 분해 state 결과---")
-    print(f"{state}")
+def get_search_backend(prompt: dict | None, work_dir: str | None = None,
+                       docs_sig: str | None = None) -> Callable[..., list[dict]]:
+    """
+    검색 함수 (질의, 결과 개수, on_start=None) → [{title, url, snippet, domain, score, ...}]
+    - on_start: 실제 검색 요청 직전에 호출되는 콜백 (rate limiter 대기가 끝난 뒤)
+    - local backend 색인은 <work_dir>/cache/bm25 에 저장 (work_dir 없으면 공용 캐시 폴더)
+    - docs_sig: run_docs_signature 결과 (색인 재사용 확인용)
+    """
+    if search_backend_name(prompt) == "local":
+        index_dir = os.path.join(work_dir, "cache", "bm25") if work_dir else None
+        return partial(
+            local_search,
+            docs_dir=(prompt or {}).get("rag_docs_dir"),
+            index_dir=index_dir,
+            signature=docs_sig,
+        )
+    return tavily_search
 
-    idx = state.get("slide_index", 0)
+def external_cache_key(queries: list[dict], prompt: dict | None,
+                       docs_sig: str | None = None) -> tuple[str, float | None]:
+    """
+    external_content 산출물 캐시 키와 유효 시간(초)
+    - tavily: 질의 + backend, 검색 결과 캐시(TAVILY_CACHE_TTL_HOURS)와 같은 유효 시간
+    - local: 문서 폴더 상태 키(docs_sig, run_docs_signature)까지 키에 포함 → 문서가 바뀌면 새로 검색, 만료 없음
+    """
+    backend = search_backend_name(prompt)
+    texts = [q["text"] for q in queries]
+    if backend == "local":
+        if docs_sig is None:
+            docs_sig = docs_signature((prompt or {}).get("rag_docs_dir"))
+        return make_key(texts, backend, docs_sig), None
+    return make_key(texts, backend), search_cache_ttl_sec()
+
+def search_texts(texts: list[str], num: int = 4, timeout: float = SEARCH_TIMEOUT_SEC,
+                 max_workers: int | None = None,
+                 search_fn: Callable[..., list[dict]] | None = None) -> tuple[dict[str, list[dict]], list[str]]:
+    """
+    질의 문자열들을 스레드 풀에서 동시에 검색 (분당 요청 수는 검색 backend 안의 공유 limiter가 제한)
+    - search_fn: 검색 backend (기본 tavily_search), 실제 요청 직전에 on_start 콜백을 호출해야 함
+    - 질의마다 실제 요청을 시작한 시점부터 timeout초를 기다림 → 끝나지 않은 질의는 결과 없이 건너뜀
+      (풀 대기/limiter 대기 시간은 제외, 느린 질의 하나가 슬라이드/덱 전체를 붙잡지 않도록)
+    - 반환: ({질의: 결과 리스트}, 실패/시간 초과 질의 목록)
+      실패 질의가 있으면 결과가 불완전하므로 호출 측에서 캐시에 저장하지 않음
+    """
+    texts = list(dict.fromkeys(texts))
+    if not texts:
+        return {}, []
+
+    search_fn = search_fn or tavily_search
+    workers = max(1, min(len(texts), max_workers or len(texts)))
+    started: dict[str, float] = {}   # 질의 → 실제 요청 시작 시각
+
+    def run(text: str) -> list[dict]:
+        return search_fn(text, num, on_start=lambda: started.setdefault(text, time.monotonic()))
+
+    ex = ThreadPoolExecutor(max_workers=workers)
+    futures = {text: ex.submit(run, text) for text in texts}
+    pending = {f: text for text, f in futures.items()}
+    timed_out: set[str] = set()
+    while pending:
+        now = time.monotonic()
+        deadlines = []
+        for f, text in list(pending.items()):
+            if text not in started:
+                continue   # 아직 풀/limiter 대기 중 → 시간 제한 시작 전
+            if started[text] + timeout <= now:
+                timed_out.add(text)
+                del pending[f]
+            else:
+                deadlines.append(started[text] + timeout)
+        if not pending:
+            break
+        next_check = min(deadlines + [now + SEARCH_POLL_SEC]) - now
+        done, _ = wait(list(pending), timeout=max(next_check, 0.0), return_when=FIRST_COMPLETED)
+        for f in done:
+            del pending[f]
+    # 시간 초과된 질의는 기다리지 않음 (백그라운드에서 끝나면 버려짐)
+    ex.shutdown(wait=False, cancel_futures=True)
+
+    results: dict[str, list[dict]] = {}
+    failed: list[str] = []
+    for text, f in futures.items():
+        if text in timed_out:
+            print(f"[경고] 검색 시간 초과({timeout:.0f}초) → {text}")
+            failed.append(text)
+            continue
+        try:
+            results[text] = f.result()   # 이미 score 포함
+        except Exception as e:
+            print(f"[경고] 검색 실패 → {text}: {e}")
+            failed.append(text)
+    return results, failed
+
+def run_queries(queries: list[dict], num: int = 4, timeout: float = SEARCH_TIMEOUT_SEC,
+                search_fn: Callable[..., list[dict]] | None = None) -> tuple[list[dict], bool]:
+    """
+    슬라이드 1장의 질의들을 동시에 검색하고 결과를 질의 순서대로 합침
+    - 반환: (결과, 모든 질의 성공 여부)
+    """
+    found, failed = search_texts([q["text"] for q in queries], num=num, timeout=timeout, search_fn=search_fn)
+    all_results: list[dict] = []
+    for q in queries:
+        all_results.extend(found.get(q["text"], []))
+    return all_results, not failed
+
+def build_queries(state: State, idx: int) -> list[dict]:
+    """슬라이드 idx의 title/text/table/image로 검색 질의 생성"""
     titles = state.get("titles", [])
     texts_all = state.get("texts", [])
     tables_all = state.get("tables", [])
@@ -30,13 +162,6 @@ def node_tool_search(state: State) -> State:
     tables = tables_all[idx] if idx < len(tables_all) else []
     images = images_all[idx] if idx < len(images_all) else []
 
-    print(f"idx : {idx}")
-    print(f"title : {title}")
-    print(f"texts : {texts}")
-    print(f"tables : {tables}")
-    print(f"images : {images}")
-
-    # ---------- 1) 질의 생성 ----------
     queries: list[dict] = []
     if title:
         queries.append({"text": title, "context": "title"})
@@ -50,48 +175,15 @@ def node_tool_search(state: State) -> State:
         queries.append({"text": f"{title} {names}", "context": "title+image"})
     if not queries and texts:
         queries.append({"text": texts[:100], "context": "text_only"})
+    return queries
 
-    print(f"질의 생성 : {queries}")
-
-    # ---------- 2) 검색 수행 (tavily_search_test 사용) ----------
-    all_results: list[dict] = []
-
-    for q in queries:
-        q_text = q["text"]
-        print(f"질문 내용 : {q_text}")
-
-        results = tavily_search(q_text, num=4)   # 이미 score 포함
-        all_results.extend(results)
-        time.sleep(0.2)
-
-    # ---------- 3) 일관성/신뢰도 필터 ----------
-    def norm(s: str) -> str:
-        s = (s or "").lower().strip()
-        s = re.sub(r"\s+", " ", s)
-        return s
-
-    def similar(a: str, b: str, thr: float = 0.82) -> bool:
-        return bool(a and b) and SequenceMatcher(None, norm(a), norm(b)).ratio() >= thr
-
-    groups = []  # 각 그룹: {"rep": str, "items": [dict], "domains": set}
-    for r in all_results:
-        snip, dom = r.get("snippet", ""), r.get("domain", "")
-        if not snip:
-            continue
-        placed = False
-        for g in groups:
-            if similar(snip, g["rep"]):
-                g["items"].append(r)
-                if dom:
-                    g["domains"].add(dom)
-                placed = True
-                break
-        if not placed:
-            groups.append({
-                "rep": snip,
-                "items": [r],
-                "domains": set([dom] if dom else []),
-            })
+def select_external_content(queries: list[dict], all_results: list[dict]) -> dict:
+    """
+    검색 결과 → external_content
+    - 비슷한 스니펫이 2개 이상, 2개 도메인 이상에서 나온 그룹만 채택 (없으면 전체 결과 사용)
+    """
+    # 비슷한 스니펫끼리 묶고(MinHash/LSH 후보 + 유사도 확인), 2개 이상·2개 도메인 이상 그룹만 채택
+    groups = cluster_snippets(all_results)  # 각 그룹: {"rep": str, "items": [dict], "domains": set}
 
     picked = [g for g in groups if len(g["items"]) >= 2 and len(g["domains"]) >= 2]
 
@@ -154,10 +246,76 @@ def node_tool_search(state: State) -> State:
     summaries.sort(key=lambda s: s.get("score", 0.0), reverse=True)
     references.sort(key=lambda r: r.get("score", 0.0), reverse=True)
 
-    # ---------- 4) 결과 state에 저장 ----------
-    state["external_content"] = {
+    return {
         "queries": queries,
         "summaries": summaries,
         "references": references,
     }
+
+# 검색 진행하고 점수 계산하여 유사도 높은 순으로 처리
+def node_tool_search(state: State) -> State:
+    """
+    외부 검색 노드
+    - slide_index 기반으로 title/text/table/image를 읽음
+    - 질의 생성 후 tavily_search 호출 (질의 동시 실행)
+    - 결과를 state['external_content']에 저장
+    - plan_search 단계를 거친 그래프(src/graph.py의 순차/병렬 모두)는 검색 계획 결과만 사용하고 직접 검색하지 않음
+    - 아래 슬라이드별 검색은 plan_search 없이 구성한 그래프(노트북 등)에서만 실행
+    """
+    state["external_content"] = {"queries": [], "summaries": [], "references": []}  # 초기화
+
+    idx = state.get("slide_index", 0)
+
+    planned = state.get("planned_external")
+    if planned is not None:
+        if idx in planned:
+            print(f"[검색 계획] 슬라이드 {idx+1} 외부 검색 결과 사용")
+            state["external_content"] = planned[idx]
+        else:
+            print(f"[경고] 슬라이드 {idx+1} 검색 계획 결과 없음 → 외부 자료 없이 진행")
+        return state
+
+    print(f"idx : {idx}")
+
+    # ---------- 1) 질의 생성 ----------
+    queries = build_queries(state, idx)
+    print(f"질의 생성 : {queries}")
+
+    # 표지/목차/Q&A 등 검색이 필요 없는 슬라이드는 건너뜀
+    search, reason = rag_decision(state, idx)
+    count_decision(state.setdefault("search_stats", new_search_stats()), search, reason, len(queries))
+    if not search:
+        print(f"[검색 생략] 슬라이드 {idx+1}: {reason}")
+        state["external_content"]["skipped"] = reason
+        return state
+
+    prompt = state.get("prompt", {}) or {}
+
+    # 같은 질의 세트는 캐시된 검색 결과 재사용 (반복되는 목차 슬라이드 등)
+    cache = get_artifact_cache(state)
+    docs_sig = run_docs_signature(state)
+    cache_key, max_age = external_cache_key(queries, prompt, docs_sig)
+    if cache:
+        cached = cache.get_json("external_content", cache_key, max_age_sec=max_age)
+        if cached is not None:
+            print("[캐시] 외부 검색 결과 재사용")
+            state["external_content"] = cached
+            return state
+
+    # ---------- 2) 검색 수행 (질의 동시 실행) ----------
+    for q in queries:
+        print(f"질문 내용 : {q['text']}")
+
+    timeout = float(prompt.get("search_timeout_sec", SEARCH_TIMEOUT_SEC))
+    all_results, complete = run_queries(queries, num=4, timeout=timeout, search_fn=get_search_backend(prompt, state.get("work_dir"), docs_sig))
+
+    st = search_cache_stats()
+    if st:
+        print(f"[검색 캐시] hit {st['hits']} / miss {st['misses']} (저장 {st['entries']}개)")
+
+    # ---------- 3) 일관성/신뢰도 필터 + 4) 결과 state에 저장 ----------
+    state["external_content"] = select_external_content(queries, all_results)
+    # 시간 초과/실패한 질의가 있으면 불완전한 결과이므로 캐시하지 않음 (다음 실행에서 다시 검색)
+    if cache and complete:
+        cache.put_json("external_content", cache_key, state["external_content"])
     return state
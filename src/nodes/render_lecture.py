@@ -0,0 +1,122 @@
+import os
+import subprocess
+
+from ..utils.media_info import media_duration
+from ..utils.state import State
+from ..utils.render_profiles import get_render_profile, video_filter, encode_args
+
+# 단일 패스 렌더링에서 fps가 지정되지 않은 프로필(final)의 출력 fps (ffmpeg 이미지 loop 기본값과 동일)
+DEFAULT_FPS = 25
+
+def is_single_pass(state: State) -> bool:
+    prompt = state.get("prompt", {}) or {}
+    return prompt.get("render_mode", "clips") == "single_pass"
+
+def wants_clips(state: State) -> bool:
+    """슬라이드별 mp4 클립을 만들어야 하는지 (기본 clips 모드이거나 keep_clips 요청)"""
+    prompt = state.get("prompt", {}) or {}
+    return not is_single_pass(state) or bool(prompt.get("keep_clips", False))
+
+def _ffconcat_escape(path: str) -> str:
+    return os.path.abspath(path).replace("'", "'\\''")
+
+def node_render_lecture(state: State) -> State:
+    """
+    전체 강의 단일 패스 렌더링 (prompt['render_mode'] = "single_pass")
+    - 슬라이드 이미지를 ffconcat 목록(슬라이드별 duration = 음성 길이 + 여유)으로 만들고
+    - 슬라이드 음성들을 각 길이만큼 무음으로 채운(apad) 뒤 이어붙여
+    - ffmpeg 1회 실행으로 final_lecture.mp4 생성 (슬라이드별 클립 인코딩/병합 과정 없음)
+    """
+    print("\n--- 단일 패스 강의 영상 렌더링 ---")
+
+    work_dir = state.get("work_dir", "./")
+    prompt = state.get("prompt", {}) or {}
+    slide_imgs = state.get("slide_image", []) or []
+    records = state.get("slide_records", {}) or {}
+    audio_meta = state.get("audio_meta", {}) or {}
+    total = int(state.get("total_slides", len(slide_imgs)))
+    padding_sec = float(prompt.get("tts_padding_sec", 1.5))
+    profile = get_render_profile(prompt.get("render_profile"))
+
+    # -------------------------------
+    # 1) 슬라이드별 (이미지, 음성, 길이) 수집
+    # -------------------------------
+    items = []
+    failed = []
+    for idx in range(total):
+        image = slide_imgs[idx] if idx < len(slide_imgs) else ""
+        audio = (records.get(idx) or {}).get("audio") or (audio_meta.get(idx) or {}).get("path", "")
+        if not (image and os.path.exists(image) and audio and os.path.exists(audio)):
+            print(f"[경고] 슬라이드 {idx+1} 이미지/음성 없음 → 건너뜀")
+            failed.append(idx)
+            continue
+
+        duration = (audio_meta.get(idx) or {}).get("duration")
+        if duration is None:
+            try:
+                duration = media_duration(audio)
+            except Exception:
+                print("[경고] 오디오 길이 측정 실패 → 기본 5초로 설정")
+                duration = 5
+        items.append((image, audio, max(float(duration) + padding_sec, 0.5)))
+
+    state["failed_slides"] = failed
+    if not items:
+        print("합칠 슬라이드가 없습니다.")
+        return state
+
+    # -------------------------------
+    # 2) ffconcat 이미지 목록
+    # -------------------------------
+    list_path = os.path.join(work_dir, "slides.ffconcat")
+    with open(list_path, "w", encoding="utf-8") as f:
+        f.write("ffconcat version 1.0\n")
+        for image, _, seconds in items:
+            f.write(f"file '{_ffconcat_escape(image)}'\n")
+            f.write(f"duration {seconds:.3f}\n")
+        # concat demuxer는 마지막 항목의 duration을 무시하므로 마지막 이미지를 한 번 더 적음
+        f.write(f"file '{_ffconcat_escape(items[-1][0])}'\n")
+
+    # -------------------------------
+    # 3) FFmpeg 명령 (영상 1 입력 + 음성 N 입력)
+    # -------------------------------
+    fps = profile.get("fps") or DEFAULT_FPS
+    audio_inputs = []
+    filters = [f"[0:v]{video_filter(profile)},fps={fps},format=yuv420p[v]"]
+    concat_inputs = ""
+    for i, (_, audio, seconds) in enumerate(items):
+        audio_inputs += ["-i", audio]
+        filters.append(f"[{i+1}:a]apad=whole_dur={seconds:.3f}[a{i}]")
+        concat_inputs += f"[a{i}]"
+    filters.append(f"{concat_inputs}concat=n={len(items)}:v=0:a=1[a]")
+
+    final_video = os.path.join(work_dir, "final_lecture.mp4")
+    total_sec = sum(seconds for _, _, seconds in items)
+    cmd = [
+        "ffmpeg", "-y",
+        "-f", "concat", "-safe", "0", "-i", list_path,
+        *audio_inputs,
+        "-filter_complex", ";".join(filters),
+        "-map", "[v]",
+        "-map", "[a]",
+        *encode_args(profile, with_filter=False),
+        "-t", f"{total_sec:.3f}",
+        "-movflags", "+faststart", # 웹 재생 최적화
+        final_video
+    ]
+
+    print(f"[FFmpeg] 슬라이드 {len(items)}장 단일 패스 렌더링 중 (총 {total_sec:.1f}초)...")
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        print("[오류] 단일 패스 렌더링 실패")
+        print(result.stderr.decode())
+        return state
+
+    size_mb = os.path.getsize(final_video) / (1024 * 1024)
+    print(" 최종 강의 영상 생성 완료!")
+    print(f" 경로: {final_video}")
+    print(f" 총 재생 시간: {total_sec:.1f}초")
+    print(f" 파일 크기: {size_mb:.2f} MB")
+
+    state["final_video"] = final_video
+    return state
@@ -0,0 +1,69 @@
+import os
+
+from ..utils.state import State
+from ..utils.manifest import record_slide
+from ..utils.render_scheduler import run_render_jobs, format_render_stats
+from .make_video import node_make_video
+from .render_lecture import wants_clips
+
+def node_render_slides(state: State) -> State:
+    """
+    슬라이드 영상 렌더링 단계 (병렬 모드)
+    - tts_all 이후, 슬라이드별 이미지 + 음성으로 make_video를 렌더 스케줄러에서 동시에 실행
+      (동시 작업 수와 작업당 -threads를 코어 수에 맞춤, prompt['render_workers']로 상한 지정)
+    - 재사용 슬라이드는 이미 영상이 있으므로 건너뜀
+    - 슬라이드 순서대로 video_paths / failed_slides 정리, 처리량은 state['render_stats']
+    """
+    total = int(state.get("total_slides", 0))
+    prompt = state.get("prompt", {}) or {}
+    records = state.get("slide_records", {}) or {}
+    reuse = state.get("reuse_slides") or {}
+
+    # 단일 패스 모드: 슬라이드별 클립 없이 concat 단계에서 강의 전체를 한 번에 렌더링
+    if not wants_clips(state):
+        print("\n--- 단일 패스 모드: 슬라이드 클립 렌더링 생략 ---")
+        state["slide_index"] = total
+        return state
+
+    print(f"\n--- 슬라이드 영상 렌더링: {total}장 ---")
+
+    def render(idx: int, threads: int) -> tuple[str, float]:
+        rec = records.get(idx, {})
+        sub = dict(state)
+        sub["slide_index"] = idx
+        sub["audio"] = rec.get("audio", "")
+        sub["ffmpeg_threads"] = threads
+        sub.pop("video_path", None)
+        sub.pop("video_duration", None)
+        try:
+            sub = node_make_video(sub)
+        except Exception as e:
+            print(f"[오류] 슬라이드 {idx+1} 렌더링 실패: {e}")
+            return "", 0.0
+        video = sub.get("video_path", "")
+        record_slide(state, idx, {"video_path": video})
+        return video, sub.get("video_duration", 0.0)
+
+    pending = [idx for idx in range(total) if idx not in reuse]
+    rendered, stats = run_render_jobs(pending, render, max_jobs=prompt.get("render_workers"))
+    state["render_stats"] = stats
+    print(f"[렌더] {format_render_stats(stats)}")
+
+    video_paths: list[str] = []
+    failed: list[int] = []
+    for idx in range(total):
+        video = records.get(idx, {}).get("video", "") if idx in reuse else rendered.get(idx, "")
+        if video and os.path.exists(video):
+            video_paths.append(video)
+        else:
+            failed.append(idx)
+
+    state["video_paths"] = video_paths
+    state["failed_slides"] = failed
+    state["slide_index"] = total
+
+    print("\n🎉 모든 슬라이드 처리 완료!")
+    print(f"   성공: {len(video_paths)}")
+    print(f"   실패: {len(failed)}\n")
+
+    return state
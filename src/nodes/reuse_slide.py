@@ -0,0 +1,14 @@
+from ..utils.state import State
+from ..utils.manifest import apply_reuse
+
+def node_reuse_slide(state: State) -> State:
+    """
+    증분 재생성: 이전 실행에서 내용이 바뀌지 않은 슬라이드
+    - 검색/요약/스크립트/TTS/영상 노드를 건너뛰고 이전 산출물을 그대로 사용
+    - 이후 accumulate 노드로 이동
+    """
+    idx = int(state.get("slide_index", 0))
+    rec = (state.get("reuse_slides") or {}).get(idx)
+
+    print(f"\n--- 슬라이드 {idx+1}: 변경 없음 → 이전 산출물 재사용 ---")
+    return apply_reuse(state, rec)
@@ -4,6 +4,7 @@ def router_continue_or_done(state: State) -> str:
     Node 8. router_continue_or_done
     - 현재 슬라이드가 마지막 슬라이드인지 확인
     - continue 이면 tool_search로 이동, done 이면 concat으로 이동
+    - reuse 이면 (증분 재생성에서 변경 없는 슬라이드) reuse_slide로 이동
     """
     current = state.get("slide_index", 0)
     total = state.get("total_slides", 1)
@@ -14,5 +15,8 @@ def router_continue_or_done(state: State) -> str:
         print(f"   실패: {len(state.get('failed_slides', []))}\n")
         return "done"
 
+    if current in (state.get("reuse_slides") or {}):
+        return "reuse"
+
     print(f"\n➡️ 다음 슬라이드 처리 계속: {current}/{total}")
-    return "continue"
\ No newline at end of file
+    return "continue"
@@ -0,0 +1,138 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from langchain_openai import ChatOpenAI
+from langchain_core.messages import SystemMessage, HumanMessage
+from dotenv import load_dotenv
+
+from ..utils.state import State
+from ..utils.utils import split_sents
+from ..utils.llm_cache import cached_invoke
+from .gen_script import continuity_mode, generate_script, clean_script
+
+load_dotenv()
+
+DEFAULT_SCRIPT_WORKERS = 8
+
+# 경계 다듬기용 가벼운 모델 (첫 문장 1개만 다시 쓰므로 짧은 응답)
+SMOOTH_MODEL = os.getenv("SMOOTH_MODEL") or os.getenv("LLM_MODEL")
+SMOOTH_TEMPERATURE = 0.3
+llm_smooth = ChatOpenAI(
+    model=SMOOTH_MODEL,
+    temperature=SMOOTH_TEMPERATURE,
+    max_tokens=256,
+    api_key=os.getenv("OPENAI_API_KEY")
+)
+SMOOTH_SYSTEM_PROMPT = (
+    "당신은 강의 스크립트 편집자입니다. "
+    "앞 슬라이드 스크립트의 끝과 자연스럽게 이어지도록 현재 슬라이드의 첫 문장만 다듬습니다. "
+    "의미와 정보는 그대로 두고 연결만 매끄럽게 하세요."
+)
+
+def smooth_boundary(prev_script: str, script: str, prompt: dict) -> str:
+    """
+    슬라이드 경계 다듬기: 현재 스크립트의 첫 문장만 앞 스크립트 끝에 맞춰 다시 씀
+    - 실패하거나 응답이 비면 원래 스크립트 그대로
+    """
+    prev_tail = " ".join(split_sents(prev_script)[-2:])
+    sents = split_sents(script)
+    if not prev_tail or not sents:
+        return script
+    first = sents[0]
+
+    user_prompt = f"""
+    # 앞 슬라이드 스크립트의 마지막 부분
+    {prev_tail}
+
+    # 현재 슬라이드 스크립트의 첫 문장
+    {first}
+
+    # 현재 슬라이드 스크립트의 이어지는 내용 (참고용, 수정 금지)
+    {" ".join(sents[1:3])}
+
+    # 작성 조건
+    1) 첫 문장 한 개만 다시 작성 (앞 내용을 반복하지 말고 자연스럽게 이어받기)
+    2) '이번 슬라이드에서는', '다음으로 넘어가 보면', '지금 보시는 슬라이드는', '안녕하세요' 사용 금지
+
+    # 출력 형식
+    [스크립트 시작]
+    다시 쓴 첫 문장
+    [스크립트 종료]
+    """
+
+    response_msg = cached_invoke(
+        llm_smooth,
+        [
+            SystemMessage(content=SMOOTH_SYSTEM_PROMPT),
+            HumanMessage(content=user_prompt),
+        ],
+        stage="smooth",
+        mode=prompt.get("llm_cache"),
+        tpm=prompt.get("llm_tpm"),
+    )
+    new_first = clean_script(response_msg.content or "").strip()
+    if not new_first:
+        return script
+    return script.replace(first, new_first, 1)
+
+def node_script_all(state: State) -> State:
+    """
+    덱 전체 스크립트 동시 생성 (continuity='outline' 일 때만, page_content_all 직후)
+    - 각 슬라이드는 이전 슬라이드의 최종 스크립트 대신 제목 + page_content를 참고
+      → 슬라이드끼리 순서 제약이 없어 워커 풀에서 동시에 생성 (prompt['script_workers'], 기본 DEFAULT_SCRIPT_WORKERS)
+    - prompt['smooth_boundaries']가 켜져 있으면 슬라이드 경계마다 첫 문장만 가볍게 다듬는 후처리 실행
+    - 결과를 state['planned_scripts'][idx]에 저장 → 슬라이드별 gen_script 노드는 이 결과를 사용
+    - continuity='script'(기본)이면 아무것도 하지 않음 (기존처럼 슬라이드 순서대로 생성)
+    """
+    prompt = state.get("prompt", {}) or {}
+    if continuity_mode(prompt) != "outline":
+        return state
+
+    total = int(state.get("total_slides", 0))
+    reuse = state.get("reuse_slides") or {}
+    page_contents = state.get("planned_page_content") or {}
+    max_workers = max(1, int(prompt.get("script_workers", DEFAULT_SCRIPT_WORKERS)))
+
+    targets = [idx for idx in range(total) if idx not in reuse]
+    planned: dict[int, str] = {}
+
+    print(f"\n--- 스크립트 동시 생성(outline 흐름): {len(targets)}장, 워커 {max_workers}개 ---")
+
+    def run_slide(idx: int) -> None:
+        try:
+            planned[idx] = generate_script(state, idx, page_contents.get(idx, ""))
+        except Exception as e:
+            print(f"[오류] 슬라이드 {idx+1} 스크립트 생성 실패: {e}")
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        for f in [ex.submit(run_slide, idx) for idx in targets]:
+            f.result()
+    print(f"[완료] 스크립트 {len(planned)}/{len(targets)}장 ({time.perf_counter() - t0:.1f}초)")
+
+    # ---------- 경계 다듬기 (선택) ----------
+    if prompt.get("smooth_boundaries"):
+        originals = dict(planned)
+
+        def prev_script(idx: int) -> str:
+            if idx - 1 in reuse:
+                return (reuse[idx - 1] or {}).get("script", "")
+            return originals.get(idx - 1, "")
+
+        def run_smooth(idx: int) -> None:
+            try:
+                planned[idx] = smooth_boundary(prev_script(idx), originals[idx], prompt)
+            except Exception as e:
+                print(f"[경고] 슬라이드 {idx+1} 경계 다듬기 실패: {e}")
+
+        # 다듬기는 원본 스크립트만 참고하므로 경계끼리도 동시에 실행
+        boundaries = [idx for idx in originals if idx > 0]
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            for f in [ex.submit(run_smooth, idx) for idx in boundaries]:
+                f.result()
+        changed = sum(1 for idx in boundaries if planned[idx] != originals[idx])
+        print(f"[경계 다듬기] {changed}/{len(boundaries)}곳 수정 ({time.perf_counter() - t0:.1f}초)")
+
+    state["planned_scripts"] = planned
+    return state
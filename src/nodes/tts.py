@@ -1,5 +1,27 @@
-from ..utils.tts_generate import tts_generate
+from ..utils.tts_generate import tts_generate, tts_generate_batch, tts_cache_report, TTS_WORKERS
 from ..utils.state import State
+from ..utils.artifact_cache import get_artifact_cache
+from ..utils.manifest import record_slide
+
+def _voice_and_speed(prompt: dict) -> tuple[str, float]:
+    # Voice preset 처리
+    # raw_voice = prompt.get("voice", "부드러운 설명형")
+    raw_voice = prompt.get("voice") or "기본 설명형 -nova"
+    voice = raw_voice.split('-')[-1].strip()
+    # speed_val = prompt.get("speed", 1.0)
+    speed_val = float(prompt.get("speed", 1.0))
+    return voice, speed_val
+
+def _save_audio(state: State, slide_idx: int, result_path: str, duration: float | None) -> None:
+    state.setdefault("audio_paths", []).append(result_path)
+
+    if duration is not None:
+        state.setdefault("audio_meta", {})
+        state["audio_meta"][slide_idx] = {
+            "path": result_path,
+            "duration": float(duration),
+        }
+
 def node_tts(state: State) -> State:
     """
     교육용 강의 스크립트를 TTS로 변환하는 함수.
@@ -15,36 +37,70 @@ def node_tts(state: State) -> State:
     prompt = state.get("prompt", {}) or {}
     work_dir = state.get("work_dir", "./")
     slide_idx = int(state.get("slide_index", 0))
-
-    # Voice preset 처리
-    # raw_voice = prompt.get("voice", "부드러운 설명형")
-    raw_voice = prompt.get("voice") or "기본 설명형 -nova"
-    voice = raw_voice.split('-')[-1].strip()
-    # speed_val = prompt.get("speed", 1.0)
-    speed_val = float(prompt.get("speed", 1.0))
+    voice, speed_val = _voice_and_speed(prompt)
 
     # LangChain Runnable 호출 (또는 tts_generate 직접 호출해도 됨)
+    # 캐시 조회/저장은 tts_generate 안에서 처리 (스크립트 + 목소리 + 속도 + 모델)
     result_path, duration = tts_generate(
         script=script,
         work_dir=work_dir,
         slide_idx=slide_idx,
         voice_preset=voice,
         speed=speed_val,
+        cache=get_artifact_cache(state),
     )
 
     # ------------------------------
     # state 저장
     # ------------------------------
     state["audio"] = result_path
-    state.setdefault("audio_paths", []).append(result_path)
+    _save_audio(state, slide_idx, result_path, duration)
 
-    if duration is not None:
-        state.setdefault("audio_meta", {})
-        state["audio_meta"][slide_idx] = {
-            "path": result_path,
-            "duration": float(duration),
-        }
+    print(f"[완료] 교육용 음성 파일 저장 → {result_path}")
+    print(f"[TTS 캐시] {tts_cache_report(get_artifact_cache(state))}\n")
+
+    return state
+
+def node_tts_all(state: State) -> State:
+    """
+    덱 전체 TTS 단계 (병렬 모드)
+    - 완성된 all_scripts 전체를 동시에 TTS 변환
+    - 동시 요청 수: prompt['tts_workers'], 분당 요청 수: prompt['tts_rpm'] (기본 TTS_RPM)
+    - 증분 재생성으로 재사용하는 슬라이드는 건너뜀
+    """
+    print("\n--- 덱 전체 TTS 변환 실행 ---")
+
+    scripts = state.get("all_scripts", []) or []
+    prompt = state.get("prompt", {}) or {}
+    work_dir = state.get("work_dir", "./")
+    reuse = state.get("reuse_slides") or {}
+    voice, speed_val = _voice_and_speed(prompt)
+
+    cache = get_artifact_cache(state)
+    pending = {
+        idx: (script or "").strip()
+        for idx, script in enumerate(scripts)
+        if idx not in reuse
+    }
+
+    results = tts_generate_batch(
+        pending,
+        work_dir=work_dir,
+        voice_preset=voice,
+        speed=speed_val,
+        max_workers=int(prompt.get("tts_workers", TTS_WORKERS)),
+        rpm=prompt.get("tts_rpm"),
+        cache=cache,
+    )
+
+    for idx in sorted(results):
+        path, duration = results[idx]
+        if not path:
+            continue
+        _save_audio(state, idx, path, duration)
+        record_slide(state, idx, {"audio": path, "audio_meta": {idx: {"duration": duration}}})
 
-    print(f"[완료] 교육용 음성 파일 저장 → {result_path}\n")
+    print(f"[완료] 덱 전체 음성 {len([r for r in results.values() if r[0]])}개 준비")
+    print(f"[TTS 캐시] {tts_cache_report(cache)}\n")
 
     return state
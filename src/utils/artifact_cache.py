@@ -0,0 +1,211 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any
+
+# 단계별 산출물 디스크 캐시 (content-addressed)
+# - 키: 입력 내용(슬라이드 XML/텍스트, 프롬프트 옵션, 모델명 등)의 sha256
+# - 저장: <work_dir>/cache/<stage>/<key[:2]>/<key>/ 아래 value.json (+ 파일 산출물)
+# - 용량 초과 시 가장 오래 사용되지 않은 항목부터 삭제 (LRU, 디렉토리 mtime 기준)
+
+DEFAULT_MAX_MB = 2048
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def make_key(*parts: Any) -> str:
+    """입력 값들을 JSON 직렬화해서 하나의 sha256 키로 만든다."""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hash_bytes(raw.encode("utf-8"))
+
+class ArtifactCache:
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.root = Path(root).expanduser().resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, int]] = {}
+        self._total_bytes = self._scan()[1]
+
+    # ---------- 내부 ----------
+    def _entry_dir(self, stage: str, key: str) -> Path:
+        return self.root / stage / key[:2] / key
+
+    def _count(self, stage: str, hit: bool) -> None:
+        with self._lock:
+            st = self._stats.setdefault(stage, {"hits": 0, "misses": 0})
+            st["hits" if hit else "misses"] += 1
+
+    def _touch(self, entry: Path) -> None:
+        try:
+            os.utime(entry, None)
+        except OSError:
+            pass
+
+    def _load(self, stage: str, key: str) -> tuple[Path, dict] | None:
+        entry = self._entry_dir(stage, key)
+        meta_path = entry / "value.json"
+        if not meta_path.exists():
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return entry, json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, stage: str, key: str, record: dict, src_file: str | None = None) -> None:
+        entry = self._entry_dir(stage, key)
+        tmp = entry.with_name(f"{entry.name}.tmp{threading.get_ident()}")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True, exist_ok=True)
+
+        if src_file:
+            name = "artifact" + Path(src_file).suffix
+            shutil.copyfile(src_file, tmp / name)
+            record["file"] = name
+
+        with open(tmp / "value.json", "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        size = self._entry_size(tmp)
+
+        # 기존 항목(만료 등)이 있으면 옆으로 치운 뒤 교체 (비어 있지 않은 디렉토리에는 os.replace 불가)
+        old_size = 0
+        if entry.exists():
+            old = entry.with_name(f"{entry.name}.old{threading.get_ident()}")
+            try:
+                old_size = self._entry_size(entry)
+                os.replace(entry, old)
+                shutil.rmtree(old, ignore_errors=True)
+            except OSError:
+                old_size = 0
+        try:
+            os.replace(tmp, entry)
+        except OSError:
+            # 같은 키를 동시에 쓰는 경우 먼저 끝난 쪽을 유지
+            shutil.rmtree(tmp, ignore_errors=True)
+            with self._lock:
+                self._total_bytes -= old_size
+            return
+
+        with self._lock:
+            self._total_bytes += size - old_size
+            over = self._total_bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    # ---------- JSON 값 ----------
+    def get_json(self, stage: str, key: str, max_age_sec: float | None = None) -> Any | None:
+        """
+        저장된 JSON 값 (없으면 None)
+        - max_age_sec: 저장 후 이 시간(초)이 지난 항목은 miss로 처리 (웹 검색 결과 등 시간이 지나면 낡는 값)
+        """
+        loaded = self._load(stage, key)
+        if loaded is not None and max_age_sec and max_age_sec > 0:
+            if time.time() - float(loaded[1].get("created", 0)) > max_age_sec:
+                loaded = None
+        if loaded is None:
+            self._count(stage, False)
+            return None
+        entry, record = loaded
+        self._touch(entry)
+        self._count(stage, True)
+        return record.get("value")
+
+    def put_json(self, stage: str, key: str, value: Any) -> None:
+        self._store(stage, key, {"value": value, "created": time.time()})
+
+    # ---------- 파일 산출물 ----------
+    def get_file(self, stage: str, key: str, dst: str) -> dict | None:
+        """
+        캐시된 파일을 dst로 복사한다.
+        - 반환: 저장 시 함께 넣은 meta (없으면 {}), 캐시 miss면 None
+        """
+        loaded = self._load(stage, key)
+        if loaded is None or not loaded[1].get("file"):
+            self._count(stage, False)
+            return None
+        entry, record = loaded
+        src = entry / record["file"]
+        if not src.exists():
+            self._count(stage, False)
+            return None
+
+        os.makedirs(os.path.dirname(os.path.abspath(dst)), exist_ok=True)
+        shutil.copyfile(src, dst)
+        self._touch(entry)
+        self._count(stage, True)
+        return record.get("value") or {}
+
+    def put_file(self, stage: str, key: str, src: str, meta: dict | None = None) -> None:
+        if not src or not os.path.exists(src):
+            return
+        self._store(stage, key, {"value": meta or {}, "created": time.time()}, src_file=src)
+
+    # ---------- LRU 정리 ----------
+    @staticmethod
+    def _entry_size(entry: Path) -> int:
+        return sum(p.stat().st_size for p in entry.iterdir() if p.is_file())
+
+    def _scan(self) -> tuple[list[tuple[float, int, Path]], int]:
+        entries = []
+        total = 0
+        for meta_path in self.root.glob("*/*/*/value.json"):
+            entry = meta_path.parent
+            if ".tmp" in entry.name:  # 쓰는 중인 항목
+                continue
+            try:
+                size = self._entry_size(entry)
+                entries.append((entry.stat().st_mtime, size, entry))
+            except OSError:
+                continue
+            total += size
+        return entries, total
+
+    def evict(self) -> None:
+        """용량(max_bytes)을 넘으면 가장 오래 사용되지 않은 항목부터 삭제"""
+        with self._lock:
+            entries, total = self._scan()
+            entries.sort(key=lambda e: e[0])  # 오래 안 쓴 것부터
+            for _, size, entry in entries:
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(entry, ignore_errors=True)
+                total -= size
+            self._total_bytes = total
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {k: dict(v) for k, v in self._stats.items()}
+
+_caches: dict[str, ArtifactCache] = {}
+_caches_lock = threading.Lock()
+
+def get_artifact_cache(state: dict) -> ArtifactCache | None:
+    """
+    state의 work_dir 기준 캐시 인스턴스 (같은 경로는 같은 인스턴스를 공유)
+    - prompt['use_cache'] = False 이면 None
+    - prompt['cache_max_mb'] 로 최대 용량 지정
+    """
+    prompt = state.get("prompt", {}) or {}
+    if not prompt.get("use_cache", True):
+        return None
+
+    root = str(Path(state.get("work_dir", "./")).expanduser().resolve() / "cache")
+    max_mb = float(prompt.get("cache_max_mb", DEFAULT_MAX_MB))
+    with _caches_lock:
+        cache = _caches.get(root)
+        if cache is None:
+            cache = ArtifactCache(root, max_bytes=int(max_mb * 1024 * 1024))
+            _caches[root] = cache
+        return cache
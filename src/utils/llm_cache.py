@@ -0,0 +1,152 @@
+import os
+import threading
+from typing import Any
+
+from langchain_core.messages import AIMessage, BaseMessage
+
+from ..utils.query_cache import QueryCache, DEFAULT_CACHE_DIR
+from ..utils.artifact_cache import hash_bytes, make_key
+from ..utils.rate_limit import get_rate_limiter
+
+# LLM 응답 캐시 (완전 일치, 작업/덱 공유 영속 저장)
+# - 키: 모델명 + temperature + max_tokens + 직렬화한 메시지 (이미지 data URL은 sha256 해시로 대체)
+# - 프롬프트가 한 글자라도 다르면 새로 호출 → 옵션을 바꾼 슬라이드만 다시 생성
+# - 모드 (prompt['llm_cache'] 또는 환경변수 LLM_CACHE):
+#     use     : 캐시 조회 후 없으면 호출하고 저장 (기본)
+#     refresh : 조회하지 않고 새로 호출한 결과로 덮어씀
+#     bypass  : 캐시를 전혀 사용하지 않음
+# - 저장 위치: LLM_CACHE_PATH (기본 ~/.cache/ai_lecture/llm.sqlite3),
+#   LLM_CACHE_TTL_HOURS (기본 0 = 만료 없음), LLM_CACHE_MAX_ENTRIES (기본 50000)
+# - 실제 호출(miss/bypass)은 분당 토큰 예산(LLM_TPM, prompt['llm_tpm'])을 공유 limiter로 지킴
+#   (캐시 hit은 토큰을 쓰지 않으므로 예산에서 빠짐)
+
+LLM_CACHE_MODES = ("use", "refresh", "bypass")
+
+LLM_TPM = float(os.getenv("LLM_TPM", "200000"))   # 분당 토큰 수 (0 이하면 제한 없음)
+IMAGE_TOKENS = 765             # 이미지 1장 추정 토큰 (high detail 1024px 기준)
+DEFAULT_OUTPUT_TOKENS = 512    # max_tokens가 없는 모델의 응답 토큰 추정치
+
+_llm_cache: QueryCache | None = None
+_llm_cache_lock = threading.Lock()
+_stats: dict[str, dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+def get_llm_cache() -> QueryCache:
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = QueryCache(
+                os.getenv("LLM_CACHE_PATH", os.path.join(DEFAULT_CACHE_DIR, "llm.sqlite3")),
+                ttl_sec=float(os.getenv("LLM_CACHE_TTL_HOURS", "0")) * 3600,
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000")),
+            )
+        return _llm_cache
+
+def _cache_mode(mode: str | None) -> str:
+    mode = (mode or os.getenv("LLM_CACHE") or "use").lower()
+    if mode not in LLM_CACHE_MODES:
+        print(f"[경고] 알 수 없는 LLM 캐시 모드 '{mode}' → use")
+        mode = "use"
+    return mode
+
+def _serialize_content(content: Any) -> Any:
+    """메시지 content 직렬화 (이미지 data URL은 내용 해시로 바꿔 키 크기를 줄임)"""
+    if not isinstance(content, list):
+        return content
+    parts = []
+    for part in content:
+        if isinstance(part, dict) and part.get("type") == "image_url":
+            url = (part.get("image_url") or {}).get("url", "")
+            parts.append({"type": "image_url", "sha256": hash_bytes(url.encode("utf-8"))})
+        else:
+            parts.append(part)
+    return parts
+
+def llm_cache_key(llm: Any, messages: list[BaseMessage]) -> str:
+    return make_key(
+        getattr(llm, "model_name", None) or getattr(llm, "model", None),
+        getattr(llm, "temperature", None),
+        getattr(llm, "max_tokens", None),
+        [{"type": m.type, "content": _serialize_content(m.content)} for m in messages],
+    )
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수 (UTF-8 4바이트당 1토큰, 한글 1글자 ≈ 0.75토큰)"""
+    return (len((text or "").encode("utf-8")) + 3) // 4
+
+def estimate_input_tokens(messages: list[BaseMessage]) -> int:
+    """입력 메시지 추정 토큰 (텍스트 + 이미지)"""
+    total = 0
+    for m in messages:
+        content = m.content
+        if isinstance(content, str):
+            total += estimate_tokens(content)
+            continue
+        for part in content:
+            if isinstance(part, dict) and part.get("type") == "image_url":
+                total += IMAGE_TOKENS
+            elif isinstance(part, dict):
+                total += estimate_tokens(part.get("text", ""))
+    return total
+
+def estimate_request_tokens(llm: Any, messages: list[BaseMessage]) -> int:
+    """요청 1회 추정 토큰 (입력 + 응답 상한)"""
+    return estimate_input_tokens(messages) + int(getattr(llm, "max_tokens", None) or DEFAULT_OUTPUT_TOKENS)
+
+def _invoke(llm: Any, messages: list[BaseMessage], stage: str, tpm: float | None) -> AIMessage:
+    limiter = get_rate_limiter("openai_llm_tokens", tpm if tpm is not None else LLM_TPM)
+    waited = limiter.acquire(estimate_request_tokens(llm, messages))
+    if waited > 0.5:
+        print(f"[LLM 토큰 예산] {waited:.1f}초 대기")
+    response = llm.invoke(messages)
+
+    # 실제 사용 토큰 집계 (응답에 usage가 없으면 추정치)
+    usage = getattr(response, "usage_metadata", None) or {}
+    tokens_in = usage.get("input_tokens") or estimate_input_tokens(messages)
+    tokens_out = usage.get("output_tokens") or estimate_tokens(str(response.content or ""))
+    _count(stage, "tokens_in", tokens_in)
+    _count(stage, "tokens_out", tokens_out)
+    return response
+
+def _count(stage: str, key: str, n: int = 1) -> None:
+    with _stats_lock:
+        st = _stats.setdefault(stage, {"hits": 0, "misses": 0, "bypass": 0, "tokens_in": 0, "tokens_out": 0})
+        st[key] += n
+
+def llm_cache_stats() -> dict[str, dict[str, int]]:
+    """단계(stage)별 hit / miss / bypass 횟수 + 실제 호출의 입력/출력 토큰 누적"""
+    with _stats_lock:
+        return {stage: dict(st) for stage, st in _stats.items()}
+
+def cached_invoke(
+    llm: Any,
+    messages: list[BaseMessage],
+    stage: str,
+    mode: str | None = None,
+    tpm: float | None = None,
+) -> AIMessage:
+    """
+    llm.invoke(messages)의 캐시 버전
+    - 반환: AIMessage (캐시 hit이면 저장된 응답 content로 만든 메시지)
+    - stage: 집계용 이름 (page_content / script / quiz)
+    - tpm: 분당 토큰 예산 (None이면 LLM_TPM)
+    """
+    mode = _cache_mode(mode)
+    if mode == "bypass":
+        _count(stage, "bypass")
+        return _invoke(llm, messages, stage, tpm)
+
+    cache = get_llm_cache()
+    key = llm_cache_key(llm, messages)
+    if mode == "use":
+        cached = cache.get(key)
+        if cached is not None:
+            _count(stage, "hits")
+            print(f"[LLM 캐시] {stage} hit")
+            return AIMessage(content=cached)
+
+    _count(stage, "misses")
+    response = _invoke(llm, messages, stage, tpm)
+    if isinstance(response.content, str):
+        cache.put(key, response.content)
+    return response
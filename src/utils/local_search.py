@@ -0,0 +1,228 @@
+import os
+import re
+import json
+import math
+import hashlib
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Callable
+
+from ..utils.split_chunk import split_text_to_chunks
+from ..utils.query_cache import DEFAULT_CACHE_DIR
+
+# 로컬 참고 문서 BM25 검색 (외부망 없는 환경용 검색 backend)
+# - 폴더 안 .txt / .md / .html 문서를 문단 chunk 단위로 색인
+# - 색인은 문서 폴더가 아닌 캐시 폴더(<work_dir>/cache/bm25/<문서 폴더 경로 해시>.json)에 저장
+#   (문서 폴더는 읽기 전용이거나 버전 관리 중일 수 있음)
+# - 문서가 추가/삭제되거나 수정 시각/크기가 바뀌면 디스크 색인과 프로세스 안 색인 모두 다시 생성
+# - 검색 결과는 tavily_search와 같은 {title, url, snippet, domain, score} 형식
+#   (domain = 문서 파일 경로 → "2개 이상 출처에서 일치" 필터가 문서 단위로 동작)
+
+INDEX_DIR_NAME = "bm25"
+INDEX_VERSION = 2
+DOC_SUFFIXES = (".txt", ".md", ".markdown", ".html", ".htm")
+CHUNK_CHARS = 400
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# 한국어 조사/어미 (긴 것부터 제거)
+_KO_SUFFIXES = sorted([
+    "은", "는", "이", "가", "을", "를", "의", "에", "에서", "에게", "께서", "으로", "로",
+    "와", "과", "도", "만", "부터", "까지", "보다", "처럼", "이나", "나", "이란", "란",
+    "이다", "입니다", "합니다", "하는", "하고", "한다", "된다", "되는", "에는", "에서는", "으로는",
+], key=len, reverse=True)
+_TOKEN_RE = re.compile(r"[가-힣]+|[a-z0-9]+")
+_HANGUL_RE = re.compile(r"^[가-힣]+$")
+
+def _strip_suffix(word: str) -> str:
+    for suf in _KO_SUFFIXES:
+        if len(word) - len(suf) >= 2 and word.endswith(suf):
+            return word[:-len(suf)]
+    return word
+
+def tokenize(text: str) -> list[str]:
+    """
+    한국어 대응 토큰화
+    - 한글 어절: 조사/어미를 뗀 어간 + 음절 bigram (띄어쓰기/복합어 차이에 강하게)
+    - 영문/숫자: 소문자 단어 (1글자 제외)
+    """
+    tokens: list[str] = []
+    for word in _TOKEN_RE.findall((text or "").lower()):
+        if _HANGUL_RE.match(word):
+            stem = _strip_suffix(word)
+            tokens.append(stem)
+            if len(stem) > 2:
+                tokens.extend(stem[i:i + 2] for i in range(len(stem) - 1))
+        elif len(word) > 1:
+            tokens.append(word)
+    return tokens
+
+def _read_doc(path: Path) -> tuple[str, str]:
+    """(제목, 본문) - 제목은 첫 번째 비어 있지 않은 줄(마크다운 # 제거), 없으면 파일명"""
+    text = path.read_text(encoding="utf-8", errors="ignore")
+    if path.suffix.lower() in (".html", ".htm"):
+        m = re.search(r"<title[^>]*>(.*?)</title>", text, re.IGNORECASE | re.DOTALL)
+        text = re.sub(r"<(script|style)[^>]*>.*?</\1>", " ", text, flags=re.IGNORECASE | re.DOTALL)
+        text = re.sub(r"<[^>]+>", " ", text)
+        if m:
+            return m.group(1).strip(), text
+    for line in text.splitlines():
+        line = line.strip().lstrip("#").strip()
+        if line:
+            return line[:120], text
+    return path.stem, text
+
+def _doc_files(docs_dir: Path) -> list[Path]:
+    return sorted(
+        p for p in docs_dir.rglob("*")
+        if p.is_file() and p.suffix.lower() in DOC_SUFFIXES and not p.name.startswith(".")
+    )
+
+def _signature(files: list[Path]) -> dict[str, list[int]]:
+    out = {}
+    for p in files:
+        st = p.stat()
+        out[str(p)] = [st.st_mtime_ns, st.st_size]
+    return out
+
+class LocalIndex:
+    def __init__(self, data: dict):
+        self.docs: list[dict] = data["docs"]
+        self.doc_len: list[int] = data["doc_len"]
+        self.postings: dict[str, list[list[int]]] = data["postings"]
+        self.avgdl = (sum(self.doc_len) / len(self.doc_len)) if self.doc_len else 0.0
+
+    @classmethod
+    def build(cls, docs_dir: Path, files: list[Path]) -> dict:
+        docs, doc_len = [], []
+        postings: dict[str, list[list[int]]] = {}
+        for path in files:
+            title, text = _read_doc(path)
+            rel = str(path.relative_to(docs_dir))
+            for chunk in split_text_to_chunks(re.sub(r"\s+", " ", text), max_len=CHUNK_CHARS):
+                doc_id = len(docs)
+                tf = Counter(tokenize(chunk))
+                if not tf:
+                    continue
+                docs.append({"title": title, "url": path.resolve().as_uri(), "snippet": chunk, "domain": rel})
+                doc_len.append(sum(tf.values()))
+                for term, n in tf.items():
+                    postings.setdefault(term, []).append([doc_id, n])
+        return {
+            "version": INDEX_VERSION,
+            "files": _signature(files),
+            "docs": docs,
+            "doc_len": doc_len,
+            "postings": postings,
+        }
+
+    def search(self, query: str, k: int = 4) -> list[dict]:
+        n_docs = len(self.docs)
+        if not n_docs:
+            return []
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            plist = self.postings.get(term)
+            if not plist:
+                continue
+            idf = math.log(1 + (n_docs - len(plist) + 0.5) / (len(plist) + 0.5))
+            for doc_id, tf in plist:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_len[doc_id] / self.avgdl)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        top = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:k]
+        if not top:
+            return []
+        best = top[0][1]
+        results = []
+        for doc_id, s in top:
+            rel = s / best if best > 0 else 0.0   # 최고 점수 대비 [0,1]
+            results.append({
+                **self.docs[doc_id],
+                "score": round(rel, 4),
+                "score_detail": {"bm25": round(s, 4)},
+            })
+        return results
+
+_indexes: dict[str, tuple[dict, LocalIndex]] = {}
+_indexes_lock = threading.Lock()
+
+def index_path_for(docs_dir: str, index_dir: str | None = None) -> Path:
+    """문서 폴더별 색인 파일 경로 (index_dir 없으면 ~/.cache/ai_lecture/bm25)"""
+    root = Path(docs_dir).expanduser().resolve()
+    base = Path(index_dir or os.path.join(DEFAULT_CACHE_DIR, INDEX_DIR_NAME)).expanduser().resolve()
+    return base / (hashlib.sha256(str(root).encode("utf-8")).hexdigest()[:16] + ".json")
+
+def get_local_index(docs_dir: str, index_dir: str | None = None, signature: str | None = None) -> LocalIndex:
+    """
+    문서 폴더의 BM25 색인
+    - signature: 문서 폴더 상태 키 (docs_signature, 실행당 한 번 계산해 넘기면 질의마다 폴더를 다시 훑지 않음)
+    - 프로세스 안 색인은 signature가 같을 때만 재사용
+    - 디스크 색인이 현재 문서 목록과 맞으면 그대로 사용, 아니면 다시 만들어 저장
+    """
+    root = Path(docs_dir).expanduser().resolve()
+    index_path = index_path_for(str(root), index_dir)
+    if signature is None:
+        signature = docs_signature(str(root))
+
+    with _indexes_lock:
+        cached = _indexes.get(str(index_path))
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        files = _doc_files(root)
+        data = None
+        if index_path.exists():
+            try:
+                with open(index_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = None
+        if (
+            not data
+            or data.get("version") != INDEX_VERSION
+            or data.get("root") != str(root)
+            or data.get("files") != _signature(files)
+        ):
+            print(f"[로컬 검색] 색인 생성 중... ({len(files)}개 문서, {root})")
+            data = LocalIndex.build(root, files)
+            data["root"] = str(root)
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = index_path.with_suffix(f".tmp{os.getpid()}")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, index_path)
+
+        index = LocalIndex(data)
+        _indexes[str(index_path)] = (signature, index)
+        print(f"[로컬 검색] 색인 준비 완료: chunk {len(index.docs)}개, 단어 {len(index.postings)}개")
+        return index
+
+def docs_signature(docs_dir: str | None) -> str:
+    """문서 폴더 상태 키 (폴더 경로 + 문서별 경로/수정 시각/크기) - 검색 결과 캐시 키용"""
+    docs_dir = docs_dir or os.getenv("RAG_DOCS_DIR")
+    if not docs_dir or not os.path.isdir(docs_dir):
+        return ""
+    root = Path(docs_dir).expanduser().resolve()
+    raw = json.dumps([str(root), _signature(_doc_files(root))], sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def local_search(title: str, num: int = 4, docs_dir: str | None = None, index_dir: str | None = None,
+                 signature: str | None = None, on_start: Callable[[], None] | None = None) -> list[dict]:
+    """
+    tavily_search와 같은 형식의 로컬 문서 검색
+    - docs_dir 없으면 환경변수 RAG_DOCS_DIR
+    - index_dir: 색인 저장 폴더 (노드에서는 <work_dir>/cache/bm25)
+    - signature: 미리 계산한 문서 폴더 상태 키 (없으면 호출마다 폴더를 훑어 계산)
+    - on_start: 색인 준비가 끝나고 검색하기 직전에 호출 (색인 생성 시간은 질의 시간 제한에서 제외)
+    """
+    docs_dir = docs_dir or os.getenv("RAG_DOCS_DIR")
+    if not docs_dir or not os.path.isdir(docs_dir):
+        print(f"[경고] 로컬 문서 폴더 없음 → {docs_dir}")
+        return []
+    index = get_local_index(docs_dir, index_dir, signature)
+    if on_start:
+        on_start()
+    return index.search(title, k=num)
@@ -0,0 +1,189 @@
+import os
+import json
+import shutil
+from pathlib import Path
+from typing import Any
+
+# 실행 결과 manifest (증분 재생성용)
+# - 실행이 끝나면 <work_dir>/manifest.json 에 슬라이드별 해시와 산출물을 기록
+# - 다음 실행에서 이전 manifest를 넘기면, 내용이 같은 슬라이드는 산출물을 그대로 재사용
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# 결과물 내용에 영향을 주는 prompt 항목 (워커 수 같은 실행 옵션은 제외)
+CONTENT_PROMPT_KEYS = ("tone", "voice", "style", "target_duration_sec", "speed", "render_profile", "rag", "search_backend", "continuity", "smooth_boundaries", "outline_context", "context_tokens")
+
+# 결과물 내용에 영향을 주는 모델 (환경변수, 스크립트 / 경계 다듬기 / TTS)
+CONTENT_MODEL_ENVS = ("LLM_MODEL", "SMOOTH_MODEL", "TTS_MODEL")
+
+def _content_prompt(prompt: dict) -> dict:
+    prompt = prompt or {}
+    return {k: prompt.get(k) for k in CONTENT_PROMPT_KEYS}
+
+def _content_models() -> dict:
+    return {name: os.getenv(name) for name in CONTENT_MODEL_ENVS}
+
+def record_slide(state: dict, idx: int, sub: dict) -> None:
+    """
+    슬라이드 1장의 산출물을 state['slide_records'][idx]에 기록
+    - sub에 있는 항목만 갱신 (병렬 모드에서는 단계별 노드가 나눠서 기록)
+    """
+    rec = state.setdefault("slide_records", {}).setdefault(idx, {})
+    for key, src in (
+        ("external_content", "external_content"),
+        ("page_content", "page_content"),
+        ("script", "script"),
+        ("audio", "audio"),
+        ("video", "video_path"),
+    ):
+        if src in sub:
+            rec[key] = sub[src]
+
+    meta = (sub.get("audio_meta") or {}).get(idx)
+    if meta and meta.get("duration") is not None:
+        rec["duration"] = meta["duration"]
+
+def write_manifest(state: dict) -> str:
+    work_dir = state.get("work_dir", "./")
+    hashes = state.get("slide_hashes", []) or []
+    records = state.get("slide_records", {}) or {}
+
+    slides = []
+    for idx, h in enumerate(hashes):
+        rec = dict(records.get(idx, {}))
+        rec["hash"] = h
+        slides.append(rec)
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "pptx_path": state.get("pptx_path", ""),
+        "prompt": _content_prompt(state.get("prompt", {})),
+        "models": _content_models(),
+        "slides": slides,
+        "final_video": state.get("final_video", ""),
+    }
+
+    path = os.path.join(work_dir, MANIFEST_NAME)
+    os.makedirs(work_dir, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    print(f"[manifest] 저장 → {path}")
+    return path
+
+def load_manifest(path: str) -> dict | None:
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[경고] manifest 읽기 실패: {e}")
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        print("[경고] manifest 버전이 달라 무시합니다.")
+        return None
+    return manifest
+
+def plan_reuse(manifest: dict | None, slide_hashes: list[str], prompt: dict, work_dir: str) -> dict[int, dict[str, Any]]:
+    """
+    이전 manifest와 현재 슬라이드 해시를 비교해 재사용할 슬라이드를 정한다.
+    - 재사용 조건: 자기 자신 + 바로 앞 슬라이드 해시가 같고 (gen_script가 이전 스크립트를 참고하므로),
+      마지막 슬라이드 여부가 같고, 산출물 파일이 남아 있을 것
+    - 즉 바뀐 슬라이드와 그 다음 슬라이드만 다시 생성됨
+    - prompt(톤/목소리/스타일/길이/속도)나 모델(LLM_MODEL / SMOOTH_MODEL / TTS_MODEL)이 바뀌었으면 전체 재생성
+    - outline_context='window'면 재사용하지 않음 (스크립트가 앞 슬라이드 외에 주변 목차/섹션/최근 요약에도
+      의존해서 앞 슬라이드 해시만으로는 낡은 스크립트를 가려낼 수 없음)
+    - 반환: {slide index: 이전 산출물}
+    """
+    if not manifest:
+        return {}
+    if manifest.get("prompt") != _content_prompt(prompt):
+        print("[증분] prompt 옵션이 달라 전체 슬라이드를 다시 생성합니다.")
+        return {}
+    if manifest.get("models") != _content_models():
+        print("[증분] 사용 모델이 달라 전체 슬라이드를 다시 생성합니다.")
+        return {}
+    if (prompt or {}).get("outline_context") == "window":
+        print("[증분] window 문맥 모드는 스크립트가 여러 슬라이드에 의존하므로 전체 슬라이드를 다시 생성합니다.")
+        return {}
+
+    old_slides = manifest.get("slides", []) or []
+    old_total = len(old_slides)
+    new_total = len(slide_hashes)
+
+    # (앞 슬라이드 해시, 자기 해시, 마지막 여부) → 이전 기록
+    index = {}
+    for j, rec in enumerate(old_slides):
+        prev_h = old_slides[j - 1].get("hash") if j > 0 else None
+        index.setdefault((prev_h, rec.get("hash"), j == old_total - 1), rec)
+
+    # 이전 산출물을 별도 폴더로 옮겨 둠 (슬라이드 순서가 바뀌면 같은 파일명을 덮어쓸 수 있으므로)
+    stash = Path(work_dir).expanduser().resolve() / "reuse"
+    shutil.rmtree(stash, ignore_errors=True)
+    stash.mkdir(parents=True, exist_ok=True)
+
+    # 클립 모드(기본 또는 keep_clips)면 이전 기록에 슬라이드 영상이 있어야 재사용 가능
+    need_video = (prompt or {}).get("render_mode", "clips") != "single_pass" or bool((prompt or {}).get("keep_clips"))
+
+    reuse = {}
+    for i, h in enumerate(slide_hashes):
+        prev_h = slide_hashes[i - 1] if i > 0 else None
+        rec = index.get((prev_h, h, i == new_total - 1))
+        if not rec or not rec.get("script"):
+            continue
+        if not (rec.get("audio") and os.path.exists(rec["audio"])):
+            continue
+        # 영상은 클립 모드로 만든 기록에만 있음 (단일 패스 모드는 음성만 재사용)
+        if rec.get("video") and not os.path.exists(rec["video"]):
+            continue
+        if need_video and not rec.get("video"):
+            continue
+
+        rec = dict(rec)
+        for key in ("audio", "video"):
+            if not rec.get(key):
+                continue
+            dst = stash / f"{h[:16]}_{os.path.basename(rec[key])}"
+            if not dst.exists():
+                shutil.copyfile(rec[key], dst)
+            rec[key] = str(dst)
+        reuse[i] = rec
+
+    print(f"[증분] {new_total}장 중 {len(reuse)}장 재사용, {new_total - len(reuse)}장 재생성")
+    return reuse
+
+def apply_reuse(state: dict, rec: dict) -> dict:
+    """
+    재사용 슬라이드의 이전 산출물을 state에 채운다 (노드 실행 없이 make_video 이후 상태로 만듦)
+    - 오디오/영상은 현재 슬라이드 번호의 파일명으로 복사 (concat은 파일명 번호로 정렬)
+    - 영상 기록이 없으면(단일 패스 모드) 음성만 복사
+    """
+    idx = int(state.get("slide_index", 0))
+    work_dir = state.get("work_dir", "./")
+    os.makedirs(work_dir, exist_ok=True)
+
+    audio = os.path.join(work_dir, f"tts_slide{idx}_reused{Path(rec['audio']).suffix}")
+    shutil.copyfile(rec["audio"], audio)
+
+    state["external_content"] = rec.get("external_content", {})
+    state["page_content"] = rec.get("page_content", "")
+    state["script"] = rec.get("script", "")
+    state.setdefault("all_scripts", []).append(state["script"])
+    state["audio"] = audio
+    state.setdefault("audio_paths", []).append(audio)
+    if rec.get("duration") is not None:
+        state.setdefault("audio_meta", {})[idx] = {"path": audio, "duration": float(rec["duration"])}
+    if rec.get("video"):
+        video = os.path.join(work_dir, f"slide{idx+1}_lecture.mp4")
+        shutil.copyfile(rec["video"], video)
+        state["video_path"] = video
+    else:
+        state.pop("video_path", None)
+
+    script_path = os.path.join(work_dir, f"script_{idx}.txt")
+    with open(script_path, "w", encoding="utf-8") as f:
+        f.write(state["script"])
+
+    return state
@@ -0,0 +1,195 @@
+import os
+import struct
+from functools import lru_cache
+
+from .utils import ffprobe_duration
+
+# 미디어 길이(초)를 ffprobe 프로세스 없이 파일 헤더에서 직접 읽기
+# - MP3: Xing/Info/VBRI 헤더의 프레임 수, 없으면 프레임 헤더를 순서대로 읽어 합산
+# - MP4/MOV: moov/mvhd atom의 timescale / duration
+# - 그 외 형식이나 파싱 실패 시에만 ffprobe 사용
+# - 결과는 (경로, 수정 시각, 크기) 기준으로 메모이즈 → 같은 파일을 여러 노드에서 물어도 한 번만 읽음
+
+# ---------------- MP3 ----------------
+
+# (MPEG 버전, 레이어) → 비트레이트 표 (kbps, index 1~14)
+_BITRATES = {
+    (1, 1): (32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_SAMPLE_RATES = {1: (44100, 48000, 32000), 2: (22050, 24000, 16000), 2.5: (11025, 12000, 8000)}
+_VERSIONS = {0b00: 2.5, 0b10: 2, 0b11: 1}
+_LAYERS = {0b01: 3, 0b10: 2, 0b11: 1}
+
+# 프레임 동기 위치를 찾을 때 ID3 태그 뒤에서 살펴볼 최대 바이트 수
+_SYNC_SEARCH_BYTES = 64 * 1024
+
+def _mp3_frame(header: bytes) -> dict | None:
+    """MPEG 오디오 프레임 헤더 4바이트 해석 (유효하지 않으면 None)"""
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+    version = _VERSIONS.get((header[1] >> 3) & 0b11)
+    layer = _LAYERS.get((header[1] >> 1) & 0b11)
+    br_idx = header[2] >> 4
+    sr_idx = (header[2] >> 2) & 0b11
+    if version is None or layer is None or br_idx in (0, 15) or sr_idx == 3:
+        return None
+
+    bitrate = _BITRATES[(1 if version == 1 else 2, layer)][br_idx - 1] * 1000
+    sample_rate = _SAMPLE_RATES[version][sr_idx]
+    padding = (header[2] >> 1) & 1
+    mono = (header[3] >> 6) == 0b11
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if (layer == 2 or version == 1) else 576
+        length = (samples // 8) * bitrate // sample_rate + padding
+
+    return {
+        "version": version,
+        "samples": samples,
+        "sample_rate": sample_rate,
+        "length": length,
+        "mono": mono,
+    }
+
+def _id3v2_size(head: bytes) -> int:
+    """파일 앞 ID3v2 태그 전체 크기 (없으면 0)"""
+    if len(head) < 10 or head[:3] != b"ID3":
+        return 0
+    size = 0
+    for b in head[6:10]:
+        size = (size << 7) | (b & 0x7F)
+    footer = 10 if head[5] & 0x10 else 0
+    return 10 + size + footer
+
+def _mp3_duration(path: str) -> float | None:
+    with open(path, "rb") as f:
+        data = f.read()
+
+    pos = _id3v2_size(data[:10])
+    end = len(data) - (128 if data[-128:-125] == b"TAG" else 0)
+
+    # 첫 프레임 찾기 (다음 프레임 헤더까지 유효해야 인정)
+    first = None
+    limit = min(end - 4, pos + _SYNC_SEARCH_BYTES)
+    while pos < limit:
+        frame = _mp3_frame(data[pos:pos + 4])
+        if frame and frame["length"] > 0:
+            nxt = pos + frame["length"]
+            if nxt >= end or _mp3_frame(data[nxt:nxt + 4]):
+                first = frame
+                break
+        pos += 1
+    if first is None:
+        return None
+
+    # Xing/Info (LAME) 헤더: side info 뒤에 위치
+    if first["version"] == 1:
+        side = 17 if first["mono"] else 32
+    else:
+        side = 9 if first["mono"] else 17
+    xing = pos + 4 + side
+    if data[xing:xing + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+        if flags & 0x1:
+            frames = struct.unpack(">I", data[xing + 8:xing + 12])[0]
+            return frames * first["samples"] / first["sample_rate"]
+
+    # VBRI (Fraunhofer) 헤더: 프레임 헤더 뒤 32바이트
+    vbri = pos + 4 + 32
+    if data[vbri:vbri + 4] == b"VBRI":
+        frames = struct.unpack(">I", data[vbri + 14:vbri + 18])[0]
+        return frames * first["samples"] / first["sample_rate"]
+
+    # 헤더 없음: 프레임을 따라가며 샘플 수 합산
+    samples = 0.0
+    while pos + 4 <= end:
+        frame = _mp3_frame(data[pos:pos + 4])
+        if frame is None or frame["length"] <= 0:
+            break
+        samples += frame["samples"] / frame["sample_rate"]
+        pos += frame["length"]
+    return samples or None
+
+# ---------------- MP4 ----------------
+
+_CONTAINER_BOXES = {b"moov"}
+
+def _mp4_boxes(f, start: int, end: int):
+    """[start, end) 범위의 box (type, 본문 시작, box 끝) 순회"""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack(">I4s", header)
+        body = pos + 8
+        if size == 1:
+            size = struct.unpack(">Q", f.read(8))[0]
+            body += 8
+        elif size == 0:
+            size = end - pos
+        if size < 8:
+            return
+        yield box_type, body, pos + size
+        pos += size
+
+def _mp4_duration(path: str) -> float | None:
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        for box_type, body, box_end in _mp4_boxes(f, 0, end):
+            if box_type not in _CONTAINER_BOXES:
+                continue
+            for child, child_body, _ in _mp4_boxes(f, body, box_end):
+                if child != b"mvhd":
+                    continue
+                f.seek(child_body)
+                version = f.read(4)[0]
+                if version == 1:
+                    _, _, timescale, duration = struct.unpack(">QQIQ", f.read(28))
+                else:
+                    _, _, timescale, duration = struct.unpack(">IIII", f.read(16))
+                return duration / timescale if timescale else None
+    return None
+
+# ---------------- 공통 ----------------
+
+def _sniff(path: str) -> str:
+    with open(path, "rb") as f:
+        head = f.read(12)
+    if head[4:8] == b"ftyp":
+        return "mp4"
+    if head[:3] == b"ID3" or _mp3_frame(head[:4]):
+        return "mp3"
+    return ""
+
+_PARSERS = {"mp3": _mp3_duration, "mp4": _mp4_duration}
+
+@lru_cache(maxsize=4096)
+def _cached_duration(path: str, mtime_ns: int, size: int) -> float:
+    try:
+        parser = _PARSERS.get(_sniff(path))
+        duration = parser(path) if parser else None
+    except (OSError, struct.error, IndexError, ValueError):
+        duration = None
+    if duration is None or duration <= 0:
+        # 모르는 형식 / 파싱 실패 → ffprobe
+        duration = ffprobe_duration(path)
+    return float(duration)
+
+def media_duration(path: str) -> float:
+    """
+    오디오/영상 파일 길이(초)
+    - 파일 내용이 바뀌면(수정 시각/크기) 다시 읽음
+    - 파일이 없으면 OSError, ffprobe 실패 시 subprocess 예외 (ffprobe_duration과 동일하게 호출부에서 처리)
+    """
+    st = os.stat(path)
+    return _cached_duration(os.path.abspath(path), st.st_mtime_ns, st.st_size)
@@ -0,0 +1,91 @@
+import re
+import random
+from difflib import SequenceMatcher
+
+# 검색 스니펫 근접 중복 묶기 (MinHash + LSH)
+# - 기존 방식: 스니펫마다 모든 그룹 대표와 SequenceMatcher 비교 → 결과 수 × 스니펫 길이에 대해 제곱 비용
+# - 문자 shingle의 MinHash 서명을 band로 나눠 버킷에 넣고, 버킷이 겹치는 그룹 대표만 후보로 비교
+# - 후보 확인은 기존과 같은 SequenceMatcher 기준(ratio >= thr)이라 묶이는 결과의 의미는 동일
+#   (기존 방식은 benchmarks/bench_near_dup.py에 비교용으로 남아 있음)
+#   (LSH 임계값을 낮게 잡아 ratio 0.82 수준의 쌍은 거의 항상 후보에 들어옴)
+
+SHINGLE_SIZE = 4     # 문자 단위 shingle 길이 (한국어 포함)
+NUM_PERM = 32        # MinHash 해시 함수 개수
+BANDS = 16           # LSH band 수 (band당 NUM_PERM // BANDS 행) → 자카드 약 0.25 이상이면 후보
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240601)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+def norm(s: str) -> str:
+    s = (s or "").lower().strip()
+    s = re.sub(r"\s+", " ", s)
+    return s
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> set[str]:
+    """정규화된 텍스트의 문자 k-gram 집합"""
+    if len(text) <= k:
+        return {text} if text else set()
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+def minhash(sh: set[str]) -> list[int]:
+    """shingle 집합의 MinHash 서명 (해시 함수 NUM_PERM개)"""
+    hashes = [hash(s) & _PRIME for s in sh]
+    if not hashes:
+        return [0] * NUM_PERM
+    return [min([(a * h + b) % _PRIME for h in hashes]) for a, b in _PERMS]
+
+def lsh_keys(signature: list[int]) -> list[tuple]:
+    """서명을 BANDS개 band로 나눈 버킷 키"""
+    rows = NUM_PERM // BANDS
+    return [(band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(BANDS)]
+
+def cluster_snippets(results: list[dict], thr: float = 0.82) -> list[dict]:
+    """
+    검색 결과를 스니펫 근접 중복 기준으로 묶음
+    - 입력 순서대로, 비슷한 대표가 있는 첫 그룹에 넣고 없으면 새 그룹 생성 (기존 방식과 같은 순서 규칙)
+    - 반환: [{"rep": 대표 스니펫, "items": [결과], "domains": set}]
+    """
+    groups: list[dict] = []
+    # 그룹 대표별 SequenceMatcher (대표를 seq2로 고정 → 대표 분석 결과를 그룹 수명 동안 재사용)
+    # 기존 방식(SequenceMatcher(snip, rep))과 같은 인자 순서 (autojunk 때문에 ratio는 순서에 따라 다를 수 있음)
+    matchers: list[SequenceMatcher] = []
+    buckets: dict[tuple, list[int]] = {}
+
+    for r in results:
+        snip, dom = r.get("snippet", ""), r.get("domain", "")
+        if not snip:
+            continue
+
+        text = norm(snip)
+        keys = lsh_keys(minhash(shingles(text)))
+        candidates = sorted({gi for key in keys for gi in buckets.get(key, ())})
+
+        # real_quick_ratio / quick_ratio는 ratio의 상한 → 여기서 떨어지면 ratio 계산 생략
+        placed = False
+        for gi in candidates:
+            g = groups[gi]
+            matcher = matchers[gi]
+            matcher.set_seq1(text)
+            if (
+                matcher.real_quick_ratio() >= thr
+                and matcher.quick_ratio() >= thr
+                and matcher.ratio() >= thr
+            ):
+                g["items"].append(r)
+                if dom:
+                    g["domains"].add(dom)
+                placed = True
+                break
+
+        if not placed:
+            groups.append({
+                "rep": snip,
+                "items": [r],
+                "domains": set([dom] if dom else []),
+            })
+            matchers.append(SequenceMatcher(None, "", text))
+            for key in keys:
+                buckets.setdefault(key, []).append(len(groups) - 1)
+
+    return groups
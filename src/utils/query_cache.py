@@ -0,0 +1,75 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+# 작업/덱 사이에 공유되는 영속 질의 캐시 (SQLite 키-값 저장소)
+# - 같은 질의를 여러 실행, 여러 프로세스에서 재사용 (SQLite가 파일 잠금 처리)
+# - TTL이 지난 항목은 조회 시 무시, 최대 개수 초과 시 가장 오래 사용되지 않은 항목부터 삭제
+# - 인스턴스별 hit/miss 카운터
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ai_lecture")
+
+class QueryCache:
+    def __init__(self, path: str, ttl_sec: float = 7 * 24 * 3600, max_entries: int = 20000):
+        self.path = str(Path(path).expanduser().resolve())
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_sec = float(ttl_sec)
+        self.max_entries = int(max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed)")
+
+    def get(self, key: str) -> Any | None:
+        """저장된 값 (없거나 TTL 만료면 None)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl_sec > 0 and now - row[1] > self.ttl_sec):
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        now = time.time()
+        raw = json.dumps(value, ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, raw, now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        # 만료 항목 삭제 후, 최대 개수를 넘으면 오래 사용되지 않은 순서로 삭제
+        if self.ttl_sec > 0:
+            self._conn.execute("DELETE FROM entries WHERE created < ?", (now - self.ttl_sec,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        if self.max_entries > 0 and count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                " SELECT key FROM entries ORDER BY accessed ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+            return {"hits": self.hits, "misses": self.misses, "entries": count}
@@ -0,0 +1,103 @@
+import re
+
+# 슬라이드별 외부 검색(RAG) 필요 여부 판단 (규칙 기반, 로컬에서 즉시 계산)
+# - 표지, 섹션 구분, 목차, Q&A, "감사합니다", 이미지만 있는 슬라이드는 검색해도 얻을 게 없음
+# - prompt['rag'] = "auto"(기본, 규칙 적용) / "always"(항상 검색) / "never"(검색 안 함)
+
+RAG_MODES = ("auto", "always", "never")
+
+# 제목만 보고 검색을 건너뛰는 슬라이드 (소문자, 공백 제거 후 완전 일치)
+SKIP_TITLES = {
+    "q&a", "qna", "q/a", "질의응답", "질문", "질문과답변", "질문있으신가요?", "질문있나요?",
+    "감사합니다", "감사합니다.", "감사합니다!", "thankyou", "thankyou!", "thanks", "thanks!",
+    "목차", "차례", "contents", "tableofcontents", "agenda", "outline",
+    "끝", "theend", "마무리", "참고문헌", "참고자료", "references",
+}
+# 제목 앞부분으로 판단하는 섹션 구분 슬라이드 (예: "Part 2", "Chapter 3", "1장", "Section 4")
+SECTION_RE = re.compile(r"^(part|chapter|section|week|lecture|\d+\s*(장|부|주차|강))\b", re.IGNORECASE)
+
+# 본문(텍스트 + 도형 텍스트)이 이 글자 수보다 짧고 표도 없으면 "내용이 거의 없는" 슬라이드
+MIN_BODY_CHARS = 20
+# 섹션 제목 형식이면 부제 정도의 본문(이 글자 수 미만)까지는 구분 슬라이드로 봄
+SECTION_MAX_BODY_CHARS = 80
+
+def _compact(s: str) -> str:
+    return re.sub(r"\s+", "", (s or "").lower())
+
+def _slide_parts(state: dict, idx: int) -> tuple[str, str, list, list, list]:
+    def pick(key, default):
+        values = state.get(key) or []
+        return values[idx] if idx < len(values) else default
+
+    title = (pick("titles", "") or "").strip()
+    body = (pick("texts", "") or "").strip()
+    shape_texts = [t for t in (pick("shape_texts", []) or []) if t and t.strip()]
+    tables = pick("tables", []) or []
+    images = pick("images", []) or []
+    return title, body, shape_texts, tables, images
+
+def rag_decision(state: dict, idx: int) -> tuple[bool, str]:
+    """
+    슬라이드 idx에 외부 검색이 필요한지
+    - 반환: (검색 여부, 사유)
+    """
+    mode = str((state.get("prompt") or {}).get("rag", "auto")).lower()
+    if mode not in RAG_MODES:
+        mode = "auto"
+    if mode == "always":
+        return True, "always"
+    if mode == "never":
+        return False, "never"
+
+    title, body, shape_texts, tables, images = _slide_parts(state, idx)
+    body_chars = len(_compact(body)) + sum(len(_compact(t)) for t in shape_texts)
+    has_table = any(tables)
+
+    if _compact(title) in SKIP_TITLES:
+        return False, "closing_or_toc"
+    if not title and not body_chars and not has_table:
+        return False, "image_only"
+    if has_table:
+        return True, "table"
+    if SECTION_RE.match(title) and body_chars < SECTION_MAX_BODY_CHARS:
+        return False, "section_divider"
+    if body_chars < MIN_BODY_CHARS:
+        if idx == 0:
+            return False, "title_slide"
+        # 그림 + 제목 슬라이드는 설명을 외부 자료에 기대야 하므로 검색
+        if title and images:
+            return True, "titled_image"
+        # 제목만 있는 슬라이드 = 구분 슬라이드
+        return False, "section_divider" if title else "too_short"
+    return True, "content"
+
+def is_section_divider(state: dict, idx: int) -> bool:
+    """
+    섹션 구분 슬라이드인지 (스크립트 문맥의 섹션 제목용, prompt['rag']와 무관)
+    - 섹션 제목 형식("Part 2", "1장" 등) + 짧은 부제, 또는 표/그림 없이 제목만 있는 중간 슬라이드
+    """
+    title, body, shape_texts, tables, images = _slide_parts(state, idx)
+    if not title or any(tables) or _compact(title) in SKIP_TITLES:
+        return False
+    body_chars = len(_compact(body)) + sum(len(_compact(t)) for t in shape_texts)
+    if SECTION_RE.match(title):
+        return body_chars < SECTION_MAX_BODY_CHARS
+    return idx > 0 and body_chars < MIN_BODY_CHARS and not images
+
+def new_search_stats() -> dict:
+    return {"searched": 0, "skipped": 0, "queries_skipped": 0, "reasons": {}}
+
+def count_decision(stats: dict, search: bool, reason: str, n_queries: int) -> None:
+    if search:
+        stats["searched"] += 1
+    else:
+        stats["skipped"] += 1
+        stats["queries_skipped"] += n_queries
+        stats["reasons"][reason] = stats["reasons"].get(reason, 0) + 1
+
+def format_search_stats(stats: dict) -> str:
+    reasons = ", ".join(f"{k} {v}" for k, v in sorted(stats["reasons"].items()))
+    return (
+        f"검색 {stats['searched']}장 / 건너뜀 {stats['skipped']}장 "
+        f"(질의 {stats['queries_skipped']}개 절약{': ' + reasons if reasons else ''})"
+    )
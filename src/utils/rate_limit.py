@@ -0,0 +1,64 @@
+import time
+import threading
+
+# 분당 요청 수 제한 (스레드 공유 토큰 버킷)
+# - 같은 이름(provider)의 limiter는 프로세스 안에서 하나만 만들어 모든 워커가 공유
+
+class RateLimiter:
+    def __init__(self, per_minute: float, burst: float | None = None):
+        self.per_minute = float(per_minute)
+        self.capacity = float(burst if burst is not None else max(1.0, self.per_minute / 60.0))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        rate = self.per_minute / 60.0
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """
+        amount만큼 토큰이 찰 때까지 대기 후 차감
+        - per_minute <= 0 이면 제한 없음
+        - 반환: 대기한 시간(초)
+        """
+        if self.per_minute <= 0:
+            return 0.0
+
+        # 한 번에 capacity보다 큰 요청(예: 토큰 예산)은 버킷이 가득 찰 때까지만 기다린 뒤
+        # 전체 amount를 차감 → 잔고가 음수가 되어 다음 요청들이 그만큼 더 기다림 (평균 속도 유지)
+        amount = float(amount)
+        need = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= need:
+                    self._tokens -= amount
+                    return waited
+                wait = (need - self._tokens) / (self.per_minute / 60.0)
+            time.sleep(wait)
+            waited += wait
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(name: str, per_minute: float) -> RateLimiter:
+    """
+    provider 이름별 공유 limiter
+    - 이미 있으면 per_minute만 갱신해서 재사용
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = RateLimiter(per_minute)
+            _limiters[name] = limiter
+        elif limiter.per_minute != float(per_minute):
+            with limiter._lock:
+                limiter._refill()
+                limiter.per_minute = float(per_minute)
+                limiter.capacity = max(1.0, limiter.per_minute / 60.0)
+                limiter._tokens = min(limiter._tokens, limiter.capacity)
+        return limiter
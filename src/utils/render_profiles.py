@@ -0,0 +1,76 @@
+# 정지 이미지 슬라이드 영상 인코딩 프로필
+# - final: 기존 품질 그대로 (1920x1080, ffmpeg 기본 fps/x264 설정, 192k 오디오)
+# - draft: 미리보기용 빠른 인코딩 (저 fps, stillimage 튜닝, 빠른 preset, 긴 GOP, 720p)
+
+DEFAULT_PROFILE = "final"
+
+RENDER_PROFILES = {
+    "final": {
+        "width": 1920,
+        "height": 1080,
+        "fps": None,          # ffmpeg 기본값 (이미지 loop 입력 25fps)
+        "preset": None,       # x264 기본값 (medium)
+        "tune": None,
+        "gop": None,
+        "crf": None,
+        "audio_bitrate": "192k",
+    },
+    "draft": {
+        "width": 1280,
+        "height": 720,
+        "fps": 2,             # 화면이 바뀌지 않으므로 초당 2프레임이면 충분
+        "preset": "veryfast",
+        "tune": "stillimage",
+        "gop": 600,           # 키프레임 간격 길게 (2fps 기준 5분)
+        "crf": 28,
+        "audio_bitrate": "96k",
+    },
+}
+
+def get_render_profile(name: str | None) -> dict:
+    """이름으로 프로필 조회 (없는 이름이면 final)"""
+    profile = RENDER_PROFILES.get((name or DEFAULT_PROFILE).lower())
+    if profile is None:
+        print(f"[경고] 알 수 없는 렌더 프로필 '{name}' → '{DEFAULT_PROFILE}' 사용")
+        profile = RENDER_PROFILES[DEFAULT_PROFILE]
+    return profile
+
+def video_filter(profile: dict) -> str:
+    # 비율 유지 + 검은 여백(pad)으로 프로필 해상도에 맞춤
+    w, h = profile["width"], profile["height"]
+    return (
+        f"scale={w}:{h}:force_original_aspect_ratio=decrease,"
+        f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2:color=black"
+    )
+
+def input_args(profile: dict) -> list[str]:
+    """이미지 입력 옵션 (fps가 정해진 프로필은 입력 단계부터 프레임 수를 줄임)"""
+    if profile.get("fps"):
+        return ["-framerate", str(profile["fps"])]
+    return []
+
+def encode_args(profile: dict, with_filter: bool = True) -> list[str]:
+    """
+    프로필에 맞는 ffmpeg 출력 인코딩 옵션 (-vf ~ -pix_fmt)
+    - with_filter=False: -vf / -r 제외 (filter_complex 안에서 직접 처리하는 경우)
+    """
+    args = []
+    if with_filter:
+        args += ["-vf", video_filter(profile)]
+        if profile.get("fps"):
+            args += ["-r", str(profile["fps"])]
+    args += ["-c:v", "libx264"]
+    if profile.get("preset"):
+        args += ["-preset", profile["preset"]]
+    if profile.get("tune"):
+        args += ["-tune", profile["tune"]]
+    if profile.get("gop"):
+        args += ["-g", str(profile["gop"])]
+    if profile.get("crf") is not None:
+        args += ["-crf", str(profile["crf"])]
+    args += [
+        "-c:a", "aac",
+        "-b:a", profile["audio_bitrate"],
+        "-pix_fmt", "yuv420p",
+    ]
+    return args
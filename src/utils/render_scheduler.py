@@ -0,0 +1,79 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable
+
+# 코어 수 기반 ffmpeg 렌더링 스케줄러
+# - libx264는 기본으로 모든 코어만큼 스레드를 만들기 때문에, 여러 클립을 동시에 인코딩하면
+#   (작업 수 × 코어 수) 스레드가 경쟁해서 오히려 느려짐
+# - 동시 작업 수를 코어 수에 맞추고, 작업마다 -threads를 나눠 줘서 전체 스레드 ≈ 코어 수로 유지
+# - 나머지 작업은 큐에서 대기
+
+# 작업 1개당 최소 스레드 수 (x264는 스레드 2개 이상일 때 효율이 좋음)
+MIN_THREADS_PER_JOB = 2
+
+def available_cores() -> int:
+    """이 프로세스가 쓸 수 있는 CPU 코어 수 (컨테이너 CPU affinity 반영)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def plan_render(n_jobs: int, cores: int | None = None, max_jobs: int | None = None) -> tuple[int, int]:
+    """
+    동시 작업 수와 작업당 스레드 수 계산
+    - 기본 동시 작업 수: 코어 수 / MIN_THREADS_PER_JOB (최소 1)
+    - max_jobs를 주면 그 이하로 제한
+    - 작업당 스레드 = 코어 수 / 동시 작업 수 → 전체 스레드 ≈ 코어 수
+    - 반환: (동시 작업 수, 작업당 스레드 수)
+    """
+    cores = max(1, int(cores or available_cores()))
+    workers = max(1, cores // MIN_THREADS_PER_JOB)
+    if max_jobs:
+        workers = min(workers, max(1, int(max_jobs)))
+    workers = max(1, min(workers, n_jobs))
+    threads = max(1, cores // workers)
+    return workers, threads
+
+def run_render_jobs(
+    items: Iterable[Any],
+    render_fn: Callable[[Any, int], tuple[Any, float]],
+    max_jobs: int | None = None,
+    cores: int | None = None,
+) -> tuple[dict[Any, Any], dict[str, float]]:
+    """
+    render_fn(item, threads) -> (결과, 인코딩한 영상 길이(초)) 를 스케줄링해서 실행
+    - ffmpeg 자체가 별도 프로세스이므로 스레드 풀은 프로세스 실행/대기만 담당
+    - 반환: ({item: 결과}, 통계)
+      통계의 throughput = 인코딩한 슬라이드 길이(초) / 실제 경과 시간(초)
+    """
+    items = list(items)
+    workers, threads = plan_render(len(items), cores=cores, max_jobs=max_jobs)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        outputs = list(ex.map(lambda item: render_fn(item, threads), items))
+    wall_sec = time.perf_counter() - t0
+
+    results = {}
+    media_sec = 0.0
+    for item, (result, seconds) in zip(items, outputs):
+        results[item] = result
+        media_sec += float(seconds or 0.0)
+
+    stats = {
+        "jobs": len(items),
+        "workers": workers,
+        "threads_per_job": threads,
+        "media_sec": media_sec,
+        "wall_sec": wall_sec,
+        "throughput": media_sec / wall_sec if wall_sec > 0 else 0.0,
+    }
+    return results, stats
+
+def format_render_stats(stats: dict[str, float]) -> str:
+    return (
+        f"작업 {stats['jobs']}개 (동시 {stats['workers']}개 × 스레드 {stats['threads_per_job']}개), "
+        f"슬라이드 {stats['media_sec']:.1f}초 / 실제 {stats['wall_sec']:.1f}초 "
+        f"→ 처리량 {stats['throughput']:.2f} 슬라이드초/초"
+    )
@@ -0,0 +1,127 @@
+from ..utils.utils import clean_text, split_sents
+from ..utils.llm_cache import estimate_tokens
+from ..utils.rag_policy import is_section_divider
+
+# 스크립트 프롬프트의 강의 문맥 구성 (슬라이드 수와 무관하게 크기가 제한된 문맥)
+# - 기존(full): 매 호출마다 전체 제목 목록 + 이전 스크립트 전체 → 덱 전체 프롬프트 토큰이 슬라이드 수의 제곱으로 증가
+# - window: 현재 위치 주변 목차 + 섹션 제목 + 최근 슬라이드 요약(rolling summary) + 이전 흐름 끝부분
+#   을 호출당 토큰 예산(prompt['context_tokens']) 안에서만 구성
+# - prompt['outline_context'] = "full"(기본, 기존 방식) / "window"(선택)
+
+CONTEXT_MODES = ("full", "window")
+DEFAULT_CONTEXT_TOKENS = 600   # 문맥 블록(목차 + 섹션 + 요약 + 이전 흐름) 호출당 최대 토큰
+OUTLINE_WINDOW = 3             # 현재 슬라이드 앞뒤로 보여줄 제목 수
+MAX_SECTIONS = 6               # 앞선 섹션 제목 최대 개수
+SUMMARY_SLIDES = 8             # rolling summary에 넣을 최근 슬라이드 수
+OUTLINE_SHARE = 0.35           # 예산 중 목차 창 몫 (나머지는 이전 흐름 → 섹션 → 요약 순)
+PREVIOUS_SHARE = 0.35          # 예산 중 이전 흐름 몫
+
+def context_mode(prompt: dict | None) -> str:
+    mode = str((prompt or {}).get("outline_context", "full")).lower()
+    return mode if mode in CONTEXT_MODES else "full"
+
+def slide_page_content(state: dict, idx: int) -> str:
+    """슬라이드 idx의 page_content (덱 단위 생성 결과 → 이번 실행 기록 → 재사용 기록 순)"""
+    planned = state.get("planned_page_content") or {}
+    if idx in planned:
+        return planned[idx] or ""
+    for records in (state.get("slide_records"), state.get("reuse_slides")):
+        rec = (records or {}).get(idx) or {}
+        if rec.get("page_content"):
+            return rec["page_content"]
+    return ""
+
+def _title(titles: list, idx: int) -> str:
+    title = clean_text(str(titles[idx])) if idx < len(titles) else ""
+    return title or f"슬라이드 {idx+1}"
+
+def _fit_lines(items: list[tuple[int, str]], budget: float) -> tuple[list[str], int]:
+    """
+    우선순위 순서의 (슬라이드 index, 줄) 목록에서 예산 안에 들어가는 줄만 선택
+    - 반환 줄은 슬라이드 순서로 정렬
+    """
+    picked, used = [], 0
+    for i, line in items:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        picked.append((i, line))
+        used += cost
+    return [line for _, line in sorted(picked)], used
+
+def _fit_tail(text: str, budget: float) -> tuple[str, int]:
+    """텍스트 끝부분 문장들을 예산 안에서 유지 (한 문장도 안 들어가면 글자 단위로 자름)"""
+    text = (text or "").strip()
+    if not text or estimate_tokens(text) <= budget:
+        return text, estimate_tokens(text)
+    kept: list[str] = []
+    used = 0
+    for sent in reversed(split_sents(text)):
+        cost = estimate_tokens(sent) + 1
+        if used + cost > budget:
+            break
+        kept.append(sent)
+        used += cost
+    if not kept:
+        tail = text[-max(int(budget), 0):]   # 한글 1글자 ≈ 0.75토큰 → budget 글자면 예산 이내
+        return tail, estimate_tokens(tail)
+    return " ".join(reversed(kept)), used
+
+def outline_lines(titles: list, idx: int, window: int = OUTLINE_WINDOW) -> list[tuple[int, str]]:
+    """현재 슬라이드 앞뒤 window장 제목 (가까운 순서 → 예산이 모자라면 먼 제목부터 빠짐)"""
+    total = len(titles)
+    order = [idx] + [i for d in range(1, window + 1) for i in (idx - d, idx + d) if 0 <= i < total]
+    return [
+        (i, f"▶ {i+1}. {_title(titles, i)} (현재)" if i == idx else f"- {i+1}. {_title(titles, i)}")
+        for i in order
+    ]
+
+def section_lines(state: dict, idx: int) -> list[tuple[int, str]]:
+    """섹션 제목 (현재 섹션 → 다음 섹션 → 더 앞선 섹션 순, 앞선 섹션은 최대 MAX_SECTIONS개)"""
+    titles = state.get("titles", [])
+    before = [i for i in range(idx) if is_section_divider(state, i)][-MAX_SECTIONS:]
+    after = next((i for i in range(idx + 1, len(titles)) if is_section_divider(state, i)), None)
+    items = [(i, f"- {i+1}. {_title(titles, i)}") for i in reversed(before)]
+    if after is not None:
+        items.insert(min(1, len(items)), (after, f"- {after+1}. {_title(titles, after)} (다음 섹션)"))
+    return items
+
+def summary_lines(state: dict, idx: int, n: int = SUMMARY_SLIDES) -> list[tuple[int, str]]:
+    """
+    rolling summary: 최근 슬라이드의 요약 첫 문장 (가까운 슬라이드부터)
+    - 바로 앞 슬라이드는 이전 흐름 블록에 들어가므로 제외
+    """
+    titles = state.get("titles", [])
+    items = []
+    for i in range(idx - 2, max(-1, idx - 2 - n), -1):
+        sents = split_sents(clean_text(slide_page_content(state, i)))
+        if sents:
+            items.append((i, f"- {i+1}. {_title(titles, i)}: {sents[0]}"))
+    return items
+
+def build_script_context(state: dict, idx: int, previous: str | None, budget: int | None = None) -> dict:
+    """
+    스크립트 프롬프트용 문맥 (window 모드)
+    - 반환: {"outline", "sections", "summary", "previous", "tokens", "budget"}
+      outline/sections/summary는 슬라이드 순서의 줄 목록, previous는 이전 흐름 끝부분
+    - 합계 토큰은 budget 이하 (목차 창 → 이전 흐름 → 섹션 → 요약 순으로 예산 배정)
+    """
+    prompt = state.get("prompt") or {}
+    budget = int(budget if budget is not None else prompt.get("context_tokens", DEFAULT_CONTEXT_TOKENS))
+    titles = state.get("titles", [])
+
+    outline, used_outline = _fit_lines(outline_lines(titles, idx), budget * OUTLINE_SHARE)
+    prev_text, used_prev = _fit_tail(previous or "", budget * PREVIOUS_SHARE)
+
+    remaining = budget - used_outline - used_prev
+    sections, used_sections = _fit_lines(section_lines(state, idx), remaining / 2)
+    summary, used_summary = _fit_lines(summary_lines(state, idx), remaining - used_sections)
+
+    return {
+        "outline": outline,
+        "sections": sections,
+        "summary": summary,
+        "previous": prev_text,
+        "tokens": used_outline + used_prev + used_sections + used_summary,
+        "budget": budget,
+    }
@@ -1,5 +1,10 @@
+import os
 import re
+import json
 from difflib import SequenceMatcher
+from functools import lru_cache
+
+import numpy as np
 
 # 점수 계산하여 유사도가 높은 것으로 검색
 # 도메인 신뢰도 테이블
@@ -19,6 +24,83 @@ DOMAIN_TRUST = {
     "tech.ebay.com": 0.85,
 }
 
+# 도메인 신뢰도 목록 파일 (선택, 기본값 위에 덮어씀)
+# - .json: {"domain": score, ...}
+# - 그 외: 한 줄에 "domain score" 또는 "domain,score" (# 주석 가능)
+DOMAIN_TRUST_PATH_ENV = "DOMAIN_TRUST_PATH"
+
+class DomainTrustIndex:
+    """
+    레이블 역순 suffix trie (com → microsoft → learn)
+    - 조회는 도메인 레이블 수만큼만 내려감 (O(labels)), 항목 수와 무관
+    - 레이블 경계 단위로만 일치 → "microsoft.com"은 "learn.microsoft.com"과 일치,
+      "notmicrosoft.com" / "microsoft.com.evil" 과는 불일치
+    - 여러 항목이 일치하면 가장 구체적인(긴) 항목 점수 사용
+    """
+    _SCORE = "\0"  # 노드에 점수를 저장하는 키 (레이블로 쓰일 수 없는 문자)
+
+    def __init__(self, table: dict[str, float] | None = None):
+        self._root: dict = {}
+        self.size = 0
+        for domain, score in (table or {}).items():
+            self.add(domain, score)
+
+    @staticmethod
+    def _labels(domain: str) -> list[str]:
+        domain = (domain or "").strip().lower()
+        domain = domain.rsplit("@", 1)[-1].split(":", 1)[0].strip(".")  # user@, :port 제거
+        return [label for label in reversed(domain.split(".")) if label]
+
+    def add(self, domain: str, score: float) -> None:
+        labels = self._labels(domain)
+        if not labels:
+            return
+        node = self._root
+        for label in labels:
+            node = node.setdefault(label, {})
+        if self._SCORE not in node:
+            self.size += 1
+        node[self._SCORE] = float(score)
+
+    def lookup(self, domain: str) -> float | None:
+        node = self._root
+        found = None
+        for label in self._labels(domain):
+            node = node.get(label)
+            if node is None:
+                break
+            found = node.get(self._SCORE, found)
+        return found
+
+def load_domain_trust(path: str) -> dict[str, float]:
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            return {k: float(v) for k, v in json.load(f).items()}
+        table = {}
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            parts = re.split(r"[,\s]+", line)
+            if len(parts) >= 2:
+                table[parts[0]] = float(parts[1])
+        return table
+
+@lru_cache(maxsize=None)
+def get_domain_trust_index(path: str | None = None) -> DomainTrustIndex:
+    """
+    기본 DOMAIN_TRUST + 목록 파일(path 또는 환경변수 DOMAIN_TRUST_PATH)로 만든 인덱스
+    - 경로별로 한 번만 만들어 재사용
+    """
+    table = dict(DOMAIN_TRUST)
+    path = path or os.getenv(DOMAIN_TRUST_PATH_ENV)
+    if path:
+        try:
+            table.update(load_domain_trust(path))
+        except (OSError, ValueError) as e:
+            print(f"[경고] 도메인 신뢰도 목록 읽기 실패({path}): {e} → 기본값만 사용")
+    return DomainTrustIndex(table)
+
 def _norm_text(s: str) -> str:
     s = (s or "").lower()
     s = re.sub(r"[^가-힣a-z0-9\s]", " ", s)
@@ -49,13 +131,14 @@ def similarity_score(query: str, snippet: str) -> float:
 def domain_score(domain: str) -> float:
     """
     출처(domain) 신뢰도 점수 [0,1]
-    - DOMAIN_TRUST에 있으면 높은 점수
+    - 신뢰도 목록(DOMAIN_TRUST + DOMAIN_TRUST_PATH 파일)에 있으면 해당 점수
+      (레이블 경계 기준 suffix 일치, 가장 구체적인 항목 우선)
     - 없으면 기본 0.5에서 도메인 길이에 따라 살짝 조정 (예시)
     """
     domain = (domain or "").lower()
-    for key, score in DOMAIN_TRUST.items():
-        if key in domain:
-            return score
+    score = get_domain_trust_index().lookup(domain)
+    if score is not None:
+        return score
 
     if not domain:
         return 0.4
@@ -75,3 +158,97 @@ def content_score(snippet: str, max_len: int = 400) -> float:
         return 0.0
     n = len(snippet)
     return max(0.1, min(n / max_len, 1.0))  # 너무 짧으면 최소 0.1
+
+# ---------------- 배치 점수 계산 ----------------
+# 질의 1개 + 후보 여러 개를 한 번에 점수화 (후보 수백 개도 가볍게)
+# - 유사도 = (질의 토큰 포함 비율 + 문자 n-gram Dice 계수) / 2
+#   (단건 similarity_score의 SequenceMatcher 대신 n-gram 집합 비교 → 길이 제곱 비용 없음)
+# - 모든 후보의 문자를 코드포인트 배열 하나로 이어 붙이고, n-gram을 정수 코드로 만들어
+#   (후보, n-gram) 중복 제거 → 질의 n-gram 포함 여부 → 후보별 집계를 numpy로 한 번에 처리
+
+# 최종 점수 가중치 (similarity: 질의 관련도, domain: 출처 신뢰도, content: 내용 충실도)
+DEFAULT_WEIGHTS = {"similarity": 0.5, "domain": 0.3, "content": 0.2}
+NGRAM_SIZE = 3
+_CODE_BITS = 21  # 유니코드 코드포인트 최대 비트 수 (3-gram → 63비트 정수)
+
+def _codepoints(text: str) -> np.ndarray:
+    return np.frombuffer(text.replace(" ", "").encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+
+def _gram_codes(chars: np.ndarray, n: int = NGRAM_SIZE) -> np.ndarray:
+    """코드포인트 배열의 연속 n글자 → 정수 코드 (길이 len - n + 1)"""
+    codes = np.zeros(len(chars) - n + 1, dtype=np.int64)
+    for k in range(n):
+        codes = (codes << _CODE_BITS) | chars[k:len(chars) - n + 1 + k]
+    return codes
+
+def batch_similarity(query: str, snippets: list[str]) -> np.ndarray:
+    """질의 1개와 snippet 여러 개의 유사도 [0,1] (토큰 포함 비율 + 문자 n-gram Dice 평균)"""
+    q = _norm_text(query)
+    texts = [_norm_text(s) for s in snippets]
+    n = len(texts)
+    if not q or not n:
+        return np.zeros(n)
+
+    # 1) 질의 토큰 포함 비율
+    q_tokens = set(q.split())
+    overlap = np.array([len(q_tokens & set(t.split())) for t in texts], dtype=float) / len(q_tokens)
+
+    # 2) 문자 n-gram Dice 계수
+    # - 질의가 NGRAM_SIZE보다 짧으면("개요", "AI") 질의 길이만큼의 n-gram(bigram/unigram)으로 비교
+    q_chars = _codepoints(q)
+    gram_n = min(NGRAM_SIZE, len(q_chars))
+    q_grams = np.unique(_gram_codes(q_chars, gram_n)) if gram_n else np.zeros(0, dtype=np.int64)
+
+    chars_list = [_codepoints(t) for t in texts]
+    lengths = np.array([len(c) for c in chars_list])
+    chars = np.concatenate(chars_list)
+    rows = np.repeat(np.arange(n), lengths)
+
+    dice = np.zeros(n)
+    if gram_n and len(chars) >= gram_n and len(q_grams):
+        grams = _gram_codes(chars, gram_n)
+        # 후보 경계를 넘는 n-gram 제외
+        valid = rows[:len(grams)] == rows[gram_n - 1:]
+        grams, g_rows = grams[valid], rows[:len(grams)][valid]
+
+        # (후보, n-gram) 중복 제거 → 후보별 n-gram 집합
+        order = np.lexsort((grams, g_rows))
+        grams, g_rows = grams[order], g_rows[order]
+        first = np.ones(len(grams), dtype=bool)
+        first[1:] = (grams[1:] != grams[:-1]) | (g_rows[1:] != g_rows[:-1])
+        grams, g_rows = grams[first], g_rows[first]
+
+        hits = np.bincount(g_rows, weights=np.isin(grams, q_grams), minlength=n)
+        sizes = np.bincount(g_rows, minlength=n)
+        denom = len(q_grams) + sizes
+        dice = np.divide(2.0 * hits, denom, out=np.zeros(n), where=denom > 0)
+
+    empty = np.array([not t for t in texts])
+    return np.where(empty, 0.0, (overlap + dice) / 2.0)
+
+def batch_content(snippets: list[str], max_len: int = 400) -> np.ndarray:
+    """content_score의 배치 버전"""
+    lengths = np.array([len(s or "") for s in snippets], dtype=float)
+    return np.where(lengths > 0, np.clip(lengths / max_len, 0.1, 1.0), 0.0)
+
+def score_batch(query: str, snippets: list[str], domains: list[str], weights: dict | None = None) -> list[dict]:
+    """
+    후보 전체 점수 계산
+    - weights: DEFAULT_WEIGHTS 중 바꿀 항목만 넘겨도 됨
+    - 반환: 후보별 {"score", "similarity", "domain", "content"}
+    """
+    w = {**DEFAULT_WEIGHTS, **(weights or {})}
+    sim = batch_similarity(query, snippets)
+    dom = np.array([domain_score(d) for d in domains], dtype=float)
+    cont = batch_content(snippets)
+    total = w["similarity"] * sim + w["domain"] * dom + w["content"] * cont
+
+    return [
+        {
+            "score": float(total[i]),
+            "similarity": float(sim[i]),
+            "domain": float(dom[i]),
+            "content": float(cont[i]),
+        }
+        for i in range(len(snippets))
+    ]
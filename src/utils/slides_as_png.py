@@ -1,82 +1,175 @@
 import os
+import re
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import src.utils.state as State
 
-def export_slide_as_png(state: State, dpi: int = 220) -> dict:
-    work_dir = Path(state["work_dir"]).expanduser().resolve()
-    work_dir.mkdir(parents=True, exist_ok=True)
-
-    pptx = Path(state["pptx_path"]).expanduser().resolve()
-    if not pptx.exists():
-        raise FileNotFoundError(f"PPTX 없음: {pptx}")
-
-    idx = int(state.get("slide_index", 0))  # 0-based
-    page_no = idx + 1
-    out_prefix = work_dir / "slide_img"
-
+def _lo_env() -> dict:
     env = os.environ.copy()
     env.update({
         "LANG": "ko_KR.UTF-8",
         "LC_ALL": "ko_KR.UTF-8",
     })
+    return env
+
+def convert_pptx_to_pdf(pptx: Path, out_dir: Path) -> Path:
+    """
+    PPTX → PDF 변환 (LibreOffice 1회 실행)
+    - 덱 전체를 한 번만 변환하고 PDF 경로를 반환
+    """
+    soffice_bin = shutil.which("soffice") or shutil.which("libreoffice")
+    print("[DEBUG] soffice_bin:", soffice_bin)
 
-    # --- PPT → PDF (한 번만 변환) ---
-    pdf_path = work_dir / f"{pptx.stem}.pdf"
-    if not pdf_path.exists():
-        soffice_bin = shutil.which("soffice") or shutil.which("libreoffice")
-        print("[DEBUG] soffice_bin:", soffice_bin)
-
-        if not soffice_bin:
-            raise RuntimeError(
-                "LibreOffice 'soffice' 실행 파일을 찾을 수 없습니다.\n"
-                "런타임이 초기화되었거나 LibreOffice가 설치되지 않았습니다.\n"
-                "예) apt-get install -y libreoffice-impress poppler-utils"
-            )
-
-        lo_cmd = [
-            soffice_bin,
-            "--headless",
-            "-env:UserInstallation=file:///tmp/lo_profile",
-            "--convert-to","pdf:impress_pdf_Export",
-            "--outdir", str(work_dir),
-            str(pptx),
-        ]
-        print("[DEBUG] lo_cmd:", lo_cmd)
-
-        res_pdf = subprocess.run(lo_cmd, capture_output=True, text=True, env=env)
-        if res_pdf.returncode != 0:
-            print("LibreOffice 변환 실패")
-            print("stdout:", res_pdf.stdout)
-            print("stderr:", res_pdf.stderr)
-            raise RuntimeError("PPTX → PDF 변환 실패")
-
-    # --- PDF → PNG (슬라이드별 추출) ---
-    png_path = work_dir / f"{out_prefix.stem}-{page_no}.png"
+    if not soffice_bin:
+        raise RuntimeError(
+            "LibreOffice 'soffice' 실행 파일을 찾을 수 없습니다.\n"
+            "런타임이 초기화되었거나 LibreOffice가 설치되지 않았습니다.\n"
+            "예) apt-get install -y libreoffice-impress poppler-utils"
+        )
+
+    lo_cmd = [
+        soffice_bin,
+        "--headless",
+        "-env:UserInstallation=file:///tmp/lo_profile",
+        "--convert-to","pdf:impress_pdf_Export",
+        "--outdir", str(out_dir),
+        str(pptx),
+    ]
+    print("[DEBUG] lo_cmd:", lo_cmd)
+
+    res_pdf = subprocess.run(lo_cmd, capture_output=True, text=True, env=_lo_env())
+    pdf_path = out_dir / f"{pptx.stem}.pdf"
+    if res_pdf.returncode != 0 or not pdf_path.exists():
+        print("LibreOffice 변환 실패")
+        print("stdout:", res_pdf.stdout)
+        print("stderr:", res_pdf.stderr)
+        raise RuntimeError("PPTX → PDF 변환 실패")
+
+    return pdf_path
+
+def _pdf_page_count(pdf_path: Path) -> int:
+    # pdfinfo(poppler)로 페이지 수 확인, 실패하면 0
+    try:
+        out = subprocess.check_output(["pdfinfo", str(pdf_path)], env=_lo_env()).decode(errors="ignore")
+    except Exception:
+        return 0
+    m = re.search(r"^Pages:\s+(\d+)", out, re.MULTILINE)
+    return int(m.group(1)) if m else 0
+
+def _render_page_range(pdf_path: Path, out_prefix: Path, first: int, last: int, dpi: int) -> None:
     ppm_cmd = [
         "pdftoppm",
-        "-f", str(page_no),
-        "-l", str(page_no),
+        "-f", str(first),
+        "-l", str(last),
         "-png", "-r", str(dpi),
         str(pdf_path),
         str(out_prefix)
     ]
-    res2 = subprocess.run(ppm_cmd, capture_output=True, text=True, env=env)
-    if res2.returncode != 0:
-        print("pdftoppm 변환 실패:", res2.stderr)
+    res = subprocess.run(ppm_cmd, capture_output=True, text=True, env=_lo_env())
+    if res.returncode != 0:
+        print(f"pdftoppm 변환 실패 ({first}~{last}):", res.stderr)
 
-    if not png_path.exists():
-        raise FileNotFoundError(f"슬라이드 {page_no} PNG 변환 실패")
+def export_deck_as_png(
+    pptx_path: str,
+    out_dir: str,
+    dpi: int = 220,
+    page_count: int | None = None,
+    jobs: int | None = None,
+    pages: list[int] | None = None,
+) -> list[str]:
+    """
+    덱 전체를 한 번에 PNG로 변환.
+    - PPTX → PDF 변환은 1회만 수행
+    - pdftoppm을 페이지 구간별로 나눠 코어 수만큼 병렬 실행
+    - pages(1-based)를 주면 해당 페이지만 렌더링 (캐시에 없는 슬라이드만 변환할 때)
+    - 반환: 슬라이드 순서대로 PNG 경로 리스트 (slide_{n}.png, 렌더링하지 않았거나 실패한 페이지는 "")
+    """
+    out_dir = Path(out_dir).expanduser().resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    pptx = Path(pptx_path).expanduser().resolve()
+    if not pptx.exists():
+        raise FileNotFoundError(f"PPTX 없음: {pptx}")
+
+    # --- PPT → PDF (덱 전체 1회) ---
+    pdf_path = convert_pptx_to_pdf(pptx, out_dir)
 
-    # --- 변환 후 PDF 삭제 ---
     try:
-        if pdf_path.exists():
-            os.remove(pdf_path)
-            # print(f"PDF 삭제 완료: {pdf_path.name}")
-    except Exception as e:
-        print(f"[경고] PDF 삭제 실패: {e}")
+        pages_total = _pdf_page_count(pdf_path) or int(page_count or 0)
+        if pages_total <= 0:
+            raise RuntimeError("PDF 페이지 수를 확인할 수 없습니다.")
+
+        # --- PDF → PNG (페이지 구간을 코어 수만큼 분할) ---
+        wanted = sorted({p for p in (pages or range(1, pages_total + 1)) if 1 <= p <= pages_total})
+        if not wanted:
+            return [""] * pages_total
+
+        jobs = max(1, min(int(jobs or os.cpu_count() or 1), len(wanted)))
+        per_job = -(-len(wanted) // jobs)  # ceil
+        ranges = []
+        for i in range(0, len(wanted), per_job):
+            chunk = wanted[i:i + per_job]
+            # 연속된 페이지끼리만 하나의 구간으로 묶음
+            first = prev = chunk[0]
+            for p in chunk[1:]:
+                if p != prev + 1:
+                    ranges.append((first, prev))
+                    first = p
+                prev = p
+            ranges.append((first, prev))
+
+        tmp_prefix = out_dir / "slide_img"
+        with ThreadPoolExecutor(max_workers=len(ranges)) as ex:
+            futures = [
+                ex.submit(_render_page_range, pdf_path, tmp_prefix, first, last, dpi)
+                for first, last in ranges
+            ]
+            for f in futures:
+                f.result()
+
+        # pdftoppm은 전체 페이지 수에 맞춰 번호를 0으로 채움 (slide_img-01.png 등)
+        # → 파일명에서 페이지 번호를 읽어 slide_{n}.png로 정리
+        png_paths = [""] * pages_total
+        for src in out_dir.glob(f"{tmp_prefix.name}-*.png"):
+            m = re.search(r"-(\d+)\.png$", src.name)
+            if not m:
+                continue
+            page_no = int(m.group(1))
+            if not 1 <= page_no <= pages_total:
+                continue
+            dst = out_dir / f"slide_{page_no}.png"
+            os.replace(src, dst)
+            png_paths[page_no - 1] = str(dst)
+
+        missing = [p for p in wanted if not png_paths[p - 1]]
+        if missing:
+            print(f"[경고] PNG 변환 실패 슬라이드: {missing}")
+
+        print(f"[완료] 슬라이드 PNG {len(wanted) - len(missing)}/{len(wanted)}장 생성 ({len(ranges)}개 작업)")
+        return png_paths
+
+    finally:
+        # --- 변환 후 PDF 삭제 ---
+        try:
+            if pdf_path.exists():
+                os.remove(pdf_path)
+        except Exception as e:
+            print(f"[경고] PDF 삭제 실패: {e}")
+
+def export_slide_as_png(state: State, dpi: int = 220) -> dict:
+    """
+    단일 슬라이드 PNG 변환 (하위 호환용)
+    - 내부적으로 export_deck_as_png를 사용하므로, 여러 장이 필요하면 덱 API를 직접 쓸 것
+    """
+    idx = int(state.get("slide_index", 0))  # 0-based
+    page_no = idx + 1
+
+    png_paths = export_deck_as_png(state["pptx_path"], state["work_dir"], dpi=dpi, pages=[page_no])
+    if idx >= len(png_paths) or not png_paths[idx]:
+        raise FileNotFoundError(f"슬라이드 {page_no} PNG 변환 실패")
 
     # --- 최종 PNG 경로 반환 ---
-    state["slide_image"] = str(png_path)
-    return state
\ No newline at end of file
+    state["slide_image"] = png_paths[idx]
+    return state
@@ -8,6 +8,10 @@ class State(TypedDict, total=False): # total=False는 TypedDict에서 모든 키
     slide_index: int
     slides: List[Dict[str, Any]]
     total_slides: int
+    slide_hashes: List[str] # 슬라이드 내용 해시 (캐시 키)
+    prev_manifest: Dict[str, Any] # 이전 실행 manifest (증분 재생성)
+    reuse_slides: Dict[int, Dict[str, Any]] # 재사용할 슬라이드 index -> 이전 산출물
+    slide_records: Dict[int, Dict[str, Any]] # 슬라이드별 산출물 기록 (manifest 저장용)
 
     # 추출 산출물
     titles: List[str]
@@ -16,19 +20,30 @@ class State(TypedDict, total=False): # total=False는 TypedDict에서 모든 키
     images: List[str]
     slide_image: List[str]
     external_content: Dict[str, List[Dict[str, str]]] # (외부 지식)
+    planned_external: Dict[int, Dict[str, Any]] # 덱 전체 검색 계획 결과 (slide index -> external_content)
+    search_stats: Dict[str, Any] # 외부 검색 실행/생략 집계 (생략 사유별 개수)
+    docs_signature: str # 로컬 검색 문서 폴더 상태 키 (실행당 한 번 계산)
     slide_image: List[str]
     shape_texts: List[List[str]]
     links: List[List[str]]
 
     # 생성 산출물
     page_content: str
+    planned_page_content: Dict[int, str] # 덱 전체 동시 생성한 page_content (slide index -> page_content)
     script: str
+    planned_scripts: Dict[int, str] # outline 흐름에서 덱 전체 동시 생성한 스크립트 (slide index -> script)
     all_scripts: List[str] # 퀴즈 노드를 위해 스크립트 저장
     quiz_set: List[Dict[str, Any]] # 퀴즈 노드가 생성한 퀴즈 -> 수정: List[Dict[str, Any]]
 
     # 미디어 산출물
     audio: str
+    audio_paths: List[str]
+    audio_meta: Dict[int, Dict[str, Any]] # slide index -> {path, duration}
     video_path: List[str] # 변경 : str -> List[str]
+    video_duration: float # 이번 슬라이드에서 실제 인코딩한 영상 길이(초)
+    ffmpeg_threads: int # 렌더 스케줄러가 지정한 ffmpeg 인코더 스레드 수
+    render_stats: Dict[str, float] # 렌더링 처리량 통계 (슬라이드초/초)
 
     video_paths: List[str] # 생성된 영상 path 리스트
-    final_video: str # 최종 합쳐진 영상 path
\ No newline at end of file
+    final_video: str # 최종 합쳐진 영상 path
+    failed_slides: List[int] # 영상 생성에 실패한 slide index
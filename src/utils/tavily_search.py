@@ -1,42 +1,117 @@
 import os
+import re
+import threading
+from typing import Callable
 from urllib.parse import urlparse
-from tavily import TavilyClient
 from langchain_community.tools.tavily_search import TavilySearchResults
 
-from ..utils.search_score import domain_score 
-from ..utils.search_score import similarity_score
-from ..utils.search_score import content_score
-
-# tavily로 검색 진행
-def tavily_search(title: str, num: int = 4) -> list[dict]:
-    key = os.getenv("TAVILY_API_KEY")
-    tavily_client = TavilyClient(api_key=key)
-
-    # 제외할 도메인 리스트 -> 신뢰성이 떨어지는 리스트
-    EXCLUDE_DOMAINS = [
-        "blog.naver.com", "m.blog.naver.com", "tistory.com",
-        "brunch.co.kr", "medium.com", "velog.io",
-        "kin.naver.com", "reddit.com", "youtube.com"
-    ]
+from ..utils.search_score import score_batch
+from ..utils.query_cache import QueryCache, DEFAULT_CACHE_DIR
+from ..utils.artifact_cache import make_key
+from ..utils.rate_limit import get_rate_limiter
+
+# 제외할 도메인 리스트 -> 신뢰성이 떨어지는 리스트
+EXCLUDE_DOMAINS = [
+    "blog.naver.com", "m.blog.naver.com", "tistory.com",
+    "brunch.co.kr", "medium.com", "velog.io",
+    "kin.naver.com", "reddit.com", "youtube.com"
+]
+
+# Tavily 분당 요청 수 제한 (모든 슬라이드/질의 스레드가 공유, 계정 플랜에 맞게 조정)
+TAVILY_RPM = float(os.getenv("TAVILY_RPM", "100"))
+
+# 검색 도구는 결과 개수별로 한 번만 만들어 재사용 (매 호출마다 클라이언트 생성 X)
+_search_tools: dict[int, TavilySearchResults] = {}
+_search_tools_lock = threading.Lock()
+
+def _get_search_tool(candidate_k: int) -> TavilySearchResults:
+    with _search_tools_lock:
+        tool = _search_tools.get(candidate_k)
+        if tool is None:
+            tool = TavilySearchResults(
+                max_results=candidate_k,
+                search_depth="basic",
+                topic="general",
+                exclude_domains=EXCLUDE_DOMAINS,
+                include_answer=False,
+                include_raw_content=False,
+            )
+            _search_tools[candidate_k] = tool
+        return tool
+
+# ---------- 검색 결과 영속 캐시 (작업/덱 공유) ----------
+# - TAVILY_CACHE=0 이면 사용 안 함
+# - TAVILY_CACHE_PATH: SQLite 파일 경로 (기본 ~/.cache/ai_lecture/tavily.sqlite3)
+# - TAVILY_CACHE_TTL_HOURS: 유효 시간 (기본 168시간 = 7일)
+# - TAVILY_CACHE_MAX_ENTRIES: 최대 질의 수 (기본 20000)
+_search_cache: QueryCache | None = None
+_search_cache_lock = threading.Lock()
+
+def search_cache_ttl_sec() -> float:
+    return float(os.getenv("TAVILY_CACHE_TTL_HOURS", "168")) * 3600
+
+def get_search_cache() -> QueryCache | None:
+    global _search_cache
+    if os.getenv("TAVILY_CACHE", "1") == "0":
+        return None
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = QueryCache(
+                os.getenv("TAVILY_CACHE_PATH", os.path.join(DEFAULT_CACHE_DIR, "tavily.sqlite3")),
+                ttl_sec=search_cache_ttl_sec(),
+                max_entries=int(os.getenv("TAVILY_CACHE_MAX_ENTRIES", "20000")),
+            )
+        return _search_cache
+
+def search_cache_stats() -> dict[str, int]:
+    """검색 캐시 hit/miss/저장 개수 (캐시를 쓰지 않으면 빈 dict)"""
+    cache = get_search_cache()
+    return cache.stats() if cache else {}
+
+def normalize_query(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "").lower()).strip()
+
+def _search_raw(title: str, candidate_k: int, on_start: Callable[[], None] | None = None) -> list[dict]:
+    """
+    Tavily 원본 검색 결과 (점수 계산 전)
+    - 캐시 키: 정규화한 질의 + 제외 도메인 + 결과 개수
+    - on_start: 캐시 hit이면 바로, 아니면 rate limiter 대기가 끝나고 요청하기 직전에 호출
+    """
+    cache = get_search_cache()
+    cache_key = make_key(normalize_query(title), sorted(EXCLUDE_DOMAINS), candidate_k)
+    if cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            print(f"[검색 캐시] hit → {title}")
+            if on_start:
+                on_start()
+            return cached
 
     # Tavily에 보낼 실제 쿼리 (제외 도메인까지 포함)
     query = f"{title} " + " ".join([f"-site:{d}" for d in EXCLUDE_DOMAINS])
 
+    get_rate_limiter("tavily", TAVILY_RPM).acquire()
+    if on_start:
+        on_start()
+    data = _get_search_tool(candidate_k).invoke(query) or []
+    # 오류 문자열 등 리스트가 아닌 응답은 저장하지 않음
+    if cache and isinstance(data, list):
+        cache.put(cache_key, data)
+    return data
+
+# tavily로 검색 진행
+def tavily_search(title: str, num: int = 4, weights: dict | None = None,
+                  on_start: Callable[[], None] | None = None) -> list[dict]:
+    """
+    - weights: 최종 점수 가중치 (기본 search_score.DEFAULT_WEIGHTS = 유사도 0.5 / 도메인 0.3 / 내용 0.2)
+    - on_start: 실제 요청 직전(rate limiter 대기 후)에 호출되는 콜백 (질의별 시간 제한 측정용)
+    """
     # 후보 개수를 num보다 넉넉하게 받아서 그 중 Top-N만 필터링
     candidate_k = max(num * 3, num + 2)
 
-    res_tool = TavilySearchResults(
-        max_results=candidate_k,
-        search_depth="basic",
-        topic="general",
-        exclude_domains=EXCLUDE_DOMAINS,
-        include_answer=False,
-        include_raw_content=False,
-    )
-
-    data = res_tool.invoke(query) or []
+    data = _search_raw(title, candidate_k, on_start)
 
-    results: list[dict] = []
+    candidates: list[dict] = []
     seen_urls: set[str] = set()
 
     for item in data:
@@ -55,36 +130,31 @@ def tavily_search(title: str, num: int = 4) -> list[dict]:
             continue
         seen_urls.add(url)
 
-        title_res   = item.get("title", "") or ""
-        snippet_res = item.get("content", "") or ""
-
-        # 1) 유사도 점수
-        s_sim = similarity_score(title, snippet_res)
-
-        # 2) 도메인 신뢰도 점수
-        s_dom = domain_score(domain)
-
-        # 3) 내용 충실도 점수
-        s_cont = content_score(snippet_res)
+        candidates.append({
+            "title": item.get("title", "") or "",
+            "url": url,
+            "snippet": item.get("content", "") or "",
+            "domain": domain,
+        })
 
-        # 4) 최종 점수 (가중 평균)
-        # → 필요에 따라 가중치 조정 (기업용이면 정확도/도메인 비중↑)
-        score = (
-            0.5 * s_sim + # 질의와 얼마나 관련 있는지
-            0.3 * s_dom + # 출처 신뢰도
-            0.2 * s_cont  # 내용 충실도
-        )
+    # 유사도 / 도메인 신뢰도 / 내용 충실도 점수를 후보 전체에 대해 한 번에 계산
+    # → 가중치는 weights로 조정 (기업용이면 정확도/도메인 비중↑)
+    scores = score_batch(
+        title,
+        [c["snippet"] for c in candidates],
+        [c["domain"] for c in candidates],
+        weights=weights,
+    )
 
+    results: list[dict] = []
+    for c, s in zip(candidates, scores):
         results.append({
-            "title": title_res,
-            "url": url,
-            "snippet": snippet_res,
-            "domain": domain,
-            "score":round(score, 4),  # 보기 좋게 반올림
+            **c,
+            "score": round(s["score"], 4),  # 보기 좋게 반올림
             "score_detail": {
-                "similarity": round(s_sim, 4),
-                "domain": round(s_dom, 4),
-                "content": round(s_cont, 4),
+                "similarity": round(s["similarity"], 4),
+                "domain": round(s["domain"], 4),
+                "content": round(s["content"], 4),
             },
         })
 
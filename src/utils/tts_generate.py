@@ -1,17 +1,146 @@
 import os
 import subprocess
 import shutil
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 from openai import OpenAI
 from langchain_core.runnables import RunnableLambda
 from dotenv import load_dotenv
 
-from ..utils.utils import ffprobe_duration
+from ..utils.media_info import media_duration
+from ..utils.rate_limit import get_rate_limiter
+from ..utils.artifact_cache import ArtifactCache, make_key
 
 load_dotenv()
 
 TTS_MODEL = os.getenv("TTS_MODEL")
+TTS_RPM = float(os.getenv("TTS_RPM", "500"))  # OpenAI TTS 분당 요청 수 제한 (계정 tier에 맞게 조정)
+TTS_WORKERS = 8
+TTS_CACHE_STAGE = "tts"
 # TTS_MODEL = "gpt-4o-mini-tts"
 client = OpenAI()
+STREAM_CHUNK_BYTES = 32 * 1024
+
+def _atempo_cmd(src: str, dst: str, tempo: float) -> list[str]:
+    return [
+        "ffmpeg",
+        "-y",
+        "-loglevel", "error",
+        "-f", "mp3",
+        "-i", src,
+        "-filter:a", f"atempo={tempo}",
+        dst,
+    ]
+
+def _write_chunks(response, f) -> None:
+    iter_bytes = getattr(response, "iter_bytes", None)
+    if callable(iter_bytes):
+        for chunk in iter_bytes(STREAM_CHUNK_BYTES):
+            f.write(chunk)
+        return
+    # 구버전 SDK: .to_bytes() / .read() 둘 다 케이스 있음
+    data = getattr(response, "to_bytes", None)
+    f.write(data() if callable(data) else response.read())
+
+class _BufferedPipe:
+    """
+    청크를 ffmpeg stdin으로 흘려보내면서 메모리에도 보관 (디스크에는 쓰지 않음)
+    - ffmpeg가 먼저 종료되면(BrokenPipe) 메모리에만 계속 모음 → 파이프 변환이 실패해도 API를 다시 호출하지 않음
+    """
+    def __init__(self, pipe):
+        self.pipe = pipe
+        self.data = bytearray()
+
+    def write(self, chunk: bytes) -> None:
+        self.data += chunk
+        if self.pipe is None:
+            return
+        try:
+            self.pipe.write(chunk)
+        except (BrokenPipeError, OSError):
+            self.pipe = None
+
+class TempoError(RuntimeError):
+    """ffmpeg 속도 변환 실패 (음성은 정상 생성됨 → 다른 보이스로 재시도하지 않음)"""
+
+def _run_atempo(src: str, out_path: str, tempo: float, data: bytes | None = None) -> None:
+    """ffmpeg atempo 변환 (data가 있으면 stdin으로 전달), 실패하면 ffmpeg stderr와 함께 예외"""
+    result = subprocess.run(
+        _atempo_cmd(src, out_path, tempo),
+        input=data,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    if result.returncode != 0:
+        raise TempoError(f"ffmpeg 속도 변환 실패: {result.stderr.decode(errors='replace').strip()}")
+
+def _stream_speech(
+    voice: str,
+    script: str,
+    out_path: str,
+    tempo: float | None = None,
+    pipe_tempo: bool = True,
+) -> None:
+    """
+    OpenAI TTS 응답을 청크 단위로 바로 기록.
+    - tempo 없음: 청크를 out_path(mp3)에 바로 씀
+    - tempo + pipe_tempo: 청크를 ffmpeg stdin으로 흘려 atempo 적용 결과를 out_path에 저장
+      (중간 raw 파일 없음, 받은 청크는 메모리에 보관 → 파이프 변환이 실패하면 그 데이터로 다시 변환, API 재호출 없음)
+    - tempo + pipe_tempo=False: 임시 raw 파일에 받은 뒤 ffmpeg로 변환
+    - 속도 변환이 실패하면 TempoError (ffmpeg stderr 포함)
+    """
+    streaming = getattr(client.audio.speech, "with_streaming_response", None)
+    request = dict(model=TTS_MODEL, voice=voice, input=script, response_format="mp3")
+
+    def open_response():
+        if streaming is not None:
+            return streaming.create(**request)
+        return contextlib.nullcontext(client.audio.speech.create(**request))
+
+    if tempo is None:
+        with open_response() as response, open(out_path, "wb") as f:
+            _write_chunks(response, f)
+        return
+
+    if pipe_tempo:
+        print(f"[FFmpeg] {tempo}배속 변환 중 (스트리밍)...")
+        proc = subprocess.Popen(
+            _atempo_cmd("pipe:0", out_path, tempo),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        buffered = _BufferedPipe(proc.stdin)
+        try:
+            with open_response() as response:
+                _write_chunks(response, buffered)
+        except Exception:
+            proc.kill()
+            proc.communicate()
+            raise
+        try:
+            _, stderr = proc.communicate()
+        except (BrokenPipeError, OSError):
+            stderr = b""   # ffmpeg가 먼저 종료됨 → 아래에서 메모리 데이터로 다시 변환
+            proc.wait()
+        if proc.returncode == 0:
+            return
+        print("[경고] ffmpeg 파이프 변환 실패 → 받아 둔 음성 데이터로 다시 변환합니다.")
+        if stderr:
+            print(stderr.decode(errors="replace").strip())
+        _run_atempo("pipe:0", out_path, tempo, data=bytes(buffered.data))
+        return
+
+    raw_path = out_path + ".raw.mp3"
+    try:
+        with open_response() as response, open(raw_path, "wb") as f:
+            _write_chunks(response, f)
+        print(f"[FFmpeg] {tempo}배속 변환 중...")
+        _run_atempo(raw_path, out_path, tempo)
+    finally:
+        if os.path.exists(raw_path):
+            os.remove(raw_path)
+
 # tts 1
 def tts_generate(
     script: str,
@@ -19,9 +148,17 @@ def tts_generate(
     slide_idx: int,
     voice_preset: str = "부드러운 설명형",
     speed: float = 0.9,
+    rpm: float | None = None,
+    cache: ArtifactCache | None = None,
+    stream_tempo: bool = True,
 ) -> tuple[str, float | None]:
     """
     실제 OpenAI TTS를 호출하고 mp3 파일을 생성하는 순수 함수.
+    - 응답은 청크 단위로 스트리밍 기록, 속도 변환이 필요하면 ffmpeg stdin으로 바로 전달
+      (중간 raw 파일 없음, stream_tempo=False 이면 raw 파일을 거쳐 변환)
+    - API 호출은 프로세스 공용 limiter(분당 rpm, 기본 TTS_RPM)를 거침
+    - cache가 있으면 (정규화된 스크립트, voice, speed, TTS_MODEL) 키로 먼저 조회하고,
+      속도 변환까지 끝난 최종 파일 + 길이를 저장
     - 반환: (최종 파일 경로, duration초 or None)
     """
 
@@ -69,66 +206,107 @@ def tts_generate(
     os.makedirs(work_dir, exist_ok=True)
     raw_path = os.path.join(work_dir, f"tts_raw_slide{slide_idx}.mp3")
     final_path = os.path.join(work_dir, f"tts_slide{slide_idx}_{speed}x.mp3")
+    apply_tempo = speed != 0.9 and shutil.which("ffmpeg")
+    out_path = final_path if apply_tempo else raw_path
 
     # ------------------------------
-    # TTS 호출
+    # 캐시 조회 (공백만 다른 스크립트는 같은 음성으로 취급)
     # ------------------------------
+    cache_key = make_key(" ".join(script.split()), voice, speed, TTS_MODEL)
+    if cache:
+        meta = cache.get_file(TTS_CACHE_STAGE, cache_key, out_path)
+        if meta is not None:
+            print(f"[TTS] 캐시 재사용 → {out_path}")
+            return out_path, meta.get("duration")
+
+    # ------------------------------
+    # TTS 호출 (응답을 받는 대로 파일 또는 ffmpeg stdin으로 흘려보냄)
+    # ------------------------------
+    limiter = get_rate_limiter("openai_tts", rpm if rpm is not None else TTS_RPM)
+    tempo = speed if apply_tempo else None
+    used_voice = voice
     try:
         print(f"[TTS] 교육용 보이스('{voice}')로 음성 생성 중...")
-        response = client.audio.speech.create(
-            model=TTS_MODEL,
-            voice=voice,
-            input=script,
-            response_format="mp3",
-        )
+        limiter.acquire()
+        _stream_speech(voice, script, out_path, tempo=tempo, pipe_tempo=stream_tempo)
+    except TempoError:
+        raise
     except Exception as e:
         print("[오류] TTS 생성 실패:", e)
         print("[재시도] 기본 보이스 'nova'로 재생성 시도합니다.")
-        response = client.audio.speech.create(
-            model=TTS_MODEL,
-            voice="nova",
-            input=script,
-            response_format="mp3",
-        )
-
-    with open(raw_path, "wb") as f:
-        # 최신 openai SDK 기준: .to_bytes() / .read() 둘 다 케이스 있음
-        data = getattr(response, "to_bytes", None)
-        if callable(data):
-            f.write(response.to_bytes())
-        else:
-            f.write(response.read())
-
-    # ------------------------------
-    # FFmpeg 속도 조절
-    # ------------------------------
-    if speed != 0.9 and shutil.which("ffmpeg"):
-        print(f"[FFmpeg] {speed}배속 변환 중...")
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-i",
-            raw_path,
-            "-filter:a",
-            f"atempo={speed}",
-            final_path,
-        ]
-        subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    else:
-        final_path = raw_path
+        limiter.acquire()
+        used_voice = "nova"
+        _stream_speech("nova", script, out_path, tempo=tempo, pipe_tempo=stream_tempo)
+    final_path = out_path
 
     # ------------------------------
     # duration 측정
     # ------------------------------
     try:
-        duration = ffprobe_duration(final_path)
+        duration = media_duration(final_path)
         print(f"[TTS] 최종 오디오 길이: {round(duration, 2)}초")
     except Exception:
         duration = None
         print("[경고] 오디오 길이를 계산할 수 없습니다.")
 
+    # 대체 보이스로 만든 결과는 요청한 voice 키로 저장하지 않음
+    if cache and used_voice == voice:
+        cache.put_file(TTS_CACHE_STAGE, cache_key, final_path, {"duration": duration})
+
     return final_path, duration
 
+def tts_cache_report(cache: ArtifactCache | None) -> str:
+    """TTS 캐시 적중률 문자열 (예: 'hit 12 / miss 3 (80.0%)')"""
+    if not cache:
+        return "캐시 사용 안 함"
+    st = cache.stats().get(TTS_CACHE_STAGE, {"hits": 0, "misses": 0})
+    total = st["hits"] + st["misses"]
+    rate = (st["hits"] / total * 100) if total else 0.0
+    return f"hit {st['hits']} / miss {st['misses']} ({rate:.1f}%)"
+
+
+def tts_generate_batch(
+    scripts: dict[int, str],
+    work_dir: str,
+    voice_preset: str = "부드러운 설명형",
+    speed: float = 0.9,
+    max_workers: int = TTS_WORKERS,
+    rpm: float | None = None,
+    cache: ArtifactCache | None = None,
+) -> dict[int, tuple[str | None, float | None]]:
+    """
+    여러 슬라이드 스크립트를 동시에 TTS 변환.
+    - scripts: {slide_idx: script}
+    - max_workers개 스레드로 동시에 호출하되, 분당 요청 수는 rpm으로 제한
+    - 결과 파일은 tts_generate와 같은 tts_slide{idx} 경로에 저장
+    - 반환: {slide_idx: (파일 경로, duration)}, 실패한 슬라이드는 (None, None)
+    """
+    results: dict[int, tuple[str | None, float | None]] = {}
+    if not scripts:
+        return results
+
+    def run(idx: int, script: str):
+        try:
+            return idx, tts_generate(
+                script=script,
+                work_dir=work_dir,
+                slide_idx=idx,
+                voice_preset=voice_preset,
+                speed=speed,
+                rpm=rpm,
+                cache=cache,
+            )
+        except Exception as e:
+            print(f"[오류] 슬라이드 {idx+1} TTS 실패: {e}")
+            return idx, (None, None)
+
+    workers = max(1, min(int(max_workers), len(scripts)))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        for idx, res in ex.map(lambda item: run(*item), scripts.items()):
+            results[idx] = res
+
+    return results
+
 
 # LangChain Runnable로 감싼 버전 (원하면 LangGraph에서 바로 쓸 수 있음)
 tts_runnable = RunnableLambda(
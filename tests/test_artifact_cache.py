@@ -0,0 +1,56 @@
+import time
+
+from src.utils.artifact_cache import ArtifactCache, make_key
+
+def _file(tmp_path, name: str, size: int) -> str:
+    path = tmp_path / name
+    path.write_bytes(b"x" * size)
+    return str(path)
+
+def test_json_roundtrip_and_stats(tmp_path):
+    cache = ArtifactCache(str(tmp_path / "cache"))
+    key = make_key("slide", 1)
+    assert cache.get_json("script", key) is None
+    cache.put_json("script", key, {"text": "안녕하세요"})
+    assert cache.get_json("script", key) == {"text": "안녕하세요"}
+    assert cache.stats()["script"] == {"hits": 1, "misses": 1}
+
+def test_put_replaces_existing_entry(tmp_path):
+    cache = ArtifactCache(str(tmp_path / "cache"))
+    cache.put_json("external_content", "k" * 64, {"v": 1})
+    cache.put_json("external_content", "k" * 64, {"v": 2})
+    assert cache.get_json("external_content", "k" * 64) == {"v": 2}
+
+    cache.put_file("tts", "a" * 64, _file(tmp_path, "old.mp3", 10), {"duration": 1.0})
+    cache.put_file("tts", "a" * 64, _file(tmp_path, "new.mp3", 20), {"duration": 2.0})
+    dst = tmp_path / "out.mp3"
+    assert cache.get_file("tts", "a" * 64, str(dst)) == {"duration": 2.0}
+    assert dst.stat().st_size == 20
+
+def test_max_age_expires_entries(tmp_path, monkeypatch):
+    cache = ArtifactCache(str(tmp_path / "cache"))
+    cache.put_json("external_content", "b" * 64, ["결과"])
+    assert cache.get_json("external_content", "b" * 64, max_age_sec=60) == ["결과"]
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert cache.get_json("external_content", "b" * 64, max_age_sec=60) is None
+    # 만료 시간을 주지 않으면 그대로 사용
+    assert cache.get_json("external_content", "b" * 64) == ["결과"]
+
+def test_evicts_least_recently_used_first(tmp_path):
+    src = _file(tmp_path, "clip.mp4", 1000)
+    # value.json 크기를 감안해도 항목 2개까지만 들어가는 용량
+    cache = ArtifactCache(str(tmp_path / "cache"), max_bytes=2500)
+    for name in ("first", "second"):
+        cache.put_file("video", make_key(name), src)
+        time.sleep(0.02)
+
+    # first를 최근에 사용 → 용량 초과 시 second가 먼저 삭제됨
+    assert cache.get_file("video", make_key("first"), str(tmp_path / "hit.mp4")) is not None
+    time.sleep(0.02)
+    cache.put_file("video", make_key("third"), src)
+
+    assert cache.get_file("video", make_key("second"), str(tmp_path / "miss.mp4")) is None
+    assert cache.get_file("video", make_key("first"), str(tmp_path / "a.mp4")) is not None
+    assert cache.get_file("video", make_key("third"), str(tmp_path / "b.mp4")) is not None
@@ -0,0 +1,110 @@
+"""
+그래프 스케일링 점검 (외부 API 없이 stub 노드로 실행)
+- 합성 500장 덱을 순차 / 병렬 그래프로 끝까지 돌려 recursion_limit_for 값 안에서 완료되는지 확인
+  (그래프에 노드를 추가하면 SERIAL_STEPS_PER_SLIDE / BASE_STEPS도 함께 맞춰야 함)
+"""
+import os
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+# 노드 모듈이 import 시점에 클라이언트를 만들기 때문에 더미 키 지정
+os.environ.setdefault("OPENAI_API_KEY", "sk-dummy")
+os.environ.setdefault("LLM_MODEL", "gpt-4o-mini")
+os.environ.setdefault("TTS_MODEL", "gpt-4o-mini-tts")
+
+import src.graph as graph
+import src.nodes.process_slides as process_slides
+import src.nodes.render_slides as render_slides
+import src.nodes.tts as tts_nodes
+
+TOTAL_SLIDES = 500
+
+def make_stubs(total: int, work_dir: str) -> dict:
+    def parse(state):
+        state["total_slides"] = total
+        state["slide_index"] = 0
+        state["titles"] = [f"슬라이드 {i+1}" for i in range(total)]
+        state["texts"] = [""] * total
+        state["slide_image"] = [""] * total
+        return state
+
+    def search(state):
+        state["external_content"] = {"queries": [], "summaries": [], "references": []}
+        return state
+
+    def plan_search(state):
+        state["planned_external"] = {}
+        return state
+
+    def page_content_all(state):
+        state["planned_page_content"] = {}
+        return state
+
+    def script_all(state):
+        return state
+
+    def page_content(state):
+        state["page_content"] = f"요약 {state['slide_index']}"
+        return state
+
+    def script(state):
+        state["script"] = f"스크립트 {state['slide_index']}"
+        state.setdefault("all_scripts", []).append(state["script"])
+        return state
+
+    def tts(state):
+        state["audio"] = os.path.join(work_dir, f"tts_slide{state['slide_index']}.mp3")
+        return state
+
+    def tts_batch(scripts, work_dir, **kwargs):
+        return {
+            idx: (os.path.join(work_dir, f"tts_slide{idx}.mp3"), 1.0)
+            for idx in scripts
+        }
+
+    def make_video(state):
+        out = os.path.join(work_dir, f"slide{state['slide_index']+1}_lecture.mp4")
+        open(out, "wb").close()
+        state["video_path"] = out
+        return state
+
+    def concat(state):
+        state["final_video"] = os.path.join(work_dir, "final_lecture.mp4")
+        return state
+
+    def quiz(state):
+        state["quiz_set"] = []
+        return state
+
+    return {
+        "node_parse_all": parse,
+        "node_tool_search": search,
+        "node_plan_search": plan_search,
+        "node_page_content_all": page_content_all,
+        "node_script_all": script_all,
+        "node_generate_page_content": page_content,
+        "node_generate_script": script,
+        "node_tts": tts,
+        "tts_generate_batch": tts_batch,
+        "node_make_video": make_video,
+        "node_concat": concat,
+        "node_generate_quiz": quiz,
+    }
+
+@pytest.mark.parametrize("parallel", [False, True], ids=["serial", "parallel"])
+def test_graph_finishes_500_slides_within_recursion_limit(parallel, tmp_path, monkeypatch):
+    work_dir = str(tmp_path)
+    for name, fn in make_stubs(TOTAL_SLIDES, work_dir).items():
+        for mod in (graph, process_slides, render_slides, tts_nodes):
+            if hasattr(mod, name):
+                monkeypatch.setattr(mod, name, fn)
+
+    app = graph.build_parallel_graph() if parallel else graph.build_serial_graph()
+    state = app.invoke(
+        {"pptx_path": "synthetic.pptx", "work_dir": work_dir, "prompt": {"max_workers": 8, "use_cache": False}},
+        config={"recursion_limit": graph.recursion_limit_for(TOTAL_SLIDES, parallel=parallel)},
+    )
+
+    assert len(state.get("video_paths", [])) == TOTAL_SLIDES
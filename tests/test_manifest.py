@@ -0,0 +1,70 @@
+import os
+
+from src.utils.manifest import MANIFEST_VERSION, _content_models, _content_prompt, apply_reuse, plan_reuse
+
+PROMPT = {"tone": "친절하게", "speed": 1.0}
+
+def make_manifest(out_dir, hashes: list[str], prompt: dict = PROMPT) -> dict:
+    """이전 실행 manifest (슬라이드마다 음성/영상 파일 포함)"""
+    out_dir.mkdir(exist_ok=True)
+    slides = []
+    for i, h in enumerate(hashes):
+        audio = out_dir / f"tts_slide{i}.mp3"
+        video = out_dir / f"slide{i+1}_lecture.mp4"
+        audio.write_bytes(f"audio {h}".encode())
+        video.write_bytes(f"video {h}".encode())
+        slides.append({"hash": h, "script": f"스크립트 {h}", "audio": str(audio), "video": str(video), "duration": 3.0})
+    return {
+        "version": MANIFEST_VERSION,
+        "prompt": _content_prompt(prompt),
+        "models": _content_models(),
+        "slides": slides,
+    }
+
+def test_reuse_keys_on_previous_hash_and_last_slide(tmp_path):
+    manifest = make_manifest(tmp_path / "old", ["a", "b", "c", "d"])
+    work_dir = str(tmp_path / "new")
+
+    # b가 수정됨 → b와 그 다음 c만 다시 생성
+    reuse = plan_reuse(manifest, ["a", "B", "c", "d"], PROMPT, work_dir)
+    assert sorted(reuse) == [0, 3]
+    assert reuse[3]["script"] == "스크립트 d"
+
+    # 마지막 슬라이드 뒤에 새 슬라이드 추가 → 이전 마지막 슬라이드(d)도 다시 생성
+    reuse = plan_reuse(manifest, ["a", "b", "c", "d", "e"], PROMPT, work_dir)
+    assert sorted(reuse) == [0, 1, 2]
+
+def test_reused_files_are_stashed_outside_previous_outputs(tmp_path):
+    manifest = make_manifest(tmp_path / "old", ["a", "b"])
+    reuse = plan_reuse(manifest, ["a", "b"], PROMPT, str(tmp_path / "new"))
+    assert sorted(reuse) == [0, 1]
+    for rec in reuse.values():
+        assert os.path.dirname(rec["audio"]) == str((tmp_path / "new" / "reuse").resolve())
+        assert os.path.exists(rec["audio"]) and os.path.exists(rec["video"])
+
+def test_option_model_or_window_change_disables_reuse(tmp_path, monkeypatch):
+    manifest = make_manifest(tmp_path / "old", ["a", "b"])
+    work_dir = str(tmp_path / "new")
+
+    assert plan_reuse(manifest, ["a", "b"], {**PROMPT, "tone": "딱딱하게"}, work_dir) == {}
+    assert plan_reuse(manifest, ["a", "b"], {**PROMPT, "outline_context": "window"}, work_dir) == {}
+    # window 모드로 만든 manifest 를 window 모드로 다시 실행해도 재사용 안 함
+    window_manifest = make_manifest(tmp_path / "old", ["a", "b"], {**PROMPT, "outline_context": "window"})
+    assert plan_reuse(window_manifest, ["a", "b"], {**PROMPT, "outline_context": "window"}, work_dir) == {}
+
+    monkeypatch.setenv("TTS_MODEL", "other-tts-model")
+    assert plan_reuse(manifest, ["a", "b"], PROMPT, work_dir) == {}
+
+def test_apply_reuse_copies_outputs_to_current_slide_names(tmp_path):
+    manifest = make_manifest(tmp_path / "old", ["a", "b"])
+    work_dir = tmp_path / "new"
+    # 맨 앞에 슬라이드 추가 → a는 앞 슬라이드가 달라져 재생성, b는 2번 → 3번 슬라이드로 재사용
+    reuse = plan_reuse(manifest, ["x", "a", "b"], PROMPT, str(work_dir))
+    assert sorted(reuse) == [2]
+
+    state = apply_reuse({"slide_index": 2, "work_dir": str(work_dir)}, reuse[2])
+    assert state["script"] == "스크립트 b"
+    assert state["all_scripts"] == ["스크립트 b"]
+    assert state["video_path"] == str(work_dir / "slide3_lecture.mp4")
+    assert (work_dir / "slide3_lecture.mp4").read_bytes() == b"video b"
+    assert state["audio_meta"][2]["duration"] == 3.0
@@ -0,0 +1,73 @@
+import struct
+
+import pytest
+
+import src.utils.media_info as media_info
+from src.utils.media_info import media_duration
+
+# MPEG-1 Layer III, 128kbps, 44.1kHz, stereo → 프레임 417바이트, 1152샘플
+FRAME_HEADER = b"\xff\xfb\x90\x00"
+FRAME_BYTES = 417
+FRAME_SEC = 1152 / 44100
+
+@pytest.fixture(autouse=True)
+def no_ffprobe(monkeypatch):
+    # 헤더 파싱이 실패해 ffprobe로 넘어가면 테스트 실패
+    def fail(path):
+        raise AssertionError(f"ffprobe fallback: {path}")
+    monkeypatch.setattr(media_info, "ffprobe_duration", fail)
+    media_info._cached_duration.cache_clear()
+
+def frame(tag: bytes = b"", payload: bytes = b"") -> bytes:
+    body = bytearray(FRAME_BYTES - 4)
+    if tag:
+        body[32:32 + len(tag) + len(payload)] = tag + payload   # stereo MPEG-1 side info = 32바이트
+    return FRAME_HEADER + bytes(body)
+
+def id3v2(size: int) -> bytes:
+    syncsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+    return b"ID3\x03\x00\x00" + syncsafe + b"\x00" * size
+
+def test_mp3_frame_scan_without_vbr_header(tmp_path):
+    path = tmp_path / "cbr.mp3"
+    path.write_bytes(id3v2(100) + frame() * 50)
+    assert media_duration(str(path)) == pytest.approx(50 * FRAME_SEC)
+
+def test_mp3_xing_header_frame_count(tmp_path):
+    path = tmp_path / "xing.mp3"
+    # Xing 헤더의 프레임 수(1000)가 실제로 뒤따르는 프레임 수보다 우선
+    path.write_bytes(frame(b"Xing", struct.pack(">II", 0x1, 1000)) + frame() * 3)
+    assert media_duration(str(path)) == pytest.approx(1000 * FRAME_SEC)
+
+def test_mp3_vbri_header_frame_count(tmp_path):
+    path = tmp_path / "vbri.mp3"
+    payload = b"\x00" * 10 + struct.pack(">I", 200)   # VBRI 시작 + 14바이트 위치에 프레임 수
+    path.write_bytes(frame(b"VBRI", payload) + frame() * 3)
+    assert media_duration(str(path)) == pytest.approx(200 * FRAME_SEC)
+
+def box(box_type: bytes, body: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(body), box_type) + body
+
+def mvhd(version: int, timescale: int, duration: int) -> bytes:
+    if version == 1:
+        fields = struct.pack(">QQIQ", 0, 0, timescale, duration)
+    else:
+        fields = struct.pack(">IIII", 0, 0, timescale, duration)
+    return box(b"mvhd", bytes([version, 0, 0, 0]) + fields + b"\x00" * 80)
+
+@pytest.mark.parametrize("version", [0, 1])
+def test_mp4_mvhd_duration_after_mdat(tmp_path, version):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(
+        box(b"ftyp", b"isom\x00\x00\x02\x00isomiso2")
+        + box(b"mdat", b"\x00" * 4096)
+        + box(b"moov", box(b"udta", b"\x00" * 8) + mvhd(version, 12800, 12800 * 7 + 6400))
+    )
+    assert media_duration(str(path)) == pytest.approx(7.5)
+
+def test_duration_is_reread_when_file_changes(tmp_path):
+    path = tmp_path / "tts.mp3"
+    path.write_bytes(frame() * 10)
+    assert media_duration(str(path)) == pytest.approx(10 * FRAME_SEC)
+    path.write_bytes(frame() * 20)
+    assert media_duration(str(path)) == pytest.approx(20 * FRAME_SEC)
@@ -0,0 +1,29 @@
+import pytest
+
+from benchmarks.bench_near_dup import cluster_pairwise, make_results, picked
+from src.utils.near_dup import cluster_snippets
+
+BASE = "머신러닝은 데이터에서 규칙을 학습해 예측하는 방법으로 지도 학습과 비지도 학습으로 나뉩니다"
+
+def result(i: int, snippet: str, domain: str) -> dict:
+    return {"title": f"r{i}", "url": f"https://{domain}/{i}", "snippet": snippet, "domain": domain, "score": 0.5}
+
+def test_groups_rewrites_across_domains():
+    results = [
+        result(0, BASE, "a.example"),
+        result(1, BASE.replace("예측하는", "예측을 하는"), "b.example"),
+        result(2, BASE + ".", "c.example"),
+        result(3, "데이터베이스 정규화는 중복을 줄이기 위해 테이블을 나누는 설계 과정입니다", "d.example"),
+        result(4, "", "e.example"),   # 빈 스니펫은 묶지 않음
+    ]
+    groups = cluster_snippets(results)
+    sizes = sorted(len(g["items"]) for g in groups)
+    assert sizes == [1, 3]
+    big = max(groups, key=lambda g: len(g["items"]))
+    assert big["domains"] == {"a.example", "b.example", "c.example"}
+    assert big["rep"] == BASE   # 먼저 나온 스니펫이 그룹 대표
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_pairwise_baseline(seed):
+    results = make_results(40, seed=seed)
+    assert picked(cluster_snippets(results)) == picked(cluster_pairwise(results))
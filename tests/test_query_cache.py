@@ -0,0 +1,47 @@
+import time
+
+import pytest
+
+from src.utils.query_cache import QueryCache
+
+@pytest.fixture
+def clock(monkeypatch):
+    """time.time()을 직접 움직이는 가짜 시계"""
+    now = [1_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = QueryCache(str(tmp_path / "q.sqlite3"), ttl_sec=60)
+    cache.put("머신러닝", [{"url": "https://example.com"}])
+    clock[0] += 59
+    assert cache.get("머신러닝") == [{"url": "https://example.com"}]
+    clock[0] += 2
+    assert cache.get("머신러닝") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+def test_zero_ttl_never_expires(tmp_path, clock):
+    cache = QueryCache(str(tmp_path / "q.sqlite3"), ttl_sec=0)
+    cache.put("k", "v")
+    clock[0] += 365 * 24 * 3600
+    assert cache.get("k") == "v"
+
+def test_max_entries_evicts_least_recently_used(tmp_path, clock):
+    cache = QueryCache(str(tmp_path / "q.sqlite3"), ttl_sec=0, max_entries=2)
+    cache.put("a", 1)
+    clock[0] += 1
+    cache.put("b", 2)
+    clock[0] += 1
+    assert cache.get("a") == 1      # a를 최근에 사용 → b가 먼저 삭제
+    clock[0] += 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["entries"] == 2
+
+def test_entries_are_shared_across_instances(tmp_path):
+    path = str(tmp_path / "q.sqlite3")
+    QueryCache(path).put("질의", {"score": 0.5})
+    assert QueryCache(path).get("질의") == {"score": 0.5}
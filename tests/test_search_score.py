@@ -0,0 +1,37 @@
+from src.utils.search_score import NGRAM_SIZE, DomainTrustIndex, batch_similarity, load_domain_trust, score_batch
+
+def test_query_shorter_than_ngram_still_matches():
+    # 질의가 NGRAM_SIZE보다 짧아도 문자 n-gram 유사도가 0이 되면 안 됨
+    assert len("ai") < NGRAM_SIZE
+    assert score_batch("a", ["abc"], ["example.com"])[0]["similarity"] > 0
+    sim = batch_similarity("개요", ["강의 개요 소개", "무관한 내용"])
+    assert sim[0] > 0
+    assert sim[1] == 0
+
+def test_short_query_ranks_related_snippet_first():
+    sim = batch_similarity("AI", ["ai 기초 정리", "데이터베이스 설계"])
+    assert sim[0] > sim[1]
+
+def test_domain_trust_matches_on_label_boundaries():
+    index = DomainTrustIndex({"microsoft.com": 0.95, "learn.microsoft.com": 0.98})
+    assert index.lookup("microsoft.com") == 0.95
+    assert index.lookup("news.microsoft.com") == 0.95
+    assert index.lookup("learn.microsoft.com") == 0.98      # 더 구체적인 항목 우선
+    assert index.lookup("a.learn.microsoft.com") == 0.98
+    assert index.lookup("notmicrosoft.com") is None
+    assert index.lookup("microsoft.com.evil") is None
+    assert index.lookup("com") is None
+
+def test_domain_trust_normalizes_host_forms():
+    index = DomainTrustIndex({"docs.python.org": 0.98})
+    assert index.lookup("Docs.Python.ORG.") == 0.98
+    assert index.lookup("user@docs.python.org:443") == 0.98
+    assert index.lookup("") is None
+
+def test_domain_trust_file_formats(tmp_path):
+    txt = tmp_path / "trust.txt"
+    txt.write_text("# 사내 문서\nwiki.example.com 0.9\nblog.example.com,0.3\n", encoding="utf-8")
+    assert load_domain_trust(str(txt)) == {"wiki.example.com": 0.9, "blog.example.com": 0.3}
+    js = tmp_path / "trust.json"
+    js.write_text('{"example.org": 0.7}', encoding="utf-8")
+    assert load_domain_trust(str(js)) == {"example.org": 0.7}